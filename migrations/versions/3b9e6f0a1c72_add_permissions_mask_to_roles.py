@@ -0,0 +1,45 @@
+"""add permissions mask to roles
+
+Revision ID: 3b9e6f0a1c72
+Revises: 154077481486
+Create Date: 2025-09-02 12:10:41.518306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9e6f0a1c72'
+down_revision: Union[str, Sequence[str], None] = '154077481486'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PERMISSIONS_MASK_SQL = (
+    "(create_tasks::int << 0) | "
+    "(delete_tasks::int << 1) | "
+    "(update_tasks::int << 2) | "
+    "(update_project::int << 3) | "
+    "(generate_url::int << 4) | "
+    "(delete_users::int << 5) | "
+    "(change_roles::int << 6) | "
+    "(manage_links::int << 7)"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('roles',
+                  sa.Column('permissions',
+                            sa.Integer(),
+                            sa.Computed(PERMISSIONS_MASK_SQL, persisted=True),
+                            nullable=False)
+                  )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('roles', 'permissions')
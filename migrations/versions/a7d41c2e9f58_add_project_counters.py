@@ -0,0 +1,104 @@
+"""add project counters
+
+Revision ID: a7d41c2e9f58
+Revises: 3b9e6f0a1c72
+Create Date: 2025-09-04 18:32:07.114902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.shared.db.triggers import TriggersManager
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d41c2e9f58'
+down_revision: Union[str, Sequence[str], None] = '3b9e6f0a1c72'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('project_counters',
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('tasks_total', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('tasks_processing', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('tasks_completed', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('tasks_ended', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('members_count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('active_links', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('project_id')
+    )
+
+    op.execute(TriggersManager.get_init_project_counters_function())
+    op.execute(TriggersManager.get_init_project_counters_trigger())
+    op.execute(TriggersManager.get_task_counters_function())
+    op.execute(TriggersManager.get_task_counters_trigger())
+    op.execute(TriggersManager.get_task_counters_trigger_on_update())
+    op.execute(TriggersManager.get_member_counters_function())
+    op.execute(TriggersManager.get_member_counters_trigger())
+    op.execute(TriggersManager.get_link_counters_function())
+    op.execute(TriggersManager.get_link_counters_trigger())
+
+    # Триггеры уже созданы и держат блокировки таблиц до конца миграции,
+    # поэтому пересчет ниже не разойдется с параллельными изменениями
+    op.execute("""
+    INSERT INTO project_counters (
+        project_id, tasks_total, tasks_processing, tasks_completed, tasks_ended, members_count, active_links
+    )
+    SELECT
+        p.id,
+        COALESCE(t.total, 0),
+        COALESCE(t.processing, 0),
+        COALESCE(t.completed, 0),
+        COALESCE(t.ended, 0),
+        COALESCE(m.members, 0),
+        COALESCE(l.links, 0)
+    FROM projects p
+    LEFT JOIN (
+        SELECT project_id,
+               COUNT(*) AS total,
+               COUNT(*) FILTER (WHERE status = 'processing') AS processing,
+               COUNT(*) FILTER (WHERE status = 'completed') AS completed,
+               COUNT(*) FILTER (WHERE status = 'ended') AS ended
+        FROM tasks
+        GROUP BY project_id
+    ) t ON t.project_id = p.id
+    LEFT JOIN (
+        SELECT project_id, COUNT(*) AS members
+        FROM project_members
+        GROUP BY project_id
+    ) m ON m.project_id = p.id
+    LEFT JOIN (
+        SELECT project_id, COUNT(*) AS links
+        FROM links
+        WHERE is_active = TRUE
+        GROUP BY project_id
+    ) l ON l.project_id = p.id
+    ON CONFLICT (project_id) DO UPDATE SET
+        tasks_total = EXCLUDED.tasks_total,
+        tasks_processing = EXCLUDED.tasks_processing,
+        tasks_completed = EXCLUDED.tasks_completed,
+        tasks_ended = EXCLUDED.tasks_ended,
+        members_count = EXCLUDED.members_count,
+        active_links = EXCLUDED.active_links;
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS link_counters_trigger ON links;")
+    op.execute("DROP TRIGGER IF EXISTS member_counters_trigger ON project_members;")
+    op.execute("DROP TRIGGER IF EXISTS task_counters_update ON tasks;")
+    op.execute("DROP TRIGGER IF EXISTS task_counters_insert_delete ON tasks;")
+    op.execute("DROP TRIGGER IF EXISTS init_project_counters_trigger ON projects;")
+
+    op.execute("DROP FUNCTION IF EXISTS update_link_counters();")
+    op.execute("DROP FUNCTION IF EXISTS update_member_counters();")
+    op.execute("DROP FUNCTION IF EXISTS update_task_counters();")
+    op.execute("DROP FUNCTION IF EXISTS init_project_counters();")
+
+    op.drop_table('project_counters')
@@ -0,0 +1,75 @@
+"""links limit on counter
+
+Revision ID: c52f8e07d1a3
+Revises: a7d41c2e9f58
+Create Date: 2025-09-06 12:14:51.382610
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from src.shared.db.triggers import TriggersManager
+
+# revision identifiers, used by Alembic.
+revision: str = 'c52f8e07d1a3'
+down_revision: Union[str, Sequence[str], None] = 'a7d41c2e9f58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Инкремент при вставке теперь делает check_urls_count, поэтому
+    # триггер счетчиков ссылок больше не срабатывает на INSERT
+    op.execute("DROP TRIGGER IF EXISTS link_counters_trigger ON links;")
+    op.execute(TriggersManager.get_link_counters_on_update_function())
+    op.execute(TriggersManager.get_link_counters_on_update_trigger())
+    op.execute(TriggersManager.get_links_limit_on_counter_function())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("""
+    CREATE OR REPLACE FUNCTION check_urls_count()
+    RETURNS TRIGGER AS $$
+    DECLARE
+        max_links INTEGER := 100;
+        current_count INTEGER;
+    BEGIN
+        SELECT COUNT(*) INTO current_count
+        FROM links
+        WHERE project_id = NEW.project_id AND is_active = TRUE;
+        IF current_count >= max_links THEN
+            RAISE EXCEPTION 'Maximum % links allowed per project. Current count: %, Project ID: %',
+            max_links, current_count, NEW.project_id;
+        END IF;
+
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+    """)
+    op.execute("DROP TRIGGER IF EXISTS link_counters_trigger ON links;")
+    op.execute("""
+    CREATE OR REPLACE FUNCTION update_link_counters()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.is_active THEN
+            UPDATE project_counters SET active_links = active_links - 1
+            WHERE project_id = OLD.project_id;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.is_active THEN
+            UPDATE project_counters SET active_links = active_links + 1
+            WHERE project_id = NEW.project_id;
+        END IF;
+
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+    CREATE TRIGGER link_counters_trigger
+        AFTER INSERT OR DELETE OR UPDATE OF is_active, project_id ON links
+        FOR EACH ROW
+        EXECUTE FUNCTION update_link_counters();
+    """)
@@ -0,0 +1,46 @@
+"""add task and link indexes
+
+Revision ID: e81b3c4d9a06
+Revises: c52f8e07d1a3
+Create Date: 2025-09-07 10:41:26.905113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e81b3c4d9a06'
+down_revision: Union[str, Sequence[str], None] = 'c52f8e07d1a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_project_started_at_id', 'tasks', ['project_id', 'started_at', 'id'], unique=False)
+    op.create_index('ix_tasks_project_deadline_id', 'tasks',
+                    ['project_id', sa.text("coalesce(deadline, 'infinity'::date)"), 'id'], unique=False)
+    op.create_index('ix_tasks_project_priority_id', 'tasks', ['project_id', 'priority', 'id'], unique=False)
+    op.create_index('ix_tasks_project_status_id', 'tasks', ['project_id', 'status', 'id'], unique=False)
+    op.create_index('ix_tasks_project_completed_at', 'tasks', ['project_id', 'completed_at'], unique=False)
+    op.create_index('ix_tasks_project_processing_deadline', 'tasks', ['project_id', 'deadline'], unique=False,
+                    postgresql_where=sa.text("status = 'processing'"))
+    op.create_index(op.f('ix_task_assignees_project_member_id'), 'task_assignees', ['project_member_id'],
+                    unique=False)
+    op.create_index('ix_project_members_project_id', 'project_members', ['project_id', 'user_id'], unique=False)
+    op.create_index(op.f('ix_links_link'), 'links', ['link'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_links_link'), table_name='links')
+    op.drop_index('ix_project_members_project_id', table_name='project_members')
+    op.drop_index(op.f('ix_task_assignees_project_member_id'), table_name='task_assignees')
+    op.drop_index('ix_tasks_project_processing_deadline', table_name='tasks')
+    op.drop_index('ix_tasks_project_completed_at', table_name='tasks')
+    op.drop_index('ix_tasks_project_status_id', table_name='tasks')
+    op.drop_index('ix_tasks_project_priority_id', table_name='tasks')
+    op.drop_index('ix_tasks_project_deadline_id', table_name='tasks')
+    op.drop_index('ix_tasks_project_started_at_id', table_name='tasks')
@@ -1,21 +1,25 @@
+import hashlib
+import time
 import uuid
 from datetime import datetime, timezone, timedelta
 
 from jose import jwt, JWTError
 
+from src.shared.cache.lru import TTLCache
+from src.shared.config import get_auth_settings
 
-from src.shared.config import get_auth_data
+auth_settings = get_auth_settings()
+verified_tokens = TTLCache(max_size=auth_settings.token_cache_size, ttl=0)
 
 
 async def create_token(data: dict, token_type: str = "access"):
-    auth_data = await get_auth_data()
-    expire = datetime.now(timezone.utc) + timedelta(minutes=auth_data["expire_access"])
+    expire = datetime.now(timezone.utc) + timedelta(minutes=auth_settings.expire_access)
     to_encode = data.copy()
     returning_data = {}
     if token_type == "access":
         to_encode.update({"exp": expire, "type": "access"})
     elif token_type == "refresh":
-        expire = datetime.now(timezone.utc) + timedelta(minutes=auth_data["expire_refresh"])
+        expire = datetime.now(timezone.utc) + timedelta(minutes=auth_settings.expire_refresh)
         token_id = str(uuid.uuid4())
         to_encode.update({
             "exp": expire,
@@ -24,15 +28,22 @@ async def create_token(data: dict, token_type: str = "access"):
         returning_data.update({"token_id": token_id})
     else:
         return None
-    encode_jwt = jwt.encode(to_encode, auth_data['secret_key'], algorithm=auth_data['algorithm'])
+    encode_jwt = jwt.encode(to_encode, auth_settings.secret_key, algorithm=auth_settings.algorithm)
     returning_data.update({"token": encode_jwt})
     return returning_data
 
 
 async def decode_token(token: str):
-    auth_data = await get_auth_data()
+    digest = hashlib.sha256(token.encode()).digest()
+    payload = verified_tokens.get(digest)
+    if payload is not None:
+        return dict(payload)
     try:
-        payload = jwt.decode(token, auth_data['secret_key'], algorithms=auth_data['algorithm'])
-        return payload
+        payload = jwt.decode(token, auth_settings.secret_key, algorithms=auth_settings.algorithm)
     except JWTError:
-        return None
\ No newline at end of file
+        return None
+    exp = payload.get("exp")
+    if exp is not None:
+        # Токен хранится в кэше не дольше, чем он действителен
+        verified_tokens.set(digest, payload, ttl=exp - time.time())
+    return dict(payload)
@@ -0,0 +1,60 @@
+from typing import Optional, Dict, Any
+
+import httpx
+from authlib.integrations.starlette_client import OAuth
+
+from src.shared.config import get_github_oauth_settings
+
+
+class SharedTransport(httpx.AsyncHTTPTransport):
+    # authlib открывает клиента через async with на каждый запрос, и
+    # AsyncClient.__aexit__ закрывает транспорт через __aexit__, минуя aclose.
+    # Пул соединений должен жить до остановки приложения, поэтому
+    # закрывает его только shutdown()
+    async def __aenter__(self) -> "SharedTransport":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        pass
+
+    async def aclose(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        await super().aclose()
+
+
+class GithubOAuth:
+    def __init__(self, settings: Dict[str, Any]):
+        self.settings = settings
+        self.oauth: Optional[OAuth] = None
+        self.transport: Optional[SharedTransport] = None
+
+    async def connect(self):
+        self.transport = SharedTransport(
+            limits=httpx.Limits(
+                max_connections=self.settings["max_connections"],
+                max_keepalive_connections=self.settings["max_keepalive_connections"]
+            )
+        )
+        self.oauth = OAuth()
+        self.oauth.register(
+            name='github',
+            client_id=self.settings['CLIENT_ID'],
+            client_secret=self.settings['CLIENT_SECRET'],
+            authorize_url=self.settings['authorize_url'],
+            access_token_url=self.settings['access_token_url'],
+            api_base_url=self.settings['api_base_url'],
+            client_kwargs={
+                'scope': 'user:email user:user',
+                'transport': self.transport,
+                'timeout': self.settings['timeout']
+            },
+        )
+
+    async def close(self):
+        if self.transport:
+            await self.transport.shutdown()
+
+
+github_oauth = GithubOAuth(get_github_oauth_settings())
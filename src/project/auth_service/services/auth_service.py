@@ -3,37 +3,27 @@ import json
 import logging
 
 import redis
-from authlib.integrations.starlette_client import OAuth
 from jose import JWTError
 from redis.asyncio import Redis
 from sqlalchemy.exc import SQLAlchemyError
 
 from src.project.auth_service.repositories.token_repository import TokenRepository
 from src.project.auth_service.jwt.jwt import create_token, decode_token
+from src.project.auth_service.oauth.github import github_oauth
+from src.shared.cache.user_cache import user_cache
 from src.shared.db.repositories.user_repository import UserRepository
 from src.shared.schemas.Token_schemas import TokenModel
 from src.shared.schemas.User_schema import UserSchema
-from src.shared.config import get_secrets
 
 
 class AuthService:
+    logger = logging.getLogger(__name__)
+
     def __init__(self, repository: UserRepository, tokens_repository: TokenRepository, redis: Redis):
-        self.secrets = get_secrets()
-        self.oauth = OAuth()
+        self.oauth = github_oauth.oauth
         self.repository = repository
         self.tokens_repository = tokens_repository
         self.redis = redis
-        self.logger = logging.getLogger(__name__)
-        self.oauth.register(
-            name='github',
-            client_id=self.secrets['CLIENT_ID'],
-            client_secret=self.secrets['CLIENT_SECRET'],
-            authorize_url='https://github.com/login/oauth/authorize',
-            access_token_url='https://github.com/login/oauth/access_token',
-            api_base_url='https://api.github.com/',
-            client_kwargs={'scope': 'user:email user:user'},
-
-        )
 
     async def get_token(self, user_id: int) -> dict | None:
         data = {"user_id": user_id}
@@ -66,6 +56,7 @@ class AuthService:
 
         res = await self.repository.create_or_update(user_schema)
         if res:
+            await user_cache.invalidate(res.id)
             return res
         else:
             return None
@@ -124,7 +115,7 @@ class AuthService:
             if refresh_token:
                 payload = await decode_token(refresh_token)
                 user_id = payload['user_id']
-                await self.redis.delete(f"current_user{user_id}")
+                await user_cache.invalidate(user_id)
             await self.redis.delete(refresh_token_id)
         except redis.exceptions.ConnectionError as e:
             self.logger.warning(f'Redis недоступен: {e}')
@@ -9,15 +9,25 @@ from starlette.middleware.sessions import SessionMiddleware
 
 from src.project.email_service.routers.email import router as email
 from src.project.auth_service.routers.auth import router as auth
+from src.project.auth_service.oauth.github import github_oauth
 from src.project.management_service.routers.audit import router as audit
 from src.project.management_service.routers.link import router as link_router
 from src.project.management_service.routers.project import router as project_router
 from src.project.management_service.routers.role import router as role_router
 from src.project.management_service.routers.task import router as task_router
 from src.project.statistics_service.routers.statistic_router import router as stat
+from src.project.monitoring_service.routers.metrics import router as metrics
 from src.project.management_service.mongo.db.database import database
+from src.project.management_service.mongo.archive import audit_archive
+from src.project.management_service.mongo.relay import outbox_relay
 from src.shared.config import origins, get_middleware_secret
+from src.shared.cache.user_cache import user_cache
+from src.shared.db.redis_client import redis_client
+from src.shared.ws.coalescer import task_events
+from src.shared.ws.dispatcher import emit_dispatcher
+from src.shared.ws.rooms import room_evictions
 from src.shared.ws.socket import sio
+from src.shared.ws.ws import SocketIOHandlers
 
 logger = logging.getLogger(__name__)
 
@@ -31,13 +41,35 @@ async def lifespan(app: FastAPI):
     logger.info("Инициализация MongoDB...")
     await database.init()
     logger.info("Инициализация - ✅")
+    await outbox_relay.start()
+    logger.info("Создание пула соединений Redis...")
+    await redis_client.connect()
+    logger.info("Пул Redis - ✅")
+    await user_cache.start()
+    await emit_dispatcher.start()
+    await room_evictions.start()
+    await audit_archive.start()
+    await github_oauth.connect()
     yield
+    await github_oauth.close()
+    await room_evictions.stop()
+    await task_events.stop()
+    await emit_dispatcher.stop()
+    await audit_archive.stop()
+    await user_cache.stop()
+    await redis_client.close()
+    logger.info("Пул соединений Redis закрыт")
+    await outbox_relay.stop()
+    logger.info("Outbox аудита остановлен")
     await database.close()
     logger.info("Соединение с MongoDB закрыто")
     print("👋 Приложение остановлено")
 
 
 app = FastAPI(lifespan=lifespan)
+# Обработчики регистрируются здесь: им нужны presence и диспетчер,
+# которые сами импортируют sio
+SocketIOHandlers(sio)
 socketio_app = socketio.ASGIApp(sio, other_asgi_app=app)
 
 app.add_middleware(SessionMiddleware, secret_key=get_middleware_secret())
@@ -58,6 +90,7 @@ app.include_router(link_router)
 app.include_router(role_router)
 app.include_router(audit)
 app.include_router(stat)
+app.include_router(metrics)
 
 if __name__ == "__main__":
     uvicorn.run(app, host='127.0.0.1', port=8000)
\ No newline at end of file
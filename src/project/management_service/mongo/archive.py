@@ -0,0 +1,238 @@
+import asyncio
+import datetime
+import gzip
+import json
+import logging
+import mmap
+import os
+import uuid
+from collections import defaultdict
+from pathlib import Path
+from typing import Optional, Dict, Any, Iterator
+
+from bson import ObjectId
+from pymongo import ASCENDING
+
+from src.project.management_service.mongo.db.models import History
+from src.shared.config import get_audit_archive_settings
+from src.shared.db.redis_client import redis_client
+
+
+# Блокировка снимается и продлевается только владельцем: иначе
+# прогон, переживший ex, удалил бы блокировку следующего экземпляра
+RELEASE_LOCK = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+RENEW_LOCK = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+def encode_json(value: Any) -> Any:
+    if isinstance(value, datetime.datetime):
+        return value.isoformat(timespec='microseconds')
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+# Архив истории на диске: project_{id}/{день}.ndjson.gz и {день}.idx.json.
+# Каждый прогон дописывает в сегмент отдельный gzip-member, а индекс хранит
+# его смещение, длину и границы по времени, так что чтение распаковывает
+# только нужные блоки
+class AuditArchive:
+    lock_key = "audit_archive_lock"
+    checkpoint_name = "checkpoint.json"
+
+    def __init__(self, settings: Dict[str, Any]):
+        self.directory = Path(settings["directory"])
+        self.archive_after = datetime.timedelta(hours=settings["archive_after"])
+        self.interval = settings["interval"]
+        self.batch_size = settings["batch_size"]
+        self._worker: Optional[asyncio.Task] = None
+        self.runs = 0
+        self.archived = 0
+        self.failures = 0
+        self.last_run_at: Optional[datetime.datetime] = None
+        self.logger = logging.getLogger(__name__)
+
+    def _segment_paths(self, project_id: int, day: datetime.date) -> tuple[Path, Path]:
+        base = self.directory / f"project_{project_id}"
+        return base / f"{day.isoformat()}.ndjson.gz", base / f"{day.isoformat()}.idx.json"
+
+    @staticmethod
+    def _read_json(path: Path, default: Any) -> Any:
+        try:
+            return json.loads(path.read_text())
+        except FileNotFoundError:
+            return default
+
+    @staticmethod
+    def _write_json(path: Path, data: Any):
+        tmp = path.with_name(path.name + '.tmp')
+        tmp.write_text(json.dumps(data))
+        os.replace(tmp, path)
+
+    def _append(self, project_id: int, day: datetime.date, events: list[Dict[str, Any]]) -> int:
+        segment, index_path = self._segment_paths(project_id, day)
+        segment.parent.mkdir(parents=True, exist_ok=True)
+        index = self._read_json(index_path, [])
+        if index:
+            # После сбоя между записью сегмента и чекпоинтом часть событий
+            # уже лежит в архиве - они отсекаются по последнему ключу индекса
+            last_key = (index[-1]['last_created_at'], index[-1]['last_id'])
+            events = [event for event in events if (event['created_at'], event['_id']) > last_key]
+        if not events:
+            return 0
+        lines = ''.join(json.dumps(event, ensure_ascii=False, default=encode_json) + '\n' for event in events)
+        block = gzip.compress(lines.encode())
+        with open(segment, 'ab') as file:
+            offset = file.tell()
+            file.write(block)
+            file.flush()
+            os.fsync(file.fileno())
+        index.append({
+            'offset': offset,
+            'length': len(block),
+            'count': len(events),
+            'first_created_at': events[0]['created_at'],
+            'last_created_at': events[-1]['created_at'],
+            'last_id': events[-1]['_id'],
+        })
+        self._write_json(index_path, index)
+        return len(events)
+
+    async def _write_batch(self, documents: list[Dict[str, Any]]) -> int:
+        groups = defaultdict(list)
+        for document in documents:
+            day = document['created_at'].date()
+            event = document | {
+                '_id': str(document['_id']),
+                'created_at': encode_json(document['created_at'])
+            }
+            groups[(document['project_id'], day)].append(event)
+        written = 0
+        for (project_id, day), events in groups.items():
+            written += await asyncio.to_thread(self._append, project_id, day, events)
+        last = documents[-1]
+        checkpoint = {'created_at': encode_json(last['created_at']), 'id': str(last['_id'])}
+        await asyncio.to_thread(self._write_json, self.directory / self.checkpoint_name, checkpoint)
+        return written
+
+    async def _renew_lock(self, token: str) -> bool:
+        return bool(await redis_client.client.eval(RENEW_LOCK, 1, self.lock_key, token, int(self.interval)))
+
+    async def archive_once(self) -> int:
+        # Архив пишет только один экземпляр приложения за раз
+        token = uuid.uuid4().hex
+        if not await redis_client.client.set(self.lock_key, token, nx=True, ex=int(self.interval)):
+            return 0
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            query = {'created_at': {'$lt': datetime.datetime.now() - self.archive_after}}
+            checkpoint = self._read_json(self.directory / self.checkpoint_name, None)
+            if checkpoint is not None:
+                created_at = datetime.datetime.fromisoformat(checkpoint['created_at'])
+                query = {'$and': [query, {'$or': [
+                    {'created_at': {'$gt': created_at}},
+                    {'created_at': created_at, '_id': {'$gt': ObjectId(checkpoint['id'])}}
+                ]}]}
+            cursor = (History.get_motor_collection()
+                      .find(query)
+                      .sort([('created_at', ASCENDING), ('_id', ASCENDING)])
+                      .batch_size(self.batch_size))
+            written = 0
+            batch = []
+            async for document in cursor:
+                batch.append(document)
+                if len(batch) >= self.batch_size:
+                    written += await self._write_batch(batch)
+                    batch = []
+                    if not await self._renew_lock(token):
+                        # Блокировка истекла и могла перейти другому экземпляру:
+                        # остаток он дочитает от чекпоинта
+                        self.logger.warning("Блокировка архива аудита потеряна, прогон прерван")
+                        break
+            if batch:
+                written += await self._write_batch(batch)
+            self.runs += 1
+            self.archived += written
+            self.last_run_at = datetime.datetime.now()
+            return written
+        finally:
+            await redis_client.client.eval(RELEASE_LOCK, 1, self.lock_key, token)
+
+    def read(self,
+             project_id: int,
+             day: datetime.date,
+             start: Optional[datetime.datetime] = None,
+             end: Optional[datetime.datetime] = None) -> Iterator[bytes]:
+        segment, index_path = self._segment_paths(project_id, day)
+        index = self._read_json(index_path, None)
+        if not index:
+            raise KeyError("Archive not found")
+        start_key = encode_json(start) if start else None
+        end_key = encode_json(end) if end else None
+
+        def stream() -> Iterator[bytes]:
+            with open(segment, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for entry in index:
+                    if start_key and entry['last_created_at'] < start_key:
+                        continue
+                    if end_key and entry['first_created_at'] > end_key:
+                        continue
+                    block = gzip.decompress(mapped[entry['offset']:entry['offset'] + entry['length']])
+                    if not (start_key or end_key):
+                        yield block
+                        continue
+                    for line in block.splitlines(keepends=True):
+                        created_at = json.loads(line)['created_at']
+                        if (start_key and created_at < start_key) or (end_key and created_at > end_key):
+                            continue
+                        yield line
+
+        return stream()
+
+    async def _run(self):
+        while True:
+            try:
+                written = await self.archive_once()
+                if written:
+                    self.logger.info(f"В архив аудита перенесено событий: {written}")
+            except Exception as e:
+                # Любая ошибка прогона не должна останавливать воркер
+                self.failures += 1
+                self.logger.exception(f"Ошибка архивации аудита: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def start(self):
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._worker is not None,
+            "directory": str(self.directory),
+            "runs": self.runs,
+            "archived": self.archived,
+            "failures": self.failures,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+        }
+
+
+audit_archive = AuditArchive(get_audit_archive_settings())
@@ -0,0 +1,38 @@
+import copy
+from typing import Any, Dict, List
+
+from pydantic import BaseModel
+
+
+class FieldChange(BaseModel):
+    path: str
+    old: Any = None
+    new: Any = None
+
+
+def diff_snapshots(old: Dict[str, Any], new: Dict[str, Any], prefix: str = '') -> List[FieldChange]:
+    # Вложенные словари раскладываются по путям, списки и значения
+    # сравниваются целиком
+    changes = []
+    for key in sorted(old.keys() | new.keys()):
+        path = f"{prefix}{key}"
+        old_value = old.get(key)
+        new_value = new.get(key)
+        if isinstance(old_value, dict) and isinstance(new_value, dict):
+            changes.extend(diff_snapshots(old_value, new_value, f"{path}."))
+        elif old_value != new_value:
+            changes.append(FieldChange(path=path, old=old_value, new=new_value))
+    return changes
+
+
+def apply_changes(snapshot: Dict[str, Any], changes: List[FieldChange], reverse: bool = False) -> Dict[str, Any]:
+    # reverse=True откатывает изменения: из состояния после события
+    # получается состояние до него
+    result = copy.deepcopy(snapshot)
+    for change in changes:
+        *parents, field = change.path.split('.')
+        target = result
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[field] = copy.deepcopy(change.old if reverse else change.new)
+    return result
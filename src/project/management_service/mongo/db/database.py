@@ -1,10 +1,11 @@
+import logging
 from typing import Optional
 
 from beanie import init_beanie
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 
 from src.shared.config import get_mongo_db_url, get_mongo_db_name
-from src.project.management_service.mongo.db.models import History
+from src.project.management_service.mongo.db.models import History, HISTORY_INDEXES
 
 
 class Database:
@@ -13,6 +14,7 @@ class Database:
         self.db_name = db_name
         self.client: Optional[AsyncIOMotorClient] = None
         self.db: Optional[AsyncIOMotorDatabase] = None
+        self.logger = logging.getLogger(__name__)
 
     async def connect(self):
         self.client = AsyncIOMotorClient(self.db_url)
@@ -22,8 +24,27 @@ class Database:
     async def init(self):
         await init_beanie(
             database=self.db,
-            document_models=[History]
+            document_models=[History],
+            allow_index_dropping=True
         )
+        await self.check_indexes()
+
+    async def check_indexes(self):
+        # Сверяет объявленные индексы истории с реальными и по $indexStats
+        # показывает те, которыми запросы не пользуются
+        collection = History.get_motor_collection()
+        stats = await collection.aggregate([{'$indexStats': {}}]).to_list(length=None)
+        existing = {tuple(stat['key'].items()): stat for stat in stats}
+        for index in HISTORY_INDEXES:
+            key = tuple(index.document['key'].items())
+            if key not in existing:
+                self.logger.warning(f"Индекс истории {index.document['name']} отсутствует")
+        for key, stat in existing.items():
+            if stat['name'] == '_id_':
+                continue
+            accesses = stat['accesses']
+            if accesses['ops'] == 0:
+                self.logger.info(f"Индекс истории {stat['name']} не использовался с {accesses['since']}")
 
     async def close(self):
         if self.client:
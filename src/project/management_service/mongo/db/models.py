@@ -1,14 +1,16 @@
 from datetime import datetime
-from typing import Optional, Dict, Any, Union, Literal
+from typing import Optional, Dict, Any, Union, Literal, List
 
 from beanie import Document
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from pydantic import model_validator
-from pymongo import IndexModel
+from pymongo import IndexModel, ASCENDING
+
+from src.project.management_service.mongo.db.changes import FieldChange, diff_snapshots, apply_changes
 
 from src.shared.schemas.Link_schemas import LinkSchemaExtend
 from src.shared.schemas.Project_schemas import ProjectMemberSchemaExtend, ProjectData, ProjectRel
-from src.shared.schemas.Role_schemas import RoleSchema, RoleSchemaWithId
+from src.shared.schemas.Role_schemas import RoleMaskSchema
 from src.shared.schemas.Task_schemas import TaskGetSchema, BaseTaskSchema
 from src.shared.schemas.User_schema import UserSchema
 
@@ -28,6 +30,41 @@ class BaseActionData(BaseModel):
         return data
 
 
+# Событие изменения хранит только отличающиеся поля. Старые документы
+# с полными old_data/new_data по-прежнему читаются: changes для них
+# вычисляются при валидации
+class DiffActionData(BaseActionData):
+    changes: List[FieldChange] = Field(default_factory=list)
+    _snapshot: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+
+    @model_validator(mode="after")
+    def fill_changes(self):
+        old_data = getattr(self, 'old_data', None)
+        new_data = getattr(self, 'new_data', None)
+        if not self.changes and old_data is not None and new_data is not None:
+            self.changes = diff_snapshots(old_data.model_dump(mode='json'), new_data.model_dump(mode='json'))
+        if not self.changes:
+            raise ValueError("old_data and new_data cannot be identical for change actions")
+        return self
+
+    @classmethod
+    def from_snapshots(cls, old_data: Dict[str, Any], new_data: Dict[str, Any], **fields):
+        action = cls(changes=diff_snapshots(old_data, new_data), **fields)
+        action._snapshot = new_data
+        return action
+
+    @property
+    def snapshot(self) -> Optional[Dict[str, Any]]:
+        # Полное состояние после изменения, есть только у только что
+        # созданного события и в БД не сохраняется
+        return self._snapshot
+
+    def reconstruct(self, snapshot: Dict[str, Any], reverse: bool = False) -> Dict[str, Any]:
+        # Прямо - состояние после события из состояния до него,
+        # reverse=True - наоборот
+        return apply_changes(snapshot, self.changes, reverse)
+
+
 class DeleteUserActionData(BaseActionData):
     action_type: Literal["delete_user"] = "delete_user"
     deleted_user: ProjectMemberSchemaExtend
@@ -37,8 +74,8 @@ class DeleteUserActionData(BaseActionData):
 class ChangeRoleActionData(BaseActionData):
     action_type: Literal["change_role"] = "change_role"
     role_id: int
-    old_data: RoleSchema
-    new_data: RoleSchema
+    old_data: RoleMaskSchema
+    new_data: RoleMaskSchema
 
 
 class CreateTaskActionData(BaseActionData):
@@ -51,10 +88,11 @@ class DeleteTaskActionData(BaseActionData):
     deleted_task: BaseTaskSchema
 
 
-class ChangeTaskActionData(BaseActionData):
+class ChangeTaskActionData(DiffActionData):
     action_type: Literal["change_task"] = "change_task"
-    old_data: TaskGetSchema
-    new_data: TaskGetSchema
+    task_id: Optional[int] = None
+    old_data: Optional[TaskGetSchema] = None
+    new_data: Optional[TaskGetSchema] = None
 
 
 class CompleteTaskActionData(BaseActionData):
@@ -85,38 +123,38 @@ class LinkDeleteActionData(BaseActionData):
 class ChangeUserRoleActionData(BaseActionData):
     action_type: Literal["change_user_role"] = "change_user_role"
     changed_role_user: UserSchema
-    old_data: RoleSchema
-    new_data: RoleSchema
+    old_data: RoleMaskSchema
+    new_data: RoleMaskSchema
 
 
-class ChangeDefaultRoleData(BaseActionData):
+class ChangeDefaultRoleData(DiffActionData):
     action_type: Literal["change_default_role"] = "change_default_role"
-    old_data: RoleSchema
-    new_data: RoleSchema
+    old_data: Optional[RoleMaskSchema] = None
+    new_data: Optional[RoleMaskSchema] = None
 
 
 class DeleteRoleActionData(BaseActionData):
     action_type: Literal["delete_role"] = "delete_role"
     role_id: int
-    deleted_role: RoleSchema
+    deleted_role: RoleMaskSchema
 
 
 class CreateRoleActionData(BaseActionData):
     action_type: Literal["create_role"] = "create_role"
-    created_role: RoleSchema
+    created_role: RoleMaskSchema
 
 
-class EditRoleActionData(BaseActionData):
+class EditRoleActionData(DiffActionData):
     action_type: Literal['edit_role'] = 'edit_role'
     role_id: int
-    old_data: RoleSchema
-    new_data: RoleSchema
+    old_data: Optional[RoleMaskSchema] = None
+    new_data: Optional[RoleMaskSchema] = None
 
 
-class ChangeProjectActionData(BaseActionData):
+class ChangeProjectActionData(DiffActionData):
     action_type: Literal["change_project"] = "change_project"
-    old_data: ProjectData
-    new_data: ProjectData
+    old_data: Optional[ProjectData] = None
+    new_data: Optional[ProjectData] = None
 
 
 class UserJoinActionData(BaseActionData):
@@ -124,10 +162,24 @@ class UserJoinActionData(BaseActionData):
     project_data: ProjectRel
 
 
+# Каждый запрос истории фильтрует по project_id, поэтому он стоит первым
+# во всех составных индексах; (created_at, _id) - ключ пагинации
+HISTORY_INDEXES = [
+    IndexModel([('project_id', ASCENDING), ('created_at', ASCENDING), ('_id', ASCENDING)],
+               name='project_created_at'),
+    IndexModel([('project_id', ASCENDING), ('action.action_type', ASCENDING), ('action.timestamp', ASCENDING)],
+               name='project_action_type_timestamp'),
+    IndexModel([('project_id', ASCENDING), ('user.id', ASCENDING), ('action.timestamp', ASCENDING)],
+               name='project_user_timestamp'),
+    IndexModel([('created_at', ASCENDING)],
+               expireAfterSeconds=3600 * 48),
+]
+
+
 class History(Document):
     project_id: int
     user: UserSchema
-    created_at: datetime = Field(default=datetime.now())
+    created_at: datetime = Field(default_factory=datetime.now)
     action: Union[
             DeleteUserActionData,
             ChangeRoleActionData,
@@ -154,19 +206,12 @@ class History(Document):
             if isinstance(action, dict):
 
                 if action.get('action_type') in ['change_role', 'change_task', 'change_default_role', 'change_project']:
-                    old_data = action.get('old_data', {})
-                    new_data = action.get('new_data', {})
+                    old_data = action.get('old_data')
+                    new_data = action.get('new_data')
                     if isinstance(old_data, dict) and isinstance(new_data, dict) and old_data == new_data:
                         raise ValueError("old_data and new_data cannot be identical for change actions")
         return data
 
     class Settings:
         name = "history"
-        indexes = [
-            "project_id",
-            "user.id",
-            "action.action_type",
-            "timestamp",
-            IndexModel([('created_at', 1)],
-                       expireAfterSeconds=3600 * 48)
-        ]
+        indexes = HISTORY_INDEXES
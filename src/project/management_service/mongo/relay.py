@@ -0,0 +1,111 @@
+import asyncio
+import datetime
+import logging
+import time
+from typing import Optional, Dict, Any
+
+import pymongo.errors
+from asyncpg import PostgresError
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+
+from src.project.management_service.mongo.db.models import History
+from src.project.management_service.mongo.repositories.mongo_repositroy import MongoRepository
+from src.project.management_service.repositories.outbox_repository import OutboxRepository
+from src.shared.config import get_audit_relay_settings, async_session
+
+
+class OutboxRelay:
+    def __init__(self, settings: Dict[str, Any]):
+        self.batch_size = settings["batch_size"]
+        self.poll_interval = settings["poll_interval"]
+        self.drain_timeout = settings["drain_timeout"]
+        self._worker: Optional[asyncio.Task] = None
+        self.relayed = 0
+        self.invalid = 0
+        self.failures = 0
+        self.batches = 0
+        self.last_batch_size = 0
+        self.flush_total = 0.0
+        self.flush_max = 0.0
+        self.lag = 0.0
+        self.logger = logging.getLogger(__name__)
+
+    async def relay_once(self) -> int:
+        # Строки блокируются до коммита: параллельные воркеры берут
+        # следующие пачки, а при сбое MongoDB события остаются в outbox
+        async with async_session() as session:
+            outbox = OutboxRepository(session)
+            events = await outbox.lock_batch(self.batch_size)
+            if not events:
+                return 0
+            records = []
+            for event in events:
+                try:
+                    records.append(History.model_validate({**event.payload, '_id': event.document_id}))
+                except ValidationError as e:
+                    self.invalid += 1
+                    self.logger.error(f"Событие аудита {event.document_id} не прошло валидацию и отброшено: {e}")
+            started = time.perf_counter()
+            if records:
+                await MongoRepository.add_many(records)
+            await outbox.delete_batch([event.id for event in events])
+            await session.commit()
+
+        elapsed = time.perf_counter() - started
+        self.relayed += len(records)
+        self.batches += 1
+        self.last_batch_size = len(events)
+        self.flush_total += elapsed
+        self.flush_max = max(self.flush_max, elapsed)
+        self.lag = (datetime.datetime.now(datetime.timezone.utc) - events[0].created_at).total_seconds()
+        return len(events)
+
+    async def _run(self):
+        while True:
+            try:
+                relayed = await self.relay_once()
+            except (SQLAlchemyError, PostgresError, pymongo.errors.PyMongoError) as e:
+                self.failures += 1
+                self.logger.warning(f"Не удалось перенести события аудита: {e}")
+                relayed = 0
+            if relayed < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+    async def start(self):
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        # Остаток outbox переносится до закрытия соединений; что не успело,
+        # заберет следующий запуск
+        try:
+            async with asyncio.timeout(self.drain_timeout):
+                while await self.relay_once():
+                    pass
+        except (TimeoutError, SQLAlchemyError, PostgresError, pymongo.errors.PyMongoError) as e:
+            self.logger.warning(f"Outbox аудита разобран не полностью: {e!r}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._worker is not None,
+            "relayed": self.relayed,
+            "invalid": self.invalid,
+            "failures": self.failures,
+            "batches": self.batches,
+            "last_batch_size": self.last_batch_size,
+            "flush_avg_ms": round(self.flush_total / self.batches * 1000, 3) if self.batches else 0.0,
+            "flush_max_ms": round(self.flush_max * 1000, 3),
+            "lag_seconds": round(self.lag, 3),
+        }
+
+
+outbox_relay = OutboxRelay(get_audit_relay_settings())
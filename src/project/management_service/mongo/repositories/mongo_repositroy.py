@@ -1,37 +1,239 @@
-from src.shared.schemas.FilterSchemas import HistoryFilter
-from src.project.management_service.mongo.db.models import BaseActionData, History
-from src.shared.schemas.User_schema import UserSchema
+import asyncio
+import datetime
+import re
+from typing import Dict, Any, AsyncIterator
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import BulkWriteError
+
+from src.shared.schemas.FilterSchemas import HistoryFilter, HistoryPagination, SortDirection, HistoryStatsFilter
+from src.project.management_service.mongo.db.models import History
+from src.shared.schemas.pagination import encode_cursor, decode_cursor
+
+DUPLICATE_KEY_ERROR = 11000
+SUMMARY_FIELDS = [
+    'project_id',
+    'created_at',
+    'user.id',
+    'user.username',
+    'action.action_type',
+    'action.timestamp',
+]
+FIELD_PATTERN = re.compile(r'[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)*')
 
 
 class MongoRepository:
 
 
     @staticmethod
-    async def add_to_db(action: BaseActionData,
-                        project_id: int,
-                        user: UserSchema):
-        record = History(user=user,
-                         project_id=project_id,
-                         action=action)
-        await record.insert()
+    async def add_many(records: list[History]):
+        # _id документов заданы заранее, поэтому повторная доставка
+        # того же события упирается в дубликат ключа и пропускается
+        try:
+            await History.insert_many(records, ordered=False)
+        except BulkWriteError as e:
+            errors = e.details.get('writeErrors', [])
+            if any(error.get('code') != DUPLICATE_KEY_ERROR for error in errors):
+                raise e
         return True
 
     @staticmethod
-    async def get_all(project_id: int):
-        result = await History.find({'project_id': project_id}).to_list()
-        return result
+    def _cursor_filter(cursor: str, sort_dir: SortDirection) -> Dict[str, Any]:
+        payload = decode_cursor(cursor)
+        if payload.get('sort_dir') != sort_dir.value:
+            raise ValueError("Cursor does not match sorting")
+        try:
+            created_at = datetime.datetime.fromisoformat(payload['created_at'])
+            document_id = ObjectId(payload['id'])
+        except (KeyError, TypeError, ValueError, InvalidId):
+            raise ValueError("Invalid cursor")
+        operator = '$lt' if sort_dir == SortDirection.DESC else '$gt'
+        return {'$or': [
+            {'created_at': {operator: created_at}},
+            {'created_at': created_at, '_id': {operator: document_id}}
+        ]}
+
+    @staticmethod
+    def page_sort(sort_dir: SortDirection) -> list[tuple[str, int]]:
+        direction = DESCENDING if sort_dir == SortDirection.DESC else ASCENDING
+        return [('created_at', direction), ('_id', direction)]
+
+    async def _get_page(self, query: Dict[str, Any], pagination: HistoryPagination) -> Dict[str, Any]:
+        if pagination.cursor is not None:
+            query = {'$and': [query, self._cursor_filter(pagination.cursor, pagination.sort_dir)]}
+        sort = self.page_sort(pagination.sort_dir)
+        limit = pagination.limit
+        fields = pagination.fields or (SUMMARY_FIELDS if pagination.summary else None)
+
+        if fields is None:
+            documents = await History.find(query).sort(sort).limit(limit + 1).to_list()
+            keys = [(document.created_at, document.id) for document in documents]
+        else:
+            # Для сокращенного списка документы не проходят через модель History:
+            # MongoDB отдает только нужные поля, и они возвращаются как есть
+            if any(not FIELD_PATTERN.fullmatch(field) for field in fields):
+                raise ValueError("Invalid projection field")
+            projection = {field: 1 for field in fields} | {'created_at': 1}
+            cursor = History.get_motor_collection().find(query, projection).sort(sort).limit(limit + 1)
+            raw = await cursor.to_list(length=limit + 1)
+            keys = [(document['created_at'], document['_id']) for document in raw]
+            documents = [document | {'_id': str(document['_id'])} for document in raw]
+
+        next_cursor = None
+        if len(documents) > limit:
+            documents = documents[:limit]
+            created_at, document_id = keys[limit - 1]
+            next_cursor = encode_cursor({
+                'sort_dir': pagination.sort_dir.value,
+                'created_at': created_at.isoformat(),
+                'id': str(document_id)
+            })
+        return {
+            'items': documents,
+            'next_cursor': next_cursor
+        }
+
+    async def get_all(self, project_id: int, pagination: HistoryPagination) -> Dict[str, Any]:
+        return await self._get_page({'project_id': project_id}, pagination)
+
+    @staticmethod
+    async def stream(project_id: int, batch_size: int) -> AsyncIterator[Dict[str, Any]]:
+        # Motor подгружает документы пачками по batch_size, поэтому в памяти
+        # держится не больше одной пачки независимо от размера истории
+        cursor = (History.get_motor_collection()
+                  .find({'project_id': project_id})
+                  .sort([('created_at', ASCENDING), ('_id', ASCENDING)])
+                  .batch_size(batch_size))
+        async for document in cursor:
+            yield document
 
     @staticmethod
-    async def get_with_filters(project_id: int, filters: HistoryFilter):
+    async def watch(project_id: int, batch_size: int) -> AsyncIterator[Dict[str, Any]]:
+        # Change stream доступен только на replica set; на одиночном
+        # сервере MongoDB отвечает OperationFailure
+        pipeline = [{'$match': {'operationType': 'insert', 'fullDocument.project_id': project_id}}]
+        async with History.get_motor_collection().watch(pipeline, batch_size=batch_size) as stream:
+            async for change in stream:
+                yield change['fullDocument']
+
+    @staticmethod
+    async def poll(project_id: int,
+                   batch_size: int,
+                   poll_interval: float,
+                   window: float) -> AsyncIterator[Dict[str, Any]]:
+        # created_at ставится при записи в outbox, а в MongoDB событие
+        # попадает позже, поэтому каждый опрос перечитывает последние
+        # window секунд и отсекает уже отданные _id
+        collection = History.get_motor_collection()
+        window = datetime.timedelta(seconds=window)
+        seen: Dict[ObjectId, datetime.datetime] = {}
+        initial = True
+        while True:
+            polled_at = datetime.datetime.now()
+            cursor = (collection
+                      .find({'project_id': project_id, 'created_at': {'$gte': polled_at - window}})
+                      .sort([('created_at', ASCENDING), ('_id', ASCENDING)])
+                      .batch_size(batch_size))
+            async for document in cursor:
+                if document['_id'] in seen:
+                    continue
+                seen[document['_id']] = document['created_at']
+                if not initial:
+                    yield document
+            initial = False
+            seen = {key: created_at for key, created_at in seen.items() if created_at >= polled_at - window}
+            await asyncio.sleep(poll_interval)
+
+    @staticmethod
+    def filters_query(project_id: int, filters: HistoryFilter) -> Dict[str, Any]:
+        # Фильтр по пользователю попадает в индекс project_user_timestamp,
+        # по типу действия - в project_action_type_timestamp
         history_filter = {'project_id': project_id}
         if user_id := filters.from_user:
             history_filter.update({'user.id': user_id})
+        timestamp = {}
         if start_interval := filters.time_interval_start:
-            history_filter.update({'action.timestamp': {'$gte': start_interval}})
+            timestamp['$gte'] = datetime.datetime.combine(start_interval, datetime.time.min)
         if end_interval := filters.time_interval_end:
-            history_filter.update({'action.timestamp': {'$lte': end_interval}})
+            timestamp['$lte'] = datetime.datetime.combine(end_interval, datetime.time.max)
+        if timestamp:
+            history_filter.update({'action.timestamp': timestamp})
         if action_type := filters.action_type:
-            history_filter.update({'action.action_type': {"$in": action_type}})
-        result = await History.find(history_filter).to_list()
-        return result
+            history_filter.update({'action.action_type': {"$in": [action.value for action in action_type if action]}})
+        return history_filter
+
+    async def get_with_filters(self, project_id: int, filters: HistoryFilter) -> Dict[str, Any]:
+        return await self._get_page(self.filters_query(project_id, filters), filters)
+
+    @staticmethod
+    async def get_changes(project_id: int,
+                          action_type: str,
+                          match: Dict[str, Any],
+                          limit: int) -> list[History]:
+        # События изменения одной сущности от новых к старым; project_id
+        # и тип действия попадают в индекс project_action_type_timestamp
+        query = {'project_id': project_id, 'action.action_type': action_type, **match}
+        return await (History.find(query)
+                      .sort([('created_at', DESCENDING), ('_id', DESCENDING)])
+                      .limit(limit)
+                      .to_list())
+
+    @staticmethod
+    def _stats_match(project_id: int, filters: HistoryStatsFilter) -> Dict[str, Any]:
+        # Фильтр по project_id и created_at попадает в индекс project_created_at
+        match = {'project_id': project_id}
+        created_at = {}
+        if filters.start:
+            created_at['$gte'] = datetime.datetime.combine(filters.start, datetime.time.min)
+        if filters.end:
+            created_at['$lte'] = datetime.datetime.combine(filters.end, datetime.time.max)
+        if created_at:
+            match['created_at'] = created_at
+        return match
+
+    async def count_actions(self, project_id: int, filters: HistoryStatsFilter) -> list[Dict[str, Any]]:
+        pipeline = [
+            {'$match': self._stats_match(project_id, filters)},
+            {'$group': {'_id': '$action.action_type', 'count': {'$sum': 1}}},
+            {'$sort': {'count': -1, '_id': 1}},
+            {'$project': {'_id': 0, 'action_type': '$_id', 'count': 1}},
+        ]
+        return await History.aggregate(pipeline).to_list()
+
+    async def count_by_member(self, project_id: int, filters: HistoryStatsFilter) -> list[Dict[str, Any]]:
+        pipeline = [
+            {'$match': self._stats_match(project_id, filters)},
+            {'$group': {
+                '_id': '$user.id',
+                'username': {'$last': '$user.username'},
+                'count': {'$sum': 1},
+                'last_action_at': {'$max': '$created_at'},
+            }},
+            {'$sort': {'count': -1, '_id': 1}},
+            {'$project': {
+                '_id': 0,
+                'user_id': '$_id',
+                'username': 1,
+                'count': 1,
+                'last_action_at': {'$dateToString': {'date': '$last_action_at', 'format': '%Y-%m-%dT%H:%M:%S'}},
+            }},
+        ]
+        return await History.aggregate(pipeline).to_list()
 
+    async def count_by_bucket(self, project_id: int, filters: HistoryStatsFilter) -> list[Dict[str, Any]]:
+        pipeline = [
+            {'$match': self._stats_match(project_id, filters)},
+            {'$group': {
+                '_id': {'$dateTrunc': {'date': '$created_at', 'unit': filters.bucket}},
+                'count': {'$sum': 1},
+            }},
+            {'$sort': {'_id': 1}},
+            {'$project': {
+                '_id': 0,
+                'bucket': {'$dateToString': {'date': '$_id', 'format': '%Y-%m-%dT%H:%M:%S'}},
+                'count': 1,
+            }},
+        ]
+        return await History.aggregate(pipeline).to_list()
@@ -13,8 +13,14 @@ class LinkRepository(BaseRepository):
     def __init__(self, db: AsyncSession):
         super().__init__(ProjectLink, db)
 
-    async def get_by_code(self, code: str, current_date: datetime.datetime):
-        stmt = (select(ProjectLink)
+    async def add_link(self, data: dict):
+        link = ProjectLink(**data)
+        self.session.add(link)
+        await self.session.flush()
+
+    @staticmethod
+    def by_code_stmt(code: str, current_date: datetime.datetime):
+        return (select(ProjectLink)
         .where(
             ProjectLink.link == code,
             or_(
@@ -25,6 +31,9 @@ class LinkRepository(BaseRepository):
                 selectinload(ProjectLink.project_rel)
             )
         )
+
+    async def get_by_code(self, code: str, current_date: datetime.datetime):
+        stmt = self.by_code_stmt(code, current_date)
         res = await self.session.execute(stmt)
         return res.scalars().one_or_none()
 
@@ -43,7 +52,7 @@ class LinkRepository(BaseRepository):
         res = await self.session.execute(stmt)
         links_db = res.scalars().all()
         links_schema = [LinkSchemaExtend.model_validate(link) for link in links_db]
-        await self.session.commit()
+        await self.session.flush()
         return links_schema
 
     async def delete_by_code(self, link_code: str, project_id: int) -> LinkSchemaExtend:
@@ -55,7 +64,7 @@ class LinkRepository(BaseRepository):
                 .returning(ProjectLink)
                 )
         result = await self.session.execute(stmt)
-        await self.session.commit()
+        await self.session.flush()
         link_db = result.scalars().one()
         link_schema = LinkSchemaExtend.model_validate(link_db)
         return link_schema
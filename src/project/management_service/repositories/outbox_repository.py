@@ -0,0 +1,37 @@
+from typing import Sequence
+
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.project.management_service.mongo.db.models import History
+from src.shared.db.models import AuditOutbox
+from src.shared.db.repositories.base_repository import BaseRepository
+
+
+class OutboxRepository(BaseRepository):
+    def __init__(self, session: AsyncSession):
+        super().__init__(AuditOutbox, session)
+
+    async def add(self, record: History):
+        # Коммит фиксирует и событие, и изменения, которые сервис
+        # уже сделал в этой же сессии
+        event = AuditOutbox(
+            document_id=str(record.id),
+            project_id=record.project_id,
+            payload=record.model_dump(mode='json', exclude={'id', 'revision_id'})
+        )
+        self.session.add(event)
+        await self.session.commit()
+
+    async def lock_batch(self, limit: int) -> Sequence[AuditOutbox]:
+        stmt = (select(AuditOutbox)
+                .order_by(AuditOutbox.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+                )
+        res = await self.session.execute(stmt)
+        return res.scalars().all()
+
+    async def delete_batch(self, ids: list[int]):
+        stmt = delete(AuditOutbox).where(AuditOutbox.id.in_(ids))
+        await self.session.execute(stmt)
@@ -24,14 +24,31 @@ class ProjectMemberRepository(BaseRepository):
 
 
     async def get_member_by_user_id(self, project_id: int, user_id: int):
-        stmt = select(ProjectMember).where(
-            ProjectMember.project_id == project_id,
-            ProjectMember.user_id == user_id
-        ).options(
-            selectinload(ProjectMember.role_rel)
-        )
+        stmt = (select(
+                    ProjectMember.id,
+                    ProjectMember.user_id,
+                    ProjectMember.project_id,
+                    ProjectMember.role_id,
+                    Role.priority,
+                    Role.permissions
+                )
+                .join(Role, Role.id == ProjectMember.role_id)
+                .where(
+                    ProjectMember.project_id == project_id,
+                    ProjectMember.user_id == user_id
+                )
+                )
+        res = await self.session.execute(stmt)
+        return res.one_or_none()
+
+
+    async def get_project_ids(self, user_id: int) -> list[int]:
+        stmt = (select(ProjectMember.project_id)
+                .where(ProjectMember.user_id == user_id)
+                .order_by(ProjectMember.project_id)
+                )
         res = await self.session.execute(stmt)
-        return res.scalars().one_or_none()
+        return list(res.scalars().all())
 
 
     async def add_member(self, data: dict):
@@ -42,7 +59,7 @@ class ProjectMemberRepository(BaseRepository):
             data['role_id'] = new_role.id
         new_member = ProjectMember(**data)
         self.session.add(new_member)
-        await self.session.commit()
+        await self.session.flush()
 
 
     async def delete_member(self, project_id: int, member_id: int) -> ProjectMemberSchemaExtend:
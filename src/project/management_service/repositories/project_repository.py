@@ -5,7 +5,8 @@ from sqlalchemy import select, func, update, or_, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload, selectinload
 
-from src.shared.db.models import Project, ProjectMember, Role, Task, TaskAssignee
+from src.shared.db.documents import role_document, user_document, json_array
+from src.shared.db.models import Project, ProjectMember, Role, Task, TaskAssignee, ProjectCounter, User
 from src.shared.db.repositories.base_repository import BaseRepository
 from src.shared.schemas.Project_schemas import ProjectData
 from src.shared.schemas.Role_schemas import RoleSchemaWithId, RoleSchema
@@ -50,39 +51,25 @@ class ProjectRepository(BaseRepository):
 
 
     async def get_projects_by_user_id(self, user_id):
-        stmt = select(ProjectMember).where(ProjectMember.user_id == user_id).options(
-            selectinload(ProjectMember.project_rel)
-            )
-
-        member_count_subq = (
-            select(
-                ProjectMember.project_id,
-                func.count(ProjectMember.user_id).label("member_count")
-            )
-            .group_by(ProjectMember.project_id)
-            .subquery()
-        )
-
-        stmt = stmt.join(
-            member_count_subq,
-            ProjectMember.project_id == member_count_subq.c.project_id
-        ).add_columns(member_count_subq.c.member_count)
+        # Строка счетчиков может еще не существовать: проект все равно
+        # попадает в список с нулевым числом участников
+        stmt = (select(ProjectMember, func.coalesce(ProjectCounter.members_count, 0).label("member_count"))
+                .outerjoin(ProjectCounter, ProjectCounter.project_id == ProjectMember.project_id)
+                .where(ProjectMember.user_id == user_id)
+                .options(
+                    selectinload(ProjectMember.project_rel)
+                    )
+                )
         res = await self.session.execute(stmt)
         return res.all()
 
     async def get_project_info(self, project_id: int):
-        member_count_subquery = (
-            select(func.count(ProjectMember.id))
-            .where(ProjectMember.project_id == Project.id)
-            .scalar_subquery()
-            .label("member_count")
-        )
-
         stmt = (
             select(
                 Project,
-                member_count_subquery
+                ProjectCounter.members_count.label("member_count")
             )
+            .outerjoin(ProjectCounter, ProjectCounter.project_id == Project.id)
             .where(Project.id == project_id)
             .options(
                 joinedload(Project.creator_rel))
@@ -93,7 +80,7 @@ class ProjectRepository(BaseRepository):
         if not res:
             return None
         project = res[0]
-        project.member_count = res[1]
+        project.member_count = res[1] or 0
 
 
         return {
@@ -115,7 +102,7 @@ class ProjectRepository(BaseRepository):
                 .values(**new_data)
                 )
         await self.session.execute(stmt)
-        await self.session.commit()
+        await self.session.flush()
         return old_data
 
 
@@ -130,6 +117,24 @@ class ProjectRepository(BaseRepository):
         res = await self.session.execute(stmt)
         return res.scalars().all()
 
+    async def get_members_json(self, project_id: int) -> str:
+        document = func.json_build_object(
+            'id', ProjectMember.id,
+            'user_id', ProjectMember.user_id,
+            'project_id', ProjectMember.project_id,
+            'role_id', ProjectMember.role_id,
+            'role_rel', role_document(),
+            'user_rel', user_document()
+        )
+        stmt = (select(json_array(document, ProjectMember.id))
+                .select_from(ProjectMember)
+                .join(User, User.id == ProjectMember.user_id)
+                .join(Role, Role.id == ProjectMember.role_id)
+                .where(ProjectMember.project_id == project_id)
+                )
+        res = await self.session.execute(stmt)
+        return res.scalar_one()
+
     async def change_default_role(self, project_id: int, role_id: int) -> list[RoleSchema]:
         old_role_id_stmt = (select(Project.default_role_id)
                          .where(Project.id == project_id)
@@ -141,14 +146,14 @@ class ProjectRepository(BaseRepository):
             raise ValueError('Old and new data the same')
         roles_stmt = select(Role).where(or_(Role.id == role_id, Role.id == old_role_id))
         res = await self.session.execute(roles_stmt)
-        roles_db = res.scalars().all()
-        roles = [RoleSchema.model_validate(role) for role in roles_db]
+        roles_db = {role.id: RoleSchema.model_validate(role) for role in res.scalars().all()}
+        roles = [roles_db[old_role_id], roles_db[role_id]]
         stmt = (update(Project)
                 .where(Project.id == project_id)
                 .values(default_role_id = role_id)
                 )
         await self.session.execute(stmt)
-        await self.session.commit()
+        await self.session.flush()
         return roles
 
 
@@ -4,6 +4,7 @@ from sqlalchemy import select, desc, update, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from src.shared.db.documents import role_document, json_array
 from src.shared.db.models import Role, ProjectMember
 from src.shared.db.repositories.base_repository import BaseRepository
 from src.shared.schemas.Project_schemas import ProjectMemberSchemaExtend
@@ -19,7 +20,7 @@ class RoleRepository(BaseRepository):
         data_dict = data.model_dump()
         role = Role(project_id=project_id, **data_dict)
         self.session.add(role)
-        await self.session.commit()
+        await self.session.flush()
         role_schema = RoleSchema.model_validate(role)
         return role_schema
 
@@ -38,22 +39,36 @@ class RoleRepository(BaseRepository):
         role_schema = RoleSchema.model_validate(role_db)
         return role_schema
 
+    async def get_role(self, role_id: int, project_id: int) -> Role | None:
+        stmt = select(Role).where(Role.id == role_id, Role.project_id == project_id)
+        res = await self.session.execute(stmt)
+        return res.scalars().one_or_none()
+
     async def get_roles(self, project_id: int):
         stmt = select(Role).where(Role.project_id == project_id).order_by(desc(Role.priority))
         res = await self.session.execute(stmt)
         return res.scalars().all()
 
+    async def get_roles_json(self, project_id: int) -> str:
+        stmt = (select(json_array(role_document(with_id=True), desc(Role.priority)))
+                .where(Role.project_id == project_id)
+                )
+        res = await self.session.execute(stmt)
+        return res.scalar_one()
+
     async def update_role_info(self, role_id: int, new_data: RoleSchema):
         old_data_stmt = select(Role).where(Role.id == role_id)
         old_data_res = await self.session.execute(old_data_stmt)
         old_data = old_data_res.scalars().one_or_none()
-        if not old_data is None:
-            old_data_dict = RoleSchema.model_validate(old_data)
+        if old_data is None:
+            return None
+        # Снимок до UPDATE: сам объект сессия синхронизирует с новыми значениями
+        old_data_dict = RoleSchema.model_validate(old_data)
         data_dict = new_data.model_dump()
         stmt = update(Role).where(Role.id == role_id).values(**data_dict)
         await self.session.execute(stmt)
-        await self.session.commit()
-        return old_data
+        await self.session.flush()
+        return old_data_dict
 
 
     async def update_member_role(self, member_id: int, project_id: int, role_id: int):
@@ -77,7 +92,7 @@ class RoleRepository(BaseRepository):
                         ProjectMember.id == member_id)
                  .values(role_id = role_id))
         await self.session.execute(stmt)
-        await self.session.commit()
+        await self.session.flush()
 
         new_data_stmt = select(Role).where(Role.id == role_id, Role.project_id == project_id)
         res_new_data = await self.session.execute(new_data_stmt)
@@ -1,15 +1,21 @@
 import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Mapping
 
-from sqlalchemy import select, update, delete, asc, desc, func
+from sqlalchemy import select, update, delete, asc, desc, func, tuple_, literal_column, Select, cast, String, \
+    type_coerce, JSON, Text
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from src.shared.db.models import Task, TaskAssignee, ProjectMember
+from src.shared.db.documents import user_document, ru_date
+from src.shared.db.models import Task, TaskAssignee, ProjectMember, TaskPriority, TaskStatus, ProjectCounter, User
 from src.shared.db.repositories.base_repository import BaseRepository
 from src.shared.schemas.Assigneed_schemas import AssigneesModel
 from src.shared.schemas.FilterSchemas import TaskFilter, SortField, SortDirection
 from src.shared.schemas.Task_schemas import EditableTaskData, TaskGetSchema, BaseTaskSchema, CreateTaskSchema
+from src.shared.schemas.pagination import encode_cursor, decode_cursor
+
+NO_DEADLINE = 'infinity'
 
 
 class TaskRepository(BaseRepository):
@@ -24,7 +30,7 @@ class TaskRepository(BaseRepository):
 
             new_task = Task(**task_data, project_id=project_id)
             self.session.add(new_task)
-            await self.session.commit()
+            await self.session.flush()
             new_assignees = [
                 TaskAssignee(**{
                     "task_id": new_task.id,
@@ -33,52 +39,187 @@ class TaskRepository(BaseRepository):
                 for member_id in assignees
             ]
             self.session.add_all(new_assignees)
-            await self.session.commit()
+            await self.session.flush()
             return new_task.id
 
 
-    async def get_tasks(self , project_id: int, limit: int = 20, offset: int = 0):
+    sort_columns = {
+        SortField.CREATED: Task.started_at,
+        SortField.DEADLINE: func.coalesce(Task.deadline, literal_column("'infinity'::date")),
+        SortField.PRIORITY: Task.priority,
+        SortField.STATUS: Task.status,
+    }
 
+    @staticmethod
+    def _assignees_subquery():
+        assignee_json = func.json_build_object(
+            'project_member_rel', func.json_build_object('user_rel', user_document())
+        )
+        return (
+            select(func.coalesce(
+                func.json_agg(aggregate_order_by(assignee_json, ProjectMember.id)),
+                literal_column("'[]'::json")
+            ))
+            .select_from(TaskAssignee)
+            .join(ProjectMember, ProjectMember.id == TaskAssignee.project_member_id)
+            .join(User, User.id == ProjectMember.user_id)
+            .where(TaskAssignee.task_id == Task.id)
+            .correlate(Task)
+            .scalar_subquery()
+        )
 
-        stmt = (select(Task)
-                .where(Task.project_id == project_id)#, Task.status == 'processing')
-                .options(
-            selectinload(Task.assignees_rel)
-            .load_only(TaskAssignee.project_member_id)
-            .selectinload(TaskAssignee.project_member_rel)
-            .selectinload(ProjectMember.user_rel)
+    def _assignees_json(self):
+        return type_coerce(self._assignees_subquery(), JSON).label('assignees_rel')
+
+    def _select_tasks(self) -> Select:
+        # Задачи вместе с исполнителями собираются одним запросом:
+        # исполнители приходят уже готовым JSON-массивом в форме TaskGetSchema
+        return select(
+            Task.id,
+            Task.name,
+            Task.description,
+            Task.priority,
+            cast(Task.status, String).label('status'),
+            Task.deadline,
+            Task.started_at,
+            Task.completed_at,
+            self._assignees_json()
         )
-                .offset(offset)
-                .limit(limit)
+
+    def _select_task_documents(self) -> Select:
+        # Документ задачи целиком собирает Postgres в форме TaskGetSchema,
+        # остальные колонки нужны только для курсоров пагинации
+        document = func.json_build_object(
+            'name', Task.name,
+            'description', Task.description,
+            'priority', Task.priority,
+            'id', Task.id,
+            'status', Task.status,
+            'deadline', ru_date(Task.deadline),
+            'started_at', ru_date(func.timezone('UTC', Task.started_at)),
+            'completed_at', ru_date(Task.completed_at),
+            'assignees_rel', self._assignees_subquery()
+        )
+        return select(
+            cast(document, Text).label('document'),
+            Task.id,
+            Task.priority,
+            cast(Task.status, String).label('status'),
+            Task.deadline,
+            Task.started_at
         )
 
-        tasks_db = await self.session.execute(stmt)
-        all_tasks = tasks_db.scalars().all()
+    @staticmethod
+    def _sort_value(task: Mapping[str, Any], sort_by: SortField):
+        if sort_by == SortField.CREATED:
+            return task['started_at'].isoformat()
+        if sort_by == SortField.DEADLINE:
+            # Пустой дедлайн сортируется как 'infinity'::date; date.max
+            # для этого не годится - он меньше infinity
+            return task['deadline'].isoformat() if task['deadline'] is not None else NO_DEADLINE
+        if sort_by == SortField.PRIORITY:
+            return task['priority'].value
+        return task['status']
+
+    @staticmethod
+    def _parse_sort_value(value: str, sort_by: SortField):
+        if sort_by == SortField.CREATED:
+            return datetime.datetime.fromisoformat(value)
+        if sort_by == SortField.DEADLINE:
+            if value == NO_DEADLINE:
+                return literal_column("'infinity'::date")
+            return datetime.date.fromisoformat(value)
+        if sort_by == SortField.PRIORITY:
+            return TaskPriority(value)
+        return TaskStatus(value)
+
+    def page_stmt(self,
+                  stmt: Select,
+                  sort_by: SortField,
+                  sort_dir: SortDirection,
+                  cursor: str | None,
+                  limit: int) -> tuple[Select, bool]:
+        # Keyset-условие и сортировка страницы; второй элемент - идет ли
+        # чтение назад от курсора
+        sort_column = self.sort_columns[sort_by]
+        backwards = False
+        if cursor is not None:
+            payload = decode_cursor(cursor)
+            if payload.get('sort_by') != sort_by.value or payload.get('sort_dir') != sort_dir.value:
+                raise ValueError("Cursor does not match sorting")
+            try:
+                key = (self._parse_sort_value(payload['value'], sort_by), int(payload['id']))
+            except (KeyError, TypeError, ValueError):
+                raise ValueError("Invalid cursor")
+            backwards = payload.get('direction') == 'prev'
+            descending = (sort_dir == SortDirection.DESC) != backwards
+            if descending:
+                stmt = stmt.where(tuple_(sort_column, Task.id) < key)
+            else:
+                stmt = stmt.where(tuple_(sort_column, Task.id) > key)
+        else:
+            descending = sort_dir == SortDirection.DESC
+
+        if descending:
+            stmt = stmt.order_by(desc(sort_column), desc(Task.id))
+        else:
+            stmt = stmt.order_by(asc(sort_column), asc(Task.id))
+        return stmt.limit(limit + 1), backwards
+
+    async def _get_page(self,
+                        stmt: Select,
+                        sort_by: SortField,
+                        sort_dir: SortDirection,
+                        cursor: str | None,
+                        limit: int) -> Dict[str, Any]:
+        stmt, backwards = self.page_stmt(stmt, sort_by, sort_dir, cursor, limit)
+        res = await self.session.execute(stmt)
+        tasks = [dict(row) for row in res.mappings().all()]
+        has_more = len(tasks) > limit
+        tasks = tasks[:limit]
+        if backwards:
+            tasks.reverse()
+
+        def make_cursor(task: Dict[str, Any], direction: str) -> str:
+            return encode_cursor({
+                'sort_by': sort_by.value,
+                'sort_dir': sort_dir.value,
+                'value': self._sort_value(task, sort_by),
+                'id': task['id'],
+                'direction': direction
+            })
+
+        next_cursor = None
+        prev_cursor = None
+        if tasks:
+            if has_more or backwards:
+                next_cursor = make_cursor(tasks[-1], 'next')
+            if cursor is not None and (has_more or not backwards):
+                prev_cursor = make_cursor(tasks[0], 'prev')
+        return {
+            'tasks': tasks,
+            'next_cursor': next_cursor,
+            'prev_cursor': prev_cursor
+        }
 
+    async def get_tasks_counters(self, project_id: int) -> Dict[str, int]:
         count_stmt = (
-            select(
-                func.count(Task.id).label("total_count"),
-                func.count(Task.id).filter(Task.status == 'completed').label("completed_count")
-            )
-            .where(Task.project_id == project_id)
+            select(ProjectCounter.tasks_total, ProjectCounter.tasks_completed)
+            .where(ProjectCounter.project_id == project_id)
         )
 
         count_db = await self.session.execute(count_stmt)
         counters = count_db.first()
         return {
-            'tasks': all_tasks,
-            'total_tasks_count': counters[0],
-            'completed_tasks_count': counters[1]
+            'total_tasks_count': counters[0] if counters else 0,
+            'completed_tasks_count': counters[1] if counters else 0
         }
 
-    async def get_filtered_tasks(self, project_id: int, filters: TaskFilter):
-        sorted_fields = {
-            SortField.STATUS: Task.status,
-            SortField.DEADLINE: Task.deadline,
-            SortField.PRIORITY: Task.priority,
-            SortField.CREATED: Task.started_at,
-        }
-        stmt = select(Task).where(Task.project_id == project_id)
+    def tasks_stmt(self, project_id: int, filters: TaskFilter | None = None, raw: bool = False) -> Select:
+        stmt = self._select_task_documents() if raw else self._select_tasks()
+        stmt = stmt.where(Task.project_id == project_id)
+        if filters is None:
+            return stmt
 
         if not filters.status is None:
             stmt = stmt.where(Task.status.in_(filters.status))
@@ -92,38 +233,39 @@ class TaskRepository(BaseRepository):
             stmt = stmt.where(Task.started_at >= filters.created_after)
         if filters.created_before:
             stmt = stmt.where(Task.started_at <= filters.created_before)
-        if filters.sort_by:
-            if filters.sort_dir == SortDirection.ASC:
-                stmt = stmt.order_by(asc(sorted_fields[filters.sort_by]))
-            stmt = stmt.order_by(desc(sorted_fields[filters.sort_by]))
-        stmt = stmt.options(
-                            selectinload(Task.assignees_rel)
-                            .load_only(TaskAssignee.project_member_id)
-                            .selectinload(TaskAssignee.project_member_rel)
-                            .selectinload(ProjectMember.user_rel)
-        )
-        res = await self.session.execute(stmt)
-        return res.scalars().all()
+        return stmt
+
+    async def get_tasks(self,
+                        project_id: int,
+                        limit: int = 20,
+                        cursor: str | None = None,
+                        with_totals: bool = False,
+                        raw: bool = False) -> Dict[str, Any]:
+        stmt = self.tasks_stmt(project_id, raw=raw)
+        page = await self._get_page(stmt, SortField.CREATED, SortDirection.DESC, cursor, limit)
+        if with_totals:
+            page.update(await self.get_tasks_counters(project_id))
+        return page
+
+    async def get_filtered_tasks(self,
+                                 project_id: int,
+                                 filters: TaskFilter,
+                                 raw: bool = False) -> Dict[str, Any]:
+        stmt = self.tasks_stmt(project_id, filters, raw)
+        sort_by = filters.sort_by or SortField.CREATED
+        return await self._get_page(stmt, sort_by, filters.sort_dir, filters.cursor, filters.limit)
 
 
     async def get_task(self, task_id:int, project_id: int) -> TaskGetSchema:
-        stmt = (select(Task)
-                .where(
+        stmt = self._select_tasks().where(
             Task.id == task_id,
             Task.project_id == project_id
         )
-                .options(
-                        selectinload(Task.assignees_rel)
-                        .load_only(TaskAssignee.project_member_id)
-                        .selectinload(TaskAssignee.project_member_rel)
-                        .selectinload(ProjectMember.user_rel)
-                        )
-                )
         task = await self.session.execute(stmt)
-        task_db =  task.scalars().one_or_none()
+        task_db = task.mappings().one_or_none()
         if task_db is None:
             raise KeyError("Task no found")
-        task_schema = TaskGetSchema.model_validate(task_db)
+        task_schema = TaskGetSchema.model_validate(dict(task_db))
         return task_schema
 
 
@@ -164,7 +306,7 @@ class TaskRepository(BaseRepository):
             assignees_list = [TaskAssignee(task_id=task_id, project_member_id=member_id) for member_id in data_to_add]
             self.session.add_all(assignees_list)
 
-        await self.session.commit()
+        await self.session.flush()
 
         final_assignees_stmt = (
             select(TaskAssignee)
@@ -198,10 +340,10 @@ class TaskRepository(BaseRepository):
         res = await self.session.execute(stmt)
         new_data = res.scalars().first()
         new_data_schema = BaseTaskSchema.model_validate(new_data)
-        await self.session.commit()
+        await self.session.flush()
         return {
-            'new_task_data': old_data_schema,
-            'old_task_data': new_data_schema
+            'new_task_data': new_data_schema,
+            'old_task_data': old_data_schema
         }
 
 
@@ -215,7 +357,7 @@ class TaskRepository(BaseRepository):
                 .returning(Task)
                 )
         res = await self.session.execute(stmt)
-        await self.session.commit()
+        await self.session.flush()
         task_db = res.scalars().one_or_none()
         if task_db is None:
             raise KeyError("Task not found")
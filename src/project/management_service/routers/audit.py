@@ -1,23 +1,114 @@
-from fastapi import APIRouter
+import datetime
+from typing import Optional
 
-from src.shared.dependencies.service_deps import audit_service
-from src.shared.dependencies.user_deps import current_user
-from src.shared.schemas.FilterSchemas import FiltersDep
+from fastapi import APIRouter, HTTPException, Query
+from starlette.responses import StreamingResponse
+
+from src.shared.dependencies.service_deps import audit_service, task_service, role_service
+from src.shared.dependencies.user_deps import current_user, project_context
+from src.shared.schemas.FilterSchemas import FiltersDep, HistoryPaginationDep, HistoryStatsDep
 
 router = APIRouter(prefix='/history', tags=['History'])
 
 @router.get('/{project_id}/all')
 async def get_all_history(user: current_user,
                           project_id: int,
-                          service: audit_service):
-    result = await service.get_audit(project_id)
+                          service: audit_service,
+                          pagination: HistoryPaginationDep):
+    try:
+        result = await service.get_audit(project_id, pagination)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return result
 
 
+@router.get('/{project_id}/export')
+async def export_history(project_id: int,
+                         context: project_context,
+                         service: audit_service):
+    return StreamingResponse(service.export_history(project_id),
+                             media_type="application/x-ndjson",
+                             headers={"Content-Disposition": f'attachment; filename="history_{project_id}.ndjson"'})
+
+
+@router.get('/{project_id}/live')
+async def tail_history(project_id: int,
+                       context: project_context,
+                       service: audit_service):
+    return StreamingResponse(service.tail_history(project_id),
+                             media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache"})
+
+
 @router.get('/{project_id}/filter')
 async def get_filtered_history(user: current_user,
                                project_id: int,
                                service: audit_service,
                                filters: FiltersDep):
-    result = await service.get_filtered_audit(project_id, filters)
+    try:
+        result = await service.get_filtered_audit(project_id, filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return result
+
+
+@router.get('/{project_id}/tasks/{task_id}/versions')
+async def get_task_versions(project_id: int,
+                            task_id: int,
+                            context: project_context,
+                            service: task_service,
+                            limit: int = Query(default=50, ge=1, le=200)):
+    try:
+        return await service.get_task_versions(task_id, project_id, limit)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Задача не найдена")
+
+
+@router.get('/{project_id}/roles/{role_id}/versions')
+async def get_role_versions(project_id: int,
+                            role_id: int,
+                            context: project_context,
+                            service: role_service,
+                            limit: int = Query(default=50, ge=1, le=200)):
+    try:
+        return await service.get_role_versions(role_id, project_id, limit)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Роль не найдена")
+
+
+@router.get('/{project_id}/stats/actions')
+async def get_action_stats(project_id: int,
+                           context: project_context,
+                           service: audit_service,
+                           filters: HistoryStatsDep):
+    return await service.get_action_stats(project_id, filters)
+
+
+@router.get('/{project_id}/stats/members')
+async def get_member_stats(project_id: int,
+                           context: project_context,
+                           service: audit_service,
+                           filters: HistoryStatsDep):
+    return await service.get_member_stats(project_id, filters)
+
+
+@router.get('/{project_id}/stats/activity')
+async def get_activity_stats(project_id: int,
+                             context: project_context,
+                             service: audit_service,
+                             filters: HistoryStatsDep):
+    return await service.get_activity_stats(project_id, filters)
+
+
+@router.get('/{project_id}/archive')
+async def get_archived_history(project_id: int,
+                               context: project_context,
+                               service: audit_service,
+                               day: datetime.date,
+                               start: Optional[datetime.datetime] = None,
+                               end: Optional[datetime.datetime] = None):
+    try:
+        stream = service.read_archive(project_id, day, start, end)
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Архив за этот день не найден")
+    return StreamingResponse(stream, media_type="application/x-ndjson")
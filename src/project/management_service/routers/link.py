@@ -1,12 +1,12 @@
-from functools import partial
-
 from asyncpg import PostgresError
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 
 from src.project.management_service.mongo.db.models import LinkDeleteActionData, UserJoinActionData
 from src.shared.dependencies.service_deps import link_service, members_service
+from src.shared.db.errors import sqlstate, CHECK_VIOLATION, UNIQUE_VIOLATION
 from src.shared.dependencies.user_deps import current_user, required_rights
+from src.shared.schemas.Role_schemas import Permission
 from src.shared.schemas.Link_schemas import LinkSchema, GetLinksSchema, GetLinkSchema
 
 router = APIRouter(prefix='/links', tags=['Links'])
@@ -16,8 +16,15 @@ router = APIRouter(prefix='/links', tags=['Links'])
 async def generate_url(service: link_service,
                        data: LinkSchema,
                        project_id: int,
-                       member=Depends(partial(required_rights, rights=['generate_url']))):
-    link = await service.generate(data, project_id, member.user)
+                       member=Depends(required_rights(Permission.generate_url))):
+    try:
+        link = await service.generate(data, project_id, member.user)
+    except IntegrityError as e:
+        # Лимит ссылок триггер сообщает через check_violation, остальные
+        # нарушения ограничений - ошибки сервера
+        if sqlstate(e) != CHECK_VIOLATION:
+            raise e
+        raise HTTPException(status_code=409, detail="Достигнут лимит активных ссылок проекта")
     return {"ok": True, "detail": link}
 
 
@@ -44,7 +51,9 @@ async def accept_invite(user: current_user,
         action = await service.add_member(code, user)
         return action
         # return RedirectResponse(f"http://127.0.0.1:800/project/{action.project_data.id}", status_code=303)
-    except IntegrityError:
+    except IntegrityError as e:
+        if sqlstate(e) != UNIQUE_VIOLATION:
+            raise e
         raise HTTPException(status_code=403, detail="Вы уже участник проекта")
     except KeyError:
         raise HTTPException(status_code=410, detail='link is expired')
@@ -58,10 +67,7 @@ async def accept_invite(user: current_user,
 async def project_links(service: link_service,
                         project_id: int,
                         member=Depends(
-                            partial(
-                                required_rights,
-                                rights=["manage_links"]
-                            ))) -> list[GetLinksSchema]:
+                            required_rights(Permission.manage_links))) -> list[GetLinksSchema]:
     try:
         links = await service.get_links(project_id)
         if not links:
@@ -75,10 +81,7 @@ async def project_links(service: link_service,
 async def delete_all_links(service: link_service,
                            project_id: int,
                            member=Depends(
-                               partial(
-                                   required_rights,
-                                   rights=["manage_links"]
-                               ))):
+                               required_rights(Permission.manage_links))):
     try:
         result = await service.delete_all_links(project_id, member.user)
         return result
@@ -91,10 +94,7 @@ async def delete_link_by_code(project_id: int,
                               service: link_service,
                               link_code: str,
                               member=Depends(
-                                  partial(
-                                      required_rights,
-                                      rights=["manage_links"]
-                                  ))
+                                  required_rights(Permission.manage_links))
                               ) -> LinkDeleteActionData:
     try:
         action = await service.delete_link_by_code(link_code, project_id, member.user)
@@ -1,17 +1,19 @@
-from functools import partial
 from typing import Dict, Union
 
 import pymongo.errors
 from asyncpg import PostgresError
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
 from sqlalchemy.exc import SQLAlchemyError
 from starlette.requests import Request
+from starlette.responses import Response
 
 from src.project.management_service.mongo.db.models import ChangeDefaultRoleData, ChangeProjectActionData, \
     DeleteUserActionData
 from src.shared.dependencies.service_deps import project_service, members_service
-from src.shared.dependencies.user_deps import current_user, required_rights
+from src.shared.dependencies.user_deps import current_user, required_rights, project_context
+from src.shared.schemas.Role_schemas import Permission
 from src.shared.schemas.Project_schemas import ProjectData, ProjectMemberSchemaExtend, ProjectDataGet
+from src.shared.ws.presence import presence
 
 router = APIRouter(prefix="/project", tags=['Project', ])
 
@@ -40,10 +42,7 @@ async def project_page(user: current_user,
 async def edit_project(project: project_service,
                        project_id: int,
                        new_data: ProjectData,
-                       member=Depends(partial(
-                           required_rights,
-                           rights=['update_project']
-                       ))) -> ChangeProjectActionData:
+                       member=Depends(required_rights(Permission.update_project))) -> ChangeProjectActionData:
     try:
         project_info = await project.edit_project(project_id, new_data, member.user)
         return project_info
@@ -53,9 +52,22 @@ async def edit_project(project: project_service,
         raise HTTPException(status_code=500, detail="Ошибка на стороне сервера. Попробуйте позже.")
 
 
+@router.get("/{project_id}/presence")
+async def get_presence(project_id: int,
+                       context: project_context,
+                       limit: int = Query(default=100, ge=1, le=500)):
+    return await presence.online(project_id, limit)
+
+
 @router.get("/{project_id}/members")
 async def get_members(service: project_service,
-                      project_id: int) -> list[ProjectMemberSchemaExtend]:
+                      project_id: int,
+                      raw: bool = False) -> list[ProjectMemberSchemaExtend]:
+    if raw:
+        content = await service.get_project_members_json(project_id)
+        if content is None:
+            raise HTTPException(status_code=404, detail='Not found')
+        return Response(content=content, media_type="application/json")
     members = await service.get_project_members(project_id)
     if members is None:
         raise HTTPException(status_code=404, detail='Not found')
@@ -66,10 +78,7 @@ async def get_members(service: project_service,
 async def update_default_role(service: project_service,
                               project_id: int,
                               role_id: int,
-                              member=Depends(partial(
-                                  required_rights,
-                                  rights=['change_roles']
-                              ))) -> ChangeDefaultRoleData:
+                              member=Depends(required_rights(Permission.change_roles))) -> ChangeDefaultRoleData:
     try:
         roles_data = await service.change_default_role(project_id, role_id, member.user)
         return roles_data
@@ -84,10 +93,7 @@ async def delete_member_from_project(project: members_service,
                                      project_id: int,
                                      member_id: int,
                                      reason: str = '',
-                                     member=Depends(partial(
-                                         required_rights,
-                                         rights=['delete_users']
-                                     ))) -> DeleteUserActionData:
+                                     member=Depends(required_rights(Permission.delete_users))) -> DeleteUserActionData:
     try:
         deleted_member = await project.delete_member(project_id, member_id, member.user, reason)
         return deleted_member
@@ -1,13 +1,12 @@
-from functools import partial
-
 from asyncpg import PostgresError
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.exc import SQLAlchemyError
+from starlette.responses import Response
 
 from src.project.management_service.mongo.db.models import EditRoleActionData, CreateRoleActionData
 from src.shared.dependencies.service_deps import role_service
 from src.shared.dependencies.user_deps import current_user, required_rights
-from src.shared.schemas.Role_schemas import RoleSchema, RoleSchemaWithId
+from src.shared.schemas.Role_schemas import Permission, RoleSchema, RoleSchemaWithId
 
 router = APIRouter(prefix='/roles', tags=['Roles'])
 
@@ -15,8 +14,12 @@ router = APIRouter(prefix='/roles', tags=['Roles'])
 @router.get('/project/{project_id}/roles')
 async def get_roles(user: current_user,
                     project_id: int,
-                    service: role_service) -> list[RoleSchemaWithId]:
+                    service: role_service,
+                    raw: bool = False) -> list[RoleSchemaWithId]:
     try:
+        if raw:
+            content = await service.get_roles_json(project_id)
+            return Response(content=content, media_type="application/json")
         res = await service.get_roles(project_id)
         return res
     except SQLAlchemyError as e:
@@ -27,7 +30,7 @@ async def get_roles(user: current_user,
 async def add_role(project_id: int,
                    service: role_service,
                    data: RoleSchema,
-                   member=Depends(partial(required_rights, rights=["change_roles"]))) -> CreateRoleActionData:
+                   member=Depends(required_rights(Permission.change_roles))) -> CreateRoleActionData:
     try:
         action = await service.new_role(project_id, member.user, data)
         return action
@@ -40,7 +43,7 @@ async def update_role(project_id: int,
                       data: RoleSchema,
                       role_id: int,
                       service: role_service,
-                      member=Depends(partial(required_rights, rights=["change_roles"]))) -> EditRoleActionData:
+                      member=Depends(required_rights(Permission.change_roles))) -> EditRoleActionData:
     try:
         action = await service.role_update(role_id, data, member.user, project_id)
         return action
@@ -54,7 +57,7 @@ async def update_role(project_id: int,
 async def delete_role(project_id: int,
                       role_id: int,
                       service: role_service,
-                      member=Depends(partial(required_rights, rights=['change_roles']))):
+                      member=Depends(required_rights(Permission.change_roles))):
     try:
         result = await service.role_delete(role_id, project_id, member.user)
         return result
@@ -67,7 +70,7 @@ async def change_member_role(project_id: int,
                              member_id: int,
                              role_id: int,
                              service: role_service,
-                             member=Depends(partial(required_rights, rights=["change_roles"]))):
+                             member=Depends(required_rights(Permission.change_roles))):
     try:
         res = await service.new_member_role(member_id, project_id, role_id, member.user)
         return res
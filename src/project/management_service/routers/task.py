@@ -1,22 +1,22 @@
-from functools import partial
-from typing import Union
-
 from asyncpg import PostgresError
 from fastapi import APIRouter, Depends
 from fastapi.params import Query
 from sqlalchemy.exc import SQLAlchemyError
 from starlette.exceptions import HTTPException
 from starlette.requests import Request
+from starlette.responses import Response
 
 from src.project.management_service.mongo.db.models import ChangeTaskActionData, CreateTaskActionData, \
     DeleteTaskActionData, \
     CompleteTaskActionData
 from src.shared.dependencies.service_deps import task_service
 from src.shared.dependencies.user_deps import current_user, project_context, required_rights
+from src.shared.schemas.Role_schemas import Permission
 from src.shared.schemas.FilterSchemas import TaskFilter
-from src.shared.schemas.Task_schemas import TaskGetSchema, UpdateTaskSchema, CreateTaskSchema
-from src.shared.schemas.pagination import PaginationDep
-from src.shared.ws.socket import sio
+from src.shared.schemas.Task_schemas import TaskGetSchema, UpdateTaskSchema, CreateTaskSchema, TaskPage, format_ru_date
+from src.shared.schemas.pagination import CursorPaginationDep
+from src.shared.ws.coalescer import task_events
+from src.shared.ws.deltas import task_fields
 
 router = APIRouter(prefix='/tasks', tags=['Tasks'])
 
@@ -25,10 +25,13 @@ router = APIRouter(prefix='/tasks', tags=['Tasks'])
 async def create_task(project_id: int,
                       data: CreateTaskSchema,
                       service: task_service,
-                      member=Depends(partial(required_rights, rights=['create_tasks']))) -> CreateTaskActionData:
+                      member=Depends(required_rights(Permission.create_tasks))) -> CreateTaskActionData:
     try:
         action = await service.create_task(data, project_id, member.user)
-        await sio.emit('update_tasks_list', data=action.created_task, to=f'project_{project_id}')
+        task_events.add(project_id,
+                        action.created_task.id,
+                        'created',
+                        task_fields(action.created_task.model_dump(mode='json')))
         return action
     except (SQLAlchemyError, PostgresError) as e:
         raise HTTPException(status_code=500, detail="Ошибка. Проверьте корректность введенных данных")
@@ -40,11 +43,14 @@ async def update_task(
         task_id: int,
         service: task_service,
         data: UpdateTaskSchema,
-        member=Depends(partial(required_rights, rights=['update_tasks']))) -> ChangeTaskActionData:
+        member=Depends(required_rights(Permission.update_tasks))) -> ChangeTaskActionData:
     try:
         res = await service.update_task(data, task_id, project_id, member.user)
 
-        await sio.emit('update_tasks_list', data=res.new_data, to=f'project_{project_id}')
+        task_events.add(project_id,
+                        task_id,
+                        'updated',
+                        task_fields({change.path: change.new for change in res.changes}))
         return res
     except KeyError:
         raise HTTPException(status_code=404, detail="Похоже, задачи больше не существует")
@@ -56,10 +62,10 @@ async def update_task(
 async def delete_task(project_id: int,
                       task_id: int,
                       service: task_service,
-                      member=Depends(partial(required_rights, rights=['delete_tasks']))) -> DeleteTaskActionData:
+                      member=Depends(required_rights(Permission.delete_tasks))) -> DeleteTaskActionData:
     try:
         action = await service.delete_task(task_id, project_id, member.user)
-        await sio.emit('delete_task', data={'task_id': task_id}, to=f'project_{project_id}')
+        task_events.add(project_id, task_id, 'deleted')
         return action
     except (SQLAlchemyError, PostgresError) as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -81,9 +87,18 @@ async def get_task(project_id: int,
 async def get_tasks_with_filter(user: current_user,
                                 project_id: int,
                                 service: task_service,
-                                filters: TaskFilter = Query()) -> list[TaskGetSchema]:
-    res = await service.get_filtered_tasks(project_id, filters)
-    if res:
+                                filters: TaskFilter = Query(),
+                                raw: bool = False) -> TaskPage:
+    try:
+        if raw:
+            content = await service.get_filtered_tasks_json(project_id, filters)
+            if content is None:
+                raise HTTPException(status_code=404, detail="Not found")
+            return Response(content=content, media_type="application/json")
+        res = await service.get_filtered_tasks(project_id, filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if res['tasks']:
         return res
     else:
         raise HTTPException(status_code=404, detail="Not found")
@@ -101,6 +116,11 @@ async def complete_task(request: Request,
         if context.member is None:
             raise HTTPException(status_code=403, detail="No access")
         updated_task = await service.change_status_task_to_completed(task_id, project_id, context.user)
+        completed_task = updated_task.completed_task
+        task_events.add(project_id, task_id, 'updated', {
+            'status': completed_task.status,
+            'completed_at': format_ru_date(completed_task.completed_at)
+        })
         return updated_task
     except KeyError:
         raise HTTPException(status_code=404, detail="Задача с таким ID не найдена или уже выполнена.")
@@ -111,9 +131,15 @@ async def complete_task(request: Request,
 @router.get('/project/{project_id}/tasks')
 async def get_tasks(service: task_service,
                     project_id: int,
-                    pagination: PaginationDep) -> dict[str, Union[list[TaskGetSchema], int]]:
+                    pagination: CursorPaginationDep,
+                    raw: bool = False) -> TaskPage:
     try:
-        tasks = await service.get_tasks(project_id, pagination.limit, pagination.offset)
+        if raw:
+            content = await service.get_tasks_json(project_id, pagination)
+            return Response(content=content, media_type="application/json")
+        tasks = await service.get_tasks(project_id, pagination)
         return tasks
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except (SQLAlchemyError, PostgresError) as e:
         raise HTTPException(status_code=500, detail=str(e))
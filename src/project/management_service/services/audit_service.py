@@ -1,32 +1,170 @@
+import datetime
+import json
 import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional
 
-import pymongo.errors
+from asyncpg import PostgresError
+from beanie import PydanticObjectId
+from pymongo.errors import OperationFailure
+from redis import exceptions
+from redis.asyncio import Redis
+from sqlalchemy.exc import SQLAlchemyError
 
-from src.project.management_service.mongo.db.models import BaseActionData
+from src.project.management_service.mongo.archive import audit_archive, encode_json
+from src.project.management_service.mongo.db.models import BaseActionData, DiffActionData, History
 from src.project.management_service.mongo.repositories.mongo_repositroy import MongoRepository
-from src.shared.schemas.FilterSchemas import HistoryFilter
+from src.project.management_service.repositories.outbox_repository import OutboxRepository
+from src.shared.config import get_history_stats_ttl, get_history_export_settings
+from src.shared.schemas.FilterSchemas import HistoryFilter, HistoryPagination, HistoryStatsFilter
 from src.shared.schemas.User_schema import UserSchema
 
 
+# Код ошибки MongoDB, когда change stream недоступен (не replica set)
+CHANGE_STREAM_UNSUPPORTED = 40573
+
+
 class AuditService:
-    def __init__(self, mongo: MongoRepository):
+    stats_ttl = get_history_stats_ttl()
+    export_settings = get_history_export_settings()
+
+    def __init__(self, mongo: MongoRepository, outbox: OutboxRepository, redis: Redis):
         self.mongo = mongo
+        self.outbox = outbox
+        self.redis = redis
         self.logger = logging.getLogger(__name__)
 
     async def log(self,
                   project_id: int,
                   user: UserSchema,
                   data: BaseActionData):
+        # Событие пишется в audit_outbox той же транзакцией, что и само
+        # изменение; в MongoDB его переносит OutboxRelay
+        record = History(id=PydanticObjectId(),
+                         user=user,
+                         project_id=project_id,
+                         action=data)
         try:
-            await self.mongo.add_to_db(data, project_id, user)
-        except pymongo.errors.PyMongoError as e:
+            await self.outbox.add(record)
+        except (SQLAlchemyError, PostgresError) as e:
             self.logger.warning(f"Ошибка: {str(e)}")
             raise e
 
-    async def get_audit(self, project_id: int):
-        result = await self.mongo.get_all(project_id)
+    async def get_audit(self, project_id: int, pagination: HistoryPagination):
+        result = await self.mongo.get_all(project_id, pagination)
         return result
 
     async def get_filtered_audit(self, project_id: int, filters: HistoryFilter):
         result = await self.mongo.get_with_filters(project_id, filters)
         return result
+
+    async def _cached_stats(self,
+                            key: str,
+                            loader: Callable[[], Awaitable[Any]]) -> Any:
+        # Агрегаты живут в Redis несколько секунд: панели проекта
+        # не запускают пайплайн на каждый запрос
+        try:
+            cached = await self.redis.get(key)
+            if cached is not None:
+                return json.loads(cached)
+        except (exceptions.ConnectionError, exceptions.TimeoutError) as e:
+            self.logger.warning(f"Redis недоступен: {e}")
+        result = await loader()
+        try:
+            await self.redis.set(key, json.dumps(result), ex=self.stats_ttl)
+        except (exceptions.ConnectionError, exceptions.TimeoutError) as e:
+            self.logger.warning(f"Redis недоступен: {e}")
+        return result
+
+    @staticmethod
+    def _stats_key(project_id: int, kind: str, filters: HistoryStatsFilter) -> str:
+        return f"history_stats:{project_id}:{kind}:{filters.start}:{filters.end}:{filters.bucket}"
+
+    async def get_action_stats(self, project_id: int, filters: HistoryStatsFilter):
+        return await self._cached_stats(
+            self._stats_key(project_id, 'actions', filters),
+            lambda: self.mongo.count_actions(project_id, filters)
+        )
+
+    async def get_member_stats(self, project_id: int, filters: HistoryStatsFilter):
+        return await self._cached_stats(
+            self._stats_key(project_id, 'members', filters),
+            lambda: self.mongo.count_by_member(project_id, filters)
+        )
+
+    async def get_activity_stats(self, project_id: int, filters: HistoryStatsFilter):
+        return await self._cached_stats(
+            self._stats_key(project_id, 'activity', filters),
+            lambda: self.mongo.count_by_bucket(project_id, filters)
+        )
+
+    @staticmethod
+    def walk_back(current: Dict[str, Any], records: List[History]) -> List[Dict[str, Any]]:
+        # События хранят только изменившиеся поля, поэтому полные снимки
+        # восстанавливаются от текущей строки назад: состояние до события
+        # получается откатом его changes из состояния после него.
+        # Поля, которые меняются не событиями изменения (например,
+        # статус при завершении задачи), остаются такими, как в текущей строке
+        versions = []
+        snapshot = current
+        for record in records:
+            action: DiffActionData = record.action
+            before = action.reconstruct(snapshot, reverse=True)
+            versions.append({
+                'id': str(record.id),
+                'created_at': record.created_at,
+                'user': record.user,
+                'changes': action.changes,
+                'before': before,
+                'after': snapshot,
+            })
+            snapshot = before
+        return versions
+
+    async def get_versions(self,
+                           project_id: int,
+                           current: Dict[str, Any],
+                           action_type: str,
+                           match: Dict[str, Any],
+                           limit: int) -> List[Dict[str, Any]]:
+        records = await self.mongo.get_changes(project_id, action_type, match, limit)
+        return self.walk_back(current, records)
+
+    @staticmethod
+    def read_archive(project_id: int,
+                     day: datetime.date,
+                     start: Optional[datetime.datetime] = None,
+                     end: Optional[datetime.datetime] = None) -> Iterator[bytes]:
+        return audit_archive.read(project_id, day, start, end)
+
+    @staticmethod
+    def _dump(document: Dict[str, Any]) -> str:
+        return json.dumps(document, ensure_ascii=False, default=encode_json)
+
+    async def export_history(self, project_id: int) -> AsyncIterator[bytes]:
+        # Строки отдаются пачками по мере чтения курсора, так что
+        # выгрузка не собирает всю историю в памяти
+        batch_size = self.export_settings["batch_size"]
+        lines = []
+        async for document in self.mongo.stream(project_id, batch_size):
+            lines.append(self._dump(document) + '\n')
+            if len(lines) >= batch_size:
+                yield ''.join(lines).encode()
+                lines = []
+        if lines:
+            yield ''.join(lines).encode()
+
+    async def tail_history(self, project_id: int) -> AsyncIterator[str]:
+        settings = self.export_settings
+        try:
+            async for document in self.mongo.watch(project_id, settings["batch_size"]):
+                yield f"id: {document['_id']}\ndata: {self._dump(document)}\n\n"
+            return
+        except OperationFailure as e:
+            if e.code != CHANGE_STREAM_UNSUPPORTED:
+                raise e
+            self.logger.info("Change stream недоступен, история отслеживается опросом")
+        async for document in self.mongo.poll(project_id,
+                                              settings["batch_size"],
+                                              settings["poll_interval"],
+                                              settings["tail_window"]):
+            yield f"id: {document['_id']}\ndata: {self._dump(document)}\n\n"
@@ -9,10 +9,11 @@ from asyncpg import PostgresError
 from asyncpg.pgproto.pgproto import timedelta
 from babel.dates import format_datetime
 from redis.asyncio import Redis
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 
 from src.project.management_service.repositories.link_repository import LinkRepository
 from src.project.management_service.mongo.db.models import LinkGenerateActionData, LinkDeleteActionData
+from src.shared.db.errors import sqlstate, CHECK_VIOLATION
 from src.shared.schemas.Link_schemas import LinkSchema, GetLinkSchema
 from src.shared.schemas.User_schema import UserSchema
 from src.project.management_service.services.audit_service import AuditService
@@ -69,8 +70,6 @@ class LinkService:
             end_at, format_end_at = self._calculate_expiration(data.ex)
             cached_data = self._build_cache_data(project_data, format_end_at)
 
-            await self._save_to_redis(code, cached_data, data.ex)
-
             link = f"http://127.0.0.1:8000/links/invite/{code}"
             data_for_save = {
                 "project_id": project_id,
@@ -79,10 +78,13 @@ class LinkService:
                 "link": code
             }
 
-            await self.repository.create(data_for_save)
+            # Лимит ссылок проверяет триггер при вставке, а коммит делает
+            # audit.log, поэтому код попадает в Redis только после него
+            await self.repository.add_link(data_for_save)
             try:
-                data = LinkGenerateActionData(link=link)
-                await self.audit.log(project_id, user, data)
+                action = LinkGenerateActionData(link=link)
+                await self.audit.log(project_id, user, action)
+                await self._save_to_redis(code, cached_data, data.ex)
                 return {
                     "link": link,
                     "ended_at": format_end_at
@@ -90,6 +92,12 @@ class LinkService:
             except ValueError as e:
                 self.logger.warning(f'Ошибка: {str(e)}')
                 raise e
+        except IntegrityError as e:
+            if sqlstate(e) == CHECK_VIOLATION:
+                self.logger.info(f"Достигнут лимит ссылок проекта {project_id}: {e.orig}")
+            else:
+                self.logger.warning(f"Ошибка при генерации ссылки: {e}")
+            raise e
         except (SQLAlchemyError, PostgresError) as e:
             self.logger.warning(f"Ошибка при генерации ссылки: {e}")
             raise e
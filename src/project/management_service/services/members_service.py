@@ -6,24 +6,49 @@ from sqlalchemy.exc import SQLAlchemyError
 
 from src.project.management_service.repositories.project_member_repository import ProjectMemberRepository
 from src.project.management_service.mongo.db.models import DeleteUserActionData, UserJoinActionData
-from src.shared.schemas.Project_schemas import ProjectMemberSchema
+from src.shared.cache.membership_cache import membership_cache
+from src.shared.schemas.Project_schemas import MemberAccess
 from src.shared.schemas.User_schema import UserSchema
+from src.shared.ws.rooms import room_evictions
 from src.project.management_service.services.audit_service import AuditService
 from src.project.management_service.services.link_service import LinkService
 
 
+# Проверки членства через membership_cache; нужны и HTTP-зависимостям,
+# и обработчикам Socket.IO, у которых нет остальных сервисов
+class MemberLookup:
+    def __init__(self, repository: ProjectMemberRepository):
+        self.repository = repository
+
+    async def get_member(self, project_id: int, user_id: int) -> MemberAccess | None:
+        cached = await membership_cache.get(project_id, user_id)
+        if cached.hit:
+            return cached.member
+        is_member = await self.repository.get_member_by_user_id(project_id, user_id)
+        schema = MemberAccess.model_validate(is_member) if is_member is not None else None
+        await membership_cache.set(project_id, user_id, schema, cached.version)
+        return schema
+
+    async def get_project_ids(self, user_id: int) -> list[int]:
+        cached = await membership_cache.get_projects(user_id)
+        if cached.hit:
+            return cached.projects
+        projects = await self.repository.get_project_ids(user_id)
+        await membership_cache.set_projects(user_id, projects, cached.version)
+        return projects
+
+
 class MembersService:
     def __init__(self, repository: ProjectMemberRepository, links: LinkService, audit: AuditService):
         self.repository = repository
+        self.lookup = MemberLookup(repository)
         self.audit = audit
         self.link_service = links
         self.logger = logging.getLogger(__name__)
 
 
-    async def is_user_project_member(self, project_id: int, user_id: int):
-        is_member = await self.repository.get_member_by_user_id(project_id, user_id)
-        schema = ProjectMemberSchema.model_validate(is_member)
-        return schema
+    async def is_user_project_member(self, project_id: int, user_id: int) -> MemberAccess | None:
+        return await self.lookup.get_member(project_id, user_id)
 
     async def add_member(self, code: str, user: UserSchema) -> UserJoinActionData:
         user_id = user.id
@@ -46,6 +71,8 @@ class MembersService:
             await self.repository.add_member(data_for_save)
             data = UserJoinActionData(project_data=project)
             await self.audit.log(project.id, user, data)
+            await membership_cache.invalidate_project(project_id)
+            await membership_cache.invalidate_user(user_id)
             return data
         except (SQLAlchemyError, PostgresError) as e:
             self.logger.error(f"Ошибка БД {e}")
@@ -67,6 +94,9 @@ class MembersService:
                  deleted_user=deleted_member
             )
             await self.audit.log(project_id, user, data)
+            await membership_cache.invalidate_project(project_id)
+            await membership_cache.invalidate_user(deleted_member.user_id)
+            await room_evictions.remove_member(project_id, deleted_member.user_id)
             return data
         except (SQLAlchemyError, pymongo.errors.OperationFailure) as e:
             self.logger.warning(f"Ошибка {e}")
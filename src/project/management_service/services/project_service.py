@@ -7,6 +7,8 @@ from sqlalchemy.exc import SQLAlchemyError
 from src.project.management_service.repositories.project_repository import ProjectRepository
 from src.project.management_service.mongo.db.models import ChangeDefaultRoleData, ChangeProjectActionData
 from src.shared.schemas.Project_schemas import ProjectData, ProjectFromMember, ProjectMemberSchemaExtend, ProjectRel
+from src.shared.cache.membership_cache import membership_cache
+from src.shared.schemas.Role_schemas import RoleMaskSchema
 from src.shared.schemas.User_schema import UserSchema
 from src.project.management_service.services.audit_service import AuditService
 
@@ -33,6 +35,7 @@ class ProjectService:
         try:
             data_dict = data.model_dump()
             project_id = await self.project_repository.new_project(data_dict, user_id)
+            await membership_cache.invalidate_user(user_id)
             return project_id
         except SQLAlchemyError as e:
             self.logger.warning(f'Ошибка: {e}')
@@ -72,7 +75,7 @@ class ProjectService:
             data_dict = new_data.model_dump()
             res = await self.project_repository.update_project(project_id, data_dict)
 
-            data = ChangeProjectActionData.model_validate({'new_data': new_data, "old_data": res})
+            data = ChangeProjectActionData.from_snapshots(res.model_dump(mode='json'), new_data.model_dump(mode='json'))
             await self.audit.log(project_id, user, data)
             return data
         except ValueError as e:
@@ -92,6 +95,13 @@ class ProjectService:
             print(f"Ошибка: {e}")
             return None
 
+    async def get_project_members_json(self, project_id: int) -> str | None:
+        try:
+            return await self.project_repository.get_members_json(project_id)
+        except (PostgresError, SQLAlchemyError) as e:
+            self.logger.warning(f"Ошибка: {e}")
+            return None
+
     async def change_default_role(self, project_id: int, role_id: int, user: UserSchema) -> ChangeDefaultRoleData:
         try:
             roles = await self.project_repository.change_default_role(project_id, role_id)
@@ -99,9 +109,10 @@ class ProjectService:
             new_role = roles[1]
             old_role = roles[0]
 
-            data = ChangeDefaultRoleData(
-                new_data = new_role,
-                old_data =  old_role)
+            data = ChangeDefaultRoleData.from_snapshots(
+                RoleMaskSchema.model_validate(old_role.model_dump()).model_dump(),
+                RoleMaskSchema.model_validate(new_role.model_dump()).model_dump()
+            )
             await self.audit.log(project_id, user, data)
             return data
         except ValueError as e:
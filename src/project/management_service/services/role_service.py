@@ -1,4 +1,5 @@
 import logging
+from typing import Any, Dict
 
 from asyncpg import PostgresError
 from sqlalchemy.exc import SQLAlchemyError
@@ -6,8 +7,9 @@ from sqlalchemy.exc import SQLAlchemyError
 from src.project.management_service.repositories.role_repository import RoleRepository
 from src.project.management_service.mongo.db.models import ChangeUserRoleActionData, DeleteRoleActionData, \
     EditRoleActionData, CreateRoleActionData
+from src.shared.cache.membership_cache import membership_cache
 from src.shared.schemas.Project_schemas import ProjectMemberSchemaExtend
-from src.shared.schemas.Role_schemas import RoleSchema
+from src.shared.schemas.Role_schemas import RoleSchema, RoleMaskSchema
 from src.shared.schemas.User_schema import UserSchema
 from src.project.management_service.services.audit_service import AuditService
 
@@ -40,6 +42,20 @@ class RoleService:
             self.logger.warning(f'Ошибка: {e}')
             raise e
 
+    async def get_roles_json(self, project_id: int) -> str:
+        try:
+            return await self.repository.get_roles_json(project_id)
+        except (SQLAlchemyError, PostgresError) as e:
+            self.logger.warning(f'Ошибка: {e}')
+            raise e
+
+    async def get_role_versions(self, role_id: int, project_id: int, limit: int) -> list[Dict[str, Any]]:
+        role = await self.repository.get_role(role_id, project_id)
+        if role is None:
+            raise KeyError('Role not Found.')
+        current = RoleMaskSchema.model_validate(role).model_dump()
+        return await self.audit.get_versions(project_id, current, 'edit_role', {'action.role_id': role_id}, limit)
+
     async def role_update(self,
                           role_id: int,
                           role: RoleSchema,
@@ -49,12 +65,13 @@ class RoleService:
             old_data = await self.repository.update_role_info(role_id, new_data=role)
             if old_data:
                 try:
-                    data = EditRoleActionData(
-                        role_id=role_id,
-                        old_data=old_data,
-                        new_data=role
+                    data = EditRoleActionData.from_snapshots(
+                        RoleMaskSchema.model_validate(old_data.model_dump()).model_dump(),
+                        RoleMaskSchema.model_validate(role.model_dump()).model_dump(),
+                        role_id=role_id
                     )
                     await self.audit.log(project_id, user, data)
+                    await membership_cache.invalidate_project(project_id)
                     return data
                 except ValueError as e:
                     self.logger.warning(f"Ошибка: {str(e)}")
@@ -96,6 +113,7 @@ class RoleService:
                                             old_data=old_role,
                                             new_data=new_role)
             await self.audit.log(project_id, user, data)
+            await membership_cache.invalidate_project(project_id)
             return data
         except ValueError as e:
             self.logger.warning(f'Ошибка: {e}')
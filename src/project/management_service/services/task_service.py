@@ -1,4 +1,5 @@
 import datetime
+import json
 import logging
 from typing import Dict, Any
 
@@ -12,6 +13,7 @@ from src.shared.schemas.FilterSchemas import TaskFilter
 from src.shared.schemas.Task_schemas import TaskGetSchema, UpdateTaskSchema, \
     CreateTaskSchema
 from src.shared.schemas.User_schema import UserSchema
+from src.shared.schemas.pagination import CursorPagination
 from src.project.management_service.services.audit_service import AuditService
 
 
@@ -22,15 +24,52 @@ class TaskService:
 
         self.logger = logging.getLogger(__name__)
 
-    async def get_tasks(self, project_id: int, limit: int = 20, offset: int = 0) -> Dict[str, Any] | None:
+    async def get_tasks(self, project_id: int, pagination: CursorPagination) -> Dict[str, Any] | None:
         try:
-            data_db = await self.repository.get_tasks(project_id, limit, offset)
-            tasks = data_db['tasks']
-            tasks_count = data_db['total_tasks_count']
-            completed_tasks_count = data_db['completed_tasks_count']
-            return {'tasks': tasks,
-                    'tasks_count': tasks_count,
-                    "completed_tasks_count": completed_tasks_count}
+            data_db = await self.repository.get_tasks(project_id,
+                                                      pagination.limit,
+                                                      pagination.cursor,
+                                                      pagination.with_totals)
+            return {'tasks': data_db['tasks'],
+                    'next_cursor': data_db['next_cursor'],
+                    'prev_cursor': data_db['prev_cursor'],
+                    'tasks_count': data_db.get('total_tasks_count'),
+                    "completed_tasks_count": data_db.get('completed_tasks_count')}
+        except (SQLAlchemyError, PostgresError) as e:
+            self.logger.warning(f'Ошибка {e}')
+            raise e
+
+    @staticmethod
+    def render_page(page: Dict[str, Any]) -> bytes:
+        # Документы задач уже готовый JSON из Postgres, в Python
+        # собирается только обертка страницы
+        tasks = ','.join(task['document'] for task in page['tasks'])
+        envelope = json.dumps({
+            'next_cursor': page['next_cursor'],
+            'prev_cursor': page['prev_cursor'],
+            'tasks_count': page.get('total_tasks_count'),
+            'completed_tasks_count': page.get('completed_tasks_count')
+        }, ensure_ascii=False, separators=(',', ':'))
+        return f'{{"tasks":[{tasks}],{envelope[1:]}'.encode()
+
+    async def get_tasks_json(self, project_id: int, pagination: CursorPagination) -> bytes:
+        try:
+            page = await self.repository.get_tasks(project_id,
+                                                   pagination.limit,
+                                                   pagination.cursor,
+                                                   pagination.with_totals,
+                                                   raw=True)
+            return self.render_page(page)
+        except (SQLAlchemyError, PostgresError) as e:
+            self.logger.warning(f'Ошибка {e}')
+            raise e
+
+    async def get_filtered_tasks_json(self, project_id: int, filters: TaskFilter) -> bytes | None:
+        try:
+            page = await self.repository.get_filtered_tasks(project_id, filters, raw=True)
+            if not page['tasks']:
+                return None
+            return self.render_page(page)
         except (SQLAlchemyError, PostgresError) as e:
             self.logger.warning(f'Ошибка {e}')
             raise e
@@ -85,12 +124,11 @@ class TaskService:
                 assignees_rel=old_assignees_schema
             )
 
-            if new_task == old_task:
-                raise ValueError('Old data and new data the same')
-            data = ChangeTaskActionData.model_validate({
-                "new_data": new_task_result_schema,
-                "old_data": old_task_result_schema
-            })
+            data = ChangeTaskActionData.from_snapshots(
+                old_task_result_schema.model_dump(mode='json'),
+                new_task_result_schema.model_dump(mode='json'),
+                task_id=task_id
+            )
             await self.audit.log(project_id, user, data)
             return data
         except ValueError as e:
@@ -127,6 +165,14 @@ class TaskService:
             self.logger.warning(f"Ошибка: {e}")
             raise e
 
+    async def get_task_versions(self, task_id: int, project_id: int, limit: int) -> list[Dict[str, Any]]:
+        # Старые события change_task писались без task_id, для них задача
+        # определяется по id в new_data
+        current = await self.get_task(task_id, project_id)
+        match = {'$or': [{'action.task_id': task_id},
+                         {'action.task_id': None, 'action.new_data.id': task_id}]}
+        return await self.audit.get_versions(project_id, current.model_dump(mode='json'), 'change_task', match, limit)
+
     async def get_task(self, task_id: int, project_id: int) -> TaskGetSchema:
         try:
             task = await self.repository.get_task(task_id, project_id)
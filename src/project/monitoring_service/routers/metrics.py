@@ -0,0 +1,64 @@
+from fastapi import APIRouter
+
+from src.project.auth_service.jwt.jwt import verified_tokens
+from src.project.management_service.mongo.archive import audit_archive
+from src.project.management_service.mongo.relay import outbox_relay
+from src.shared.cache.membership_cache import membership_cache
+from src.shared.cache.user_cache import user_cache
+from src.shared.db.redis_client import redis_client
+from src.shared.ws.coalescer import task_events
+from src.shared.ws.dispatcher import emit_dispatcher
+from src.shared.ws.presence import presence
+from src.shared.ws.rooms import room_evictions
+
+router = APIRouter(prefix='/metrics', tags=['Metrics'])
+
+
+@router.get('/redis')
+async def redis_pool_stats():
+    return redis_client.stats()
+
+
+@router.get('/user-cache')
+async def user_cache_stats():
+    return user_cache.stats()
+
+
+@router.get('/membership-cache')
+async def membership_cache_stats():
+    return membership_cache.stats()
+
+
+@router.get('/token-cache')
+async def token_cache_stats():
+    return verified_tokens.stats()
+
+
+@router.get('/audit-outbox')
+async def audit_outbox_stats():
+    return outbox_relay.stats()
+
+
+@router.get('/audit-archive')
+async def audit_archive_stats():
+    return audit_archive.stats()
+
+
+@router.get('/task-events')
+async def task_events_stats():
+    return task_events.stats()
+
+
+@router.get('/emit-dispatcher')
+async def emit_dispatcher_stats():
+    return emit_dispatcher.stats()
+
+
+@router.get('/presence')
+async def presence_stats():
+    return presence.stats()
+
+
+@router.get('/room-evictions')
+async def room_evictions_stats():
+    return room_evictions.stats()
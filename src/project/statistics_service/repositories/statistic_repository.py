@@ -12,7 +12,8 @@ class StatisticRepository:
         self.session = session
 
 
-    async def get_all(self, project_id: int):
+    @staticmethod
+    def all_stmt(project_id: int):
         stmt = (
         select(
             User.id,
@@ -27,13 +28,16 @@ class StatisticRepository:
         .group_by(User.id, User.username)
         .order_by(func.count(Task.id).desc())
     )
+        return stmt
 
+    async def get_all(self, project_id: int):
+        stmt = self.all_stmt(project_id)
         res = await self.session.execute(stmt)
         result = list(res.all())
         return result
 
-
-    async def get_with_day_limit(self, project_id: int, start_date: datetime.date, end_date: datetime.date):
+    @staticmethod
+    def day_limit_stmt(project_id: int, start_date: datetime.date, end_date: datetime.date):
         stmt = (
         select(
             User.id,
@@ -57,11 +61,16 @@ class StatisticRepository:
         .group_by(User.id, User.username)
         .order_by(func.count(Task.id).desc())
     )
+        return stmt
+
+    async def get_with_day_limit(self, project_id: int, start_date: datetime.date, end_date: datetime.date):
+        stmt = self.day_limit_stmt(project_id, start_date, end_date)
         res = await self.session.execute(stmt)
         result = list(res.all())
         return result
 
-    async def get_current_month_stat(self, project_id: int, start_date: datetime.date, end_date: datetime.date):
+    @staticmethod
+    def current_month_stmt(project_id: int, start_date: datetime.date, end_date: datetime.date):
         days = func.generate_series(start_date, end_date, timedelta(days=1)).alias('day')
         day_column = cast(literal_column("day"), Date)
         stmt = (select(
@@ -79,13 +88,17 @@ class StatisticRepository:
              )
         ).group_by(day_column).order_by(day_column)
         )
+        return stmt
 
+    async def get_current_month_stat(self, project_id: int, start_date: datetime.date, end_date: datetime.date):
+        stmt = self.current_month_stmt(project_id, start_date, end_date)
         res = await self.session.execute(stmt)
         result = list(res.all())
         return result
 
 
-    async def get_avg_completed_tasks(self, project_id: int):
+    @staticmethod
+    def avg_completed_stmt(project_id: int):
         subq = (
             select(
                 ProjectMember.id,
@@ -104,7 +117,10 @@ class StatisticRepository:
         )
 
         stmt = select(func.avg(subq.c.task_count).label("avg_completed_tasks"))
+        return stmt
 
+    async def get_avg_completed_tasks(self, project_id: int):
+        stmt = self.avg_completed_stmt(project_id)
         result = await self.session.execute(stmt)
         avg = result.scalar()
 
@@ -0,0 +1,154 @@
+import json
+import logging
+from typing import NamedTuple, Optional, Dict, List
+
+from pydantic import ValidationError
+from redis import exceptions
+
+from src.shared.config import get_membership_cache_ttl
+from src.shared.db.redis_client import redis_client
+from src.shared.schemas.Project_schemas import MemberAccess
+
+
+class MembershipLookup(NamedTuple):
+    hit: bool
+    member: Optional[MemberAccess]
+    version: Optional[int]
+
+
+class ProjectsLookup(NamedTuple):
+    hit: bool
+    projects: Optional[List[int]]
+    version: Optional[int]
+
+
+class MembershipCache:
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.projects_hits = 0
+        self.projects_misses = 0
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def _version_key(project_id: int) -> str:
+        return f"member_cache_version:{project_id}"
+
+    @staticmethod
+    def _entry_key(project_id: int, user_id: int) -> str:
+        return f"member_cache:{project_id}:{user_id}"
+
+    @staticmethod
+    def _projects_version_key(user_id: int) -> str:
+        return f"member_projects_version:{user_id}"
+
+    @staticmethod
+    def _projects_key(user_id: int) -> str:
+        return f"member_projects:{user_id}"
+
+    async def get(self, project_id: int, user_id: int) -> MembershipLookup:
+        try:
+            version_raw, entry_raw = await redis_client.client.mget(
+                self._version_key(project_id),
+                self._entry_key(project_id, user_id)
+            )
+        except (exceptions.ConnectionError, exceptions.TimeoutError) as e:
+            self.logger.warning(f"Redis недоступен: {e}")
+            self.misses += 1
+            return MembershipLookup(False, None, None)
+        version = int(version_raw or 0)
+        if entry_raw is None:
+            self.misses += 1
+            return MembershipLookup(False, None, version)
+        entry = json.loads(entry_raw)
+        if entry["version"] != version:
+            self.stale += 1
+            self.misses += 1
+            return MembershipLookup(False, None, version)
+        member = entry["member"]
+        if member is None:
+            self.hits += 1
+            return MembershipLookup(True, None, version)
+        try:
+            member = MemberAccess.model_validate(member)
+        except ValidationError:
+            self.misses += 1
+            return MembershipLookup(False, None, version)
+        self.hits += 1
+        return MembershipLookup(True, member, version)
+
+    async def set(self,
+                  project_id: int,
+                  user_id: int,
+                  member: Optional[MemberAccess],
+                  version: Optional[int]):
+        # Версия берется из момента чтения: если проект инвалидировали,
+        # пока шел запрос в БД, запись сразу окажется устаревшей
+        if version is None:
+            return
+        entry = {
+            "version": version,
+            "member": member.model_dump() if member is not None else None
+        }
+        try:
+            await redis_client.client.set(self._entry_key(project_id, user_id), json.dumps(entry), ex=self.ttl)
+        except (exceptions.ConnectionError, exceptions.TimeoutError) as e:
+            self.logger.warning(f"Redis недоступен: {e}")
+
+    async def invalidate_project(self, project_id: int):
+        try:
+            await redis_client.client.incr(self._version_key(project_id))
+        except (exceptions.ConnectionError, exceptions.TimeoutError) as e:
+            self.logger.error(f"Не удалось инвалидировать права участников проекта {project_id}: {e}")
+
+    async def get_projects(self, user_id: int) -> ProjectsLookup:
+        # Список проектов пользователя для подключения к Socket.IO,
+        # версионируется так же, как записи участников
+        try:
+            version_raw, entry_raw = await redis_client.client.mget(
+                self._projects_version_key(user_id),
+                self._projects_key(user_id)
+            )
+        except (exceptions.ConnectionError, exceptions.TimeoutError) as e:
+            self.logger.warning(f"Redis недоступен: {e}")
+            self.projects_misses += 1
+            return ProjectsLookup(False, None, None)
+        version = int(version_raw or 0)
+        if entry_raw is None:
+            self.projects_misses += 1
+            return ProjectsLookup(False, None, version)
+        entry = json.loads(entry_raw)
+        if entry["version"] != version:
+            self.projects_misses += 1
+            return ProjectsLookup(False, None, version)
+        self.projects_hits += 1
+        return ProjectsLookup(True, entry["projects"], version)
+
+    async def set_projects(self, user_id: int, projects: List[int], version: Optional[int]):
+        if version is None:
+            return
+        entry = {"version": version, "projects": projects}
+        try:
+            await redis_client.client.set(self._projects_key(user_id), json.dumps(entry), ex=self.ttl)
+        except (exceptions.ConnectionError, exceptions.TimeoutError) as e:
+            self.logger.warning(f"Redis недоступен: {e}")
+
+    async def invalidate_user(self, user_id: int):
+        try:
+            await redis_client.client.incr(self._projects_version_key(user_id))
+        except (exceptions.ConnectionError, exceptions.TimeoutError) as e:
+            self.logger.error(f"Не удалось инвалидировать проекты пользователя {user_id}: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "projects_hits": self.projects_hits,
+            "projects_misses": self.projects_misses,
+        }
+
+
+membership_cache = MembershipCache(get_membership_cache_ttl())
@@ -0,0 +1,118 @@
+import asyncio
+import logging
+from typing import Optional, Dict, Any
+
+from pydantic import ValidationError
+from redis import exceptions
+
+from src.shared.cache.lru import TTLCache
+from src.shared.config import get_user_cache_settings
+from src.shared.db.redis_client import redis_client
+from src.shared.schemas.User_schema import UserSchema
+
+
+class UserCache:
+    def __init__(self, settings: Dict[str, Any]):
+        self.local = TTLCache(settings["max_size"], settings["local_ttl"])
+        self.redis_ttl = settings["redis_ttl"]
+        self.channel = settings["channel"]
+        self.redis_hits = 0
+        self.redis_misses = 0
+        self.invalidations_received = 0
+        self._listener: Optional[asyncio.Task] = None
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"current_user{user_id}"
+
+    async def get(self, user_id: int) -> UserSchema | None:
+        user = self.local.get(user_id)
+        if user is not None:
+            return user
+        try:
+            cached = await redis_client.client.get(self._key(user_id))
+        except (exceptions.ConnectionError, exceptions.TimeoutError) as e:
+            self.logger.warning(f"Redis недоступен: {e}")
+            return None
+        if cached is None:
+            self.redis_misses += 1
+            return None
+        try:
+            user = UserSchema.model_validate_json(cached)
+        except ValidationError as e:
+            self.logger.warning(f"Некорректные данные пользователя {user_id} в Redis: {e}")
+            self.redis_misses += 1
+            return None
+        self.redis_hits += 1
+        self.local.set(user_id, user)
+        return user
+
+    async def set(self, user: UserSchema):
+        self.local.set(user.id, user)
+        try:
+            await redis_client.client.set(self._key(user.id), user.model_dump_json(), ex=self.redis_ttl)
+        except (exceptions.ConnectionError, exceptions.TimeoutError) as e:
+            self.logger.warning(f"Redis недоступен: {e}")
+
+    async def invalidate(self, user_id: int):
+        self.local.pop(user_id)
+        try:
+            await redis_client.client.delete(self._key(user_id))
+            await redis_client.client.publish(self.channel, str(user_id))
+        except (exceptions.ConnectionError, exceptions.TimeoutError) as e:
+            self.logger.warning(f"Не удалось разослать инвалидацию пользователя {user_id}: {e}")
+
+    async def _listen(self):
+        while True:
+            pubsub = redis_client.client.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                # Пока подписки не было, инвалидации могли потеряться
+                self.local.clear()
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is None:
+                        continue
+                    try:
+                        self.local.pop(int(message["data"]))
+                        self.invalidations_received += 1
+                    except ValueError:
+                        self.logger.warning(f"Некорректное сообщение инвалидации: {message['data']}")
+            except asyncio.CancelledError:
+                raise
+            except (exceptions.ConnectionError, exceptions.TimeoutError) as e:
+                self.logger.warning(f"Подписка на инвалидацию пользователей прервана: {e}")
+                await asyncio.sleep(1)
+            except Exception as e:
+                # Без слушателя локальный кэш перестает получать инвалидации,
+                # поэтому любая ошибка ведет к переподписке
+                self.logger.exception(f"Ошибка подписки на инвалидацию пользователей: {e}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    async def start(self):
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        self.local.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "local": self.local.stats(),
+            "redis_hits": self.redis_hits,
+            "redis_misses": self.redis_misses,
+            "invalidations_received": self.invalidations_received,
+        }
+
+
+user_cache = UserCache(get_user_cache_settings())
@@ -1,6 +1,8 @@
 import logging
 import os
-from typing import Dict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Any
 
 from dotenv import load_dotenv
 
@@ -32,6 +34,90 @@ def get_mongo_db_name() -> str:
     return os.getenv("MONGO_DB_NAME")
 
 
+def get_redis_url() -> str:
+    return os.getenv("REDIS_URL", "redis://127.0.0.1:6379")
+
+
+def get_redis_settings() -> Dict[str, Any]:
+    return {
+        "url": get_redis_url(),
+        "max_connections": int(os.getenv("REDIS_MAX_CONNECTIONS", 50)),
+        "pool_timeout": float(os.getenv("REDIS_POOL_TIMEOUT", 5)),
+        "socket_timeout": float(os.getenv("REDIS_SOCKET_TIMEOUT", 5)),
+        "socket_connect_timeout": float(os.getenv("REDIS_SOCKET_CONNECT_TIMEOUT", 2)),
+        "health_check_interval": int(os.getenv("REDIS_HEALTH_CHECK_INTERVAL", 30)),
+    }
+
+
+def get_user_cache_settings() -> Dict[str, Any]:
+    return {
+        "max_size": int(os.getenv("USER_CACHE_SIZE", 10000)),
+        "local_ttl": float(os.getenv("USER_CACHE_LOCAL_TTL", 60)),
+        "redis_ttl": int(os.getenv("USER_CACHE_REDIS_TTL", 3600)),
+        "channel": os.getenv("USER_CACHE_CHANNEL", "user_cache_invalidation"),
+    }
+
+
+def get_room_evictions_channel() -> str:
+    return os.getenv("ROOM_EVICTIONS_CHANNEL", "ws_room_evictions")
+
+
+def get_membership_cache_ttl() -> int:
+    return int(os.getenv("MEMBERSHIP_CACHE_TTL", 600))
+
+
+def get_history_stats_ttl() -> int:
+    return int(os.getenv("HISTORY_STATS_TTL", 30))
+
+
+def get_audit_relay_settings() -> Dict[str, Any]:
+    return {
+        "batch_size": int(os.getenv("AUDIT_RELAY_BATCH_SIZE", 200)),
+        "poll_interval": float(os.getenv("AUDIT_RELAY_POLL_INTERVAL", 0.5)),
+        "drain_timeout": float(os.getenv("AUDIT_RELAY_DRAIN_TIMEOUT", 10)),
+    }
+
+
+def get_audit_archive_settings() -> Dict[str, Any]:
+    return {
+        "directory": os.getenv("AUDIT_ARCHIVE_DIR", "audit_archive"),
+        "archive_after": float(os.getenv("AUDIT_ARCHIVE_AFTER_HOURS", 24)),
+        "interval": float(os.getenv("AUDIT_ARCHIVE_INTERVAL", 3600)),
+        "batch_size": int(os.getenv("AUDIT_ARCHIVE_BATCH_SIZE", 1000)),
+    }
+
+
+def get_history_export_settings() -> Dict[str, Any]:
+    return {
+        "batch_size": int(os.getenv("HISTORY_EXPORT_BATCH_SIZE", 500)),
+        "poll_interval": float(os.getenv("HISTORY_TAIL_POLL_INTERVAL", 2)),
+        "tail_window": float(os.getenv("HISTORY_TAIL_WINDOW", 30)),
+    }
+
+
+def get_task_events_settings() -> Dict[str, Any]:
+    return {
+        "window": int(os.getenv("TASK_EVENTS_WINDOW_MS", 75)) / 1000,
+        "max_ids": int(os.getenv("TASK_EVENTS_MAX_IDS", 500)),
+    }
+
+
+def get_emit_dispatcher_settings() -> Dict[str, Any]:
+    return {
+        "max_size": int(os.getenv("WS_EMIT_QUEUE_SIZE", 1000)),
+        "retries": int(os.getenv("WS_EMIT_RETRIES", 3)),
+        "retry_delay": float(os.getenv("WS_EMIT_RETRY_DELAY", 0.2)),
+        "drain_timeout": float(os.getenv("WS_EMIT_DRAIN_TIMEOUT", 5)),
+    }
+
+
+def get_presence_settings() -> Dict[str, Any]:
+    return {
+        "ttl": float(os.getenv("PRESENCE_TTL", 60)),
+        "throttle_ms": int(os.getenv("PRESENCE_THROTTLE_MS", 1000)),
+    }
+
+
 def get_engine() -> AsyncEngine:
     db_url = get_db_url()
     engine = create_async_engine(url=db_url)
@@ -44,14 +130,37 @@ def get_secrets() -> Dict[str, str]:
     client_secret = os.getenv("CLIENT_SECRET")
     return {"CLIENT_ID": client_id, "CLIENT_SECRET": client_secret}
 
-async def get_auth_data() -> Dict[str, str]:
+
+def get_github_oauth_settings() -> Dict[str, Any]:
     return {
-        "secret_key": os.getenv("SECRET_KEY"),
-        "algorithm": os.getenv("ALGORITHM"),
-        "expire_access": int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES")),
-        "expire_refresh": int(os.getenv("REFRESH_TOKEN_EXPIRE_MINUTES"))
+        **get_secrets(),
+        "authorize_url": os.getenv("GITHUB_AUTHORIZE_URL", "https://github.com/login/oauth/authorize"),
+        "access_token_url": os.getenv("GITHUB_ACCESS_TOKEN_URL", "https://github.com/login/oauth/access_token"),
+        "api_base_url": os.getenv("GITHUB_API_BASE_URL", "https://api.github.com/"),
+        "max_connections": int(os.getenv("GITHUB_MAX_CONNECTIONS", 20)),
+        "max_keepalive_connections": int(os.getenv("GITHUB_MAX_KEEPALIVE_CONNECTIONS", 10)),
+        "timeout": float(os.getenv("GITHUB_TIMEOUT", 10)),
     }
 
+@dataclass(frozen=True, slots=True)
+class AuthSettings:
+    secret_key: str
+    algorithm: str
+    expire_access: int
+    expire_refresh: int
+    token_cache_size: int
+
+
+@lru_cache(maxsize=1)
+def get_auth_settings() -> AuthSettings:
+    return AuthSettings(
+        secret_key=os.getenv("SECRET_KEY"),
+        algorithm=os.getenv("ALGORITHM"),
+        expire_access=int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES")),
+        expire_refresh=int(os.getenv("REFRESH_TOKEN_EXPIRE_MINUTES")),
+        token_cache_size=int(os.getenv("TOKEN_CACHE_SIZE", 10000))
+    )
+
 def get_middleware_secret() -> str:
     return os.getenv('MIDDLEWARE_SECRET')
 
@@ -0,0 +1,44 @@
+from sqlalchemy import func, cast, extract, literal, Integer, String, Text, literal_column
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.sql.elements import ColumnElement
+
+from src.shared.db.models import User, Role, Permission
+
+# Родительный падеж, как в babel format_date(..., format='d MMMM, Y', locale='ru')
+RU_MONTHS = ','.join((
+    'января', 'февраля', 'марта', 'апреля', 'мая', 'июня',
+    'июля', 'августа', 'сентября', 'октября', 'ноября', 'декабря'
+))
+
+
+def ru_date(column) -> ColumnElement:
+    # 'Y' у babel - год по ISO-неделям, в Postgres ему соответствует IYYY.
+    # Конкатенация через || дает NULL для пустой даты
+    day = cast(cast(extract('day', column), Integer), String)
+    month = func.split_part(literal(RU_MONTHS), ',', cast(extract('month', column), Integer), type_=String)
+    year = func.to_char(column, 'IYYY', type_=String)
+    return day + literal(' ') + month + literal(', ') + year
+
+
+def user_document(user=User) -> ColumnElement:
+    return func.json_build_object(
+        'id', user.id,
+        'username', user.username,
+        'email', user.email,
+        'avatar_url', user.avatar_url
+    )
+
+
+def role_document(role=Role, with_id: bool = False) -> ColumnElement:
+    fields = []
+    for permission in Permission:
+        fields += [permission.name, getattr(role, permission.name)]
+    fields += ['name', role.name, 'priority', role.priority]
+    if with_id:
+        fields += ['id', role.id]
+    return func.json_build_object(*fields)
+
+
+def json_array(document: ColumnElement, *order_by) -> ColumnElement:
+    aggregated = func.json_agg(aggregate_order_by(document, *order_by)) if order_by else func.json_agg(document)
+    return cast(func.coalesce(aggregated, literal_column("'[]'::json")), Text)
@@ -0,0 +1,17 @@
+from typing import Optional
+
+from sqlalchemy.exc import DBAPIError
+
+# Коды SQLSTATE, которые API различает в IntegrityError
+CHECK_VIOLATION = '23514'
+UNIQUE_VIOLATION = '23505'
+
+
+def sqlstate(error: DBAPIError) -> Optional[str]:
+    # Адаптер asyncpg в SQLAlchemy копирует код в e.orig.sqlstate;
+    # исходное исключение asyncpg лежит в __cause__
+    orig = error.orig
+    code = getattr(orig, 'sqlstate', None)
+    if code is None and orig is not None:
+        code = getattr(orig.__cause__, 'sqlstate', None)
+    return code
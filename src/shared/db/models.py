@@ -2,7 +2,9 @@ from datetime import date, datetime
 import enum
 from typing import Annotated, Optional
 
-from sqlalchemy import String, ForeignKey, DateTime, func, UniqueConstraint, Integer, CheckConstraint, text, Date
+from sqlalchemy import String, ForeignKey, DateTime, func, UniqueConstraint, Integer, CheckConstraint, text, Date, \
+    Computed, Index, BigInteger
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import mapped_column, Mapped, relationship
 
 from src.shared.config import Base
@@ -24,6 +26,20 @@ class ProjectStatus(enum.Enum):
     open = "open"
     close = "close"
 
+class Permission(enum.IntFlag):
+    create_tasks = 1 << 0
+    delete_tasks = 1 << 1
+    update_tasks = 1 << 2
+    update_project = 1 << 3
+    generate_url = 1 << 4
+    delete_users = 1 << 5
+    change_roles = 1 << 6
+    manage_links = 1 << 7
+
+permissions_mask_sql = " | ".join(
+    f"({permission.name}::int << {permission.value.bit_length() - 1})" for permission in Permission
+)
+
 
 class User(Base):
     __tablename__ = 'users'
@@ -77,7 +93,10 @@ class ProjectMember(Base):
     joined_at: Mapped[created_at]
     assigned_tasks_rel: Mapped[list["TaskAssignee"]] = relationship(back_populates="project_member_rel")
 
-    __table_args__ = (UniqueConstraint('user_id', 'project_id', name='_user_project_uc'),)
+    __table_args__ = (
+        UniqueConstraint('user_id', 'project_id', name='_user_project_uc'),
+        Index('ix_project_members_project_id', 'project_id', 'user_id'),
+    )
 
 
 
@@ -96,6 +115,7 @@ class Role(Base):
     delete_users: Mapped[bool] = mapped_column(default=False)
     change_roles: Mapped[bool] = mapped_column(default=False)
     manage_links: Mapped[bool] = mapped_column(default=False)
+    permissions: Mapped[int] = mapped_column(Integer, Computed(permissions_mask_sql, persisted=True))
     project_rel: Mapped["Project"] = relationship(back_populates="roles_rel", foreign_keys=[project_id])
     member_rel: Mapped[list["ProjectMember"]] = relationship(back_populates="role_rel")
 
@@ -120,12 +140,26 @@ class Task(Base):
     project_rel: Mapped['Project'] = relationship(back_populates='tasks_rel')
     assignees_rel: Mapped[list["TaskAssignee"]] = relationship(back_populates="task_rel")
 
+    # Индексы повторяют порядок ключей keyset-пагинации (колонка сортировки, id)
+    __table_args__ = (
+        Index('ix_tasks_project_started_at_id', 'project_id', 'started_at', 'id'),
+        Index('ix_tasks_project_deadline_id', 'project_id', text("coalesce(deadline, 'infinity'::date)"), 'id'),
+        Index('ix_tasks_project_priority_id', 'project_id', 'priority', 'id'),
+        Index('ix_tasks_project_status_id', 'project_id', 'status', 'id'),
+        # Без условия по статусу: статистика фильтрует только по project_id и completed_at
+        Index('ix_tasks_project_completed_at', 'project_id', 'completed_at'),
+        Index('ix_tasks_project_processing_deadline', 'project_id', 'deadline',
+              postgresql_where=text("status = 'processing'")),
+    )
+
 
 class TaskAssignee(Base):
     __tablename__ = 'task_assignees'
 
     task_id: Mapped[int] = mapped_column(ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
-    project_member_id: Mapped[int] = mapped_column(ForeignKey("project_members.id", ondelete="CASCADE"), primary_key=True)
+    project_member_id: Mapped[int] = mapped_column(ForeignKey("project_members.id", ondelete="CASCADE"),
+                                                   primary_key=True,
+                                                   index=True)
     task_rel: Mapped["Task"] = relationship(back_populates="assignees_rel")
     project_member_rel: Mapped["ProjectMember"] = relationship(back_populates="assigned_tasks_rel")
 
@@ -135,7 +169,7 @@ class ProjectLink(Base):
     __tablename__ = 'links'
 
     id: Mapped[pk]
-    link: Mapped[str]
+    link: Mapped[str] = mapped_column(unique=True, index=True)
     created_at: Mapped[created_at]
     end_at: Mapped[Optional[datetime]]
     is_active: Mapped[bool] = mapped_column(default=True)
@@ -147,6 +181,28 @@ class ProjectLink(Base):
 
 
 
+class ProjectCounter(Base):
+    __tablename__ = 'project_counters'
+
+    project_id: Mapped[int] = mapped_column(ForeignKey('projects.id', ondelete="CASCADE"), primary_key=True)
+    tasks_total: Mapped[int] = mapped_column(default=0, server_default=text("0"))
+    tasks_processing: Mapped[int] = mapped_column(default=0, server_default=text("0"))
+    tasks_completed: Mapped[int] = mapped_column(default=0, server_default=text("0"))
+    tasks_ended: Mapped[int] = mapped_column(default=0, server_default=text("0"))
+    members_count: Mapped[int] = mapped_column(default=0, server_default=text("0"))
+    active_links: Mapped[int] = mapped_column(default=0, server_default=text("0"))
+
+
+class AuditOutbox(Base):
+    __tablename__ = 'audit_outbox'
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    document_id: Mapped[str] = mapped_column(String(24), unique=True)
+    project_id: Mapped[int]
+    payload: Mapped[dict] = mapped_column(JSONB)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+
+
 class RefreshToken(Base):
     __tablename__ = 'tokens'
 
@@ -0,0 +1,67 @@
+import time
+from typing import Optional, Dict, Any
+
+from redis.asyncio import Redis, BlockingConnectionPool
+
+from src.shared.config import get_redis_settings
+
+
+class MeasuredConnectionPool(BlockingConnectionPool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.acquired = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    async def get_connection(self, *args, **kwargs):
+        started = time.perf_counter()
+        connection = await super().get_connection(*args, **kwargs)
+        waited = time.perf_counter() - started
+        self.acquired += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+        return connection
+
+
+class RedisClient:
+    def __init__(self, settings: Dict[str, Any]):
+        self.settings = settings
+        self.pool: Optional[MeasuredConnectionPool] = None
+        self.client: Optional[Redis] = None
+
+    async def connect(self):
+        self.pool = MeasuredConnectionPool.from_url(
+            self.settings["url"],
+            max_connections=self.settings["max_connections"],
+            timeout=self.settings["pool_timeout"],
+            socket_timeout=self.settings["socket_timeout"],
+            socket_connect_timeout=self.settings["socket_connect_timeout"],
+            health_check_interval=self.settings["health_check_interval"],
+            decode_responses=True
+        )
+        self.client = Redis(connection_pool=self.pool)
+
+    async def close(self):
+        if self.client:
+            await self.client.aclose()
+        if self.pool:
+            await self.pool.disconnect()
+
+    def stats(self) -> Dict[str, Any]:
+        if self.pool is None:
+            return {"connected": False}
+        in_use = len(self.pool._in_use_connections)
+        idle = len(self.pool._available_connections)
+        acquired = self.pool.acquired
+        return {
+            "connected": True,
+            "max_connections": self.pool.max_connections,
+            "in_use": in_use,
+            "idle": idle,
+            "acquired_total": acquired,
+            "wait_avg_ms": round(self.pool.wait_total / acquired * 1000, 3) if acquired else 0.0,
+            "wait_max_ms": round(self.pool.wait_max * 1000, 3),
+        }
+
+
+redis_client = RedisClient(get_redis_settings())
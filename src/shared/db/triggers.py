@@ -144,4 +144,194 @@ class TriggersManager:
             EXECUTE FUNCTION protect_important_roles();
         """
 
+    @staticmethod
+    def get_init_project_counters_function():
+        return """
+        CREATE OR REPLACE FUNCTION init_project_counters()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            INSERT INTO project_counters (project_id)
+            VALUES (NEW.id)
+            ON CONFLICT (project_id) DO NOTHING;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+
+    @staticmethod
+    def get_init_project_counters_trigger():
+        return """
+        CREATE TRIGGER init_project_counters_trigger
+            AFTER INSERT ON projects
+            FOR EACH ROW
+            EXECUTE FUNCTION init_project_counters();
+        """
+
+    @staticmethod
+    def get_task_counters_function():
+        return """
+        CREATE OR REPLACE FUNCTION update_task_counters()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                UPDATE project_counters SET
+                    tasks_total = tasks_total - 1,
+                    tasks_processing = tasks_processing - (OLD.status = 'processing')::int,
+                    tasks_completed = tasks_completed - (OLD.status = 'completed')::int,
+                    tasks_ended = tasks_ended - (OLD.status = 'ended')::int
+                WHERE project_id = OLD.project_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                UPDATE project_counters SET
+                    tasks_total = tasks_total + 1,
+                    tasks_processing = tasks_processing + (NEW.status = 'processing')::int,
+                    tasks_completed = tasks_completed + (NEW.status = 'completed')::int,
+                    tasks_ended = tasks_ended + (NEW.status = 'ended')::int
+                WHERE project_id = NEW.project_id;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+
+    @staticmethod
+    def get_task_counters_trigger():
+        return """
+        CREATE TRIGGER task_counters_insert_delete
+            AFTER INSERT OR DELETE ON tasks
+            FOR EACH ROW
+            EXECUTE FUNCTION update_task_counters();
+        """
+
+    @staticmethod
+    def get_task_counters_trigger_on_update():
+        return """
+        CREATE TRIGGER task_counters_update
+            AFTER UPDATE OF status, project_id ON tasks
+            FOR EACH ROW
+            WHEN (OLD.status IS DISTINCT FROM NEW.status OR OLD.project_id <> NEW.project_id)
+            EXECUTE FUNCTION update_task_counters();
+        """
+
+    @staticmethod
+    def get_member_counters_function():
+        return """
+        CREATE OR REPLACE FUNCTION update_member_counters()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                UPDATE project_counters SET members_count = members_count + 1
+                WHERE project_id = NEW.project_id;
+            ELSE
+                UPDATE project_counters SET members_count = members_count - 1
+                WHERE project_id = OLD.project_id;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+
+    @staticmethod
+    def get_member_counters_trigger():
+        return """
+        CREATE TRIGGER member_counters_trigger
+            AFTER INSERT OR DELETE ON project_members
+            FOR EACH ROW
+            EXECUTE FUNCTION update_member_counters();
+        """
 
+    @staticmethod
+    def get_link_counters_function():
+        return """
+        CREATE OR REPLACE FUNCTION update_link_counters()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.is_active THEN
+                UPDATE project_counters SET active_links = active_links - 1
+                WHERE project_id = OLD.project_id;
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.is_active THEN
+                UPDATE project_counters SET active_links = active_links + 1
+                WHERE project_id = NEW.project_id;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+
+    @staticmethod
+    def get_link_counters_trigger():
+        return """
+        CREATE TRIGGER link_counters_trigger
+            AFTER INSERT OR DELETE OR UPDATE OF is_active, project_id ON links
+            FOR EACH ROW
+            EXECUTE FUNCTION update_link_counters();
+        """
+
+    # Начиная с ревизии c52f8e07d1a3 лимит ссылок проверяется условным
+    # инкрементом project_counters, а update_link_counters больше не
+    # реагирует на INSERT. Методы выше оставлены как есть: их вызывают
+    # более ранние миграции
+    @staticmethod
+    def get_links_limit_on_counter_function():
+        return """
+        CREATE OR REPLACE FUNCTION check_urls_count()
+        RETURNS TRIGGER AS $$
+        DECLARE
+            max_links INTEGER := 100;
+            current_count INTEGER;
+        BEGIN
+            IF NOT NEW.is_active THEN
+                RETURN NEW;
+            END IF;
+
+            UPDATE project_counters
+            SET active_links = active_links + 1
+            WHERE project_id = NEW.project_id AND active_links < max_links
+            RETURNING active_links INTO current_count;
+
+            IF NOT FOUND THEN
+                SELECT active_links INTO current_count
+                FROM project_counters
+                WHERE project_id = NEW.project_id;
+                RAISE EXCEPTION 'Maximum % links allowed per project. Current count: %, Project ID: %',
+                max_links, current_count, NEW.project_id
+                USING ERRCODE = 'check_violation';
+            END IF;
+
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;"""
+
+    @staticmethod
+    def get_link_counters_on_update_function():
+        return """
+        CREATE OR REPLACE FUNCTION update_link_counters()
+        RETURNS TRIGGER AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.is_active THEN
+                UPDATE project_counters SET active_links = active_links - 1
+                WHERE project_id = OLD.project_id;
+            END IF;
+            IF TG_OP = 'UPDATE' AND NEW.is_active THEN
+                UPDATE project_counters SET active_links = active_links + 1
+                WHERE project_id = NEW.project_id;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+
+    @staticmethod
+    def get_link_counters_on_update_trigger():
+        return """
+        CREATE TRIGGER link_counters_trigger
+            AFTER DELETE OR UPDATE OF is_active, project_id ON links
+            FOR EACH ROW
+            EXECUTE FUNCTION update_link_counters();
+        """
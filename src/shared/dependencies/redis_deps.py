@@ -3,13 +3,10 @@ from typing import Annotated
 from redis.asyncio import Redis
 from fastapi import Depends
 
+from src.shared.db.redis_client import redis_client
 
-async def get_redis():
-    redis = Redis.from_url("redis://127.0.0.1:6379",
-                         decode_responses=True)
-    try:
-        yield redis
-    finally:
-        await redis.aclose()
 
-RedisDep = Annotated[Redis, Depends(get_redis)]
\ No newline at end of file
+async def get_redis() -> Redis:
+    return redis_client.client
+
+RedisDep = Annotated[Redis, Depends(get_redis)]
@@ -3,6 +3,7 @@ from typing import Annotated
 from fastapi import Depends
 
 from src.project.management_service.repositories.link_repository import LinkRepository
+from src.project.management_service.repositories.outbox_repository import OutboxRepository
 from src.project.management_service.repositories.project_member_repository import ProjectMemberRepository
 from src.project.management_service.repositories.project_repository import ProjectRepository
 from src.project.management_service.repositories.role_repository import RoleRepository
@@ -70,6 +71,13 @@ async def get_mongo_repository() -> MongoRepository:
 mongo_repository = Annotated[MongoRepository, Depends(get_mongo_repository)]
 
 
+async def get_outbox_repository(session: SessionDep) -> OutboxRepository:
+    return OutboxRepository(session)
+
+
+outbox_repository = Annotated[OutboxRepository, Depends(get_outbox_repository)]
+
+
 async def get_stat_repository(session: SessionDep) -> StatisticRepository:
     return StatisticRepository(session)
 
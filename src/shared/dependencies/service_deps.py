@@ -5,7 +5,7 @@ from fastapi import Depends
 from src.shared.dependencies.redis_deps import RedisDep
 from src.shared.dependencies.repository_deps import user_repository, project_repository, role_repository, \
     link_repository, \
-    token_repository, task_repository, mongo_repository, members_repository, stat_repository
+    token_repository, task_repository, mongo_repository, members_repository, stat_repository, outbox_repository
 from src.project.management_service.services.audit_service import AuditService
 from src.project.auth_service.services.auth_service import AuthService
 from src.project.management_service.services.link_service import LinkService
@@ -26,8 +26,10 @@ async def get_auth_service(repository: user_repository,
 auth_service = Annotated[AuthService, Depends(get_auth_service)]
 
 
-async def get_audit_service(mongo: mongo_repository) -> AuditService:
-    return AuditService(mongo)
+async def get_audit_service(mongo: mongo_repository,
+                            outbox: outbox_repository,
+                            redis: RedisDep) -> AuditService:
+    return AuditService(mongo, outbox, redis)
 
 
 audit_service = Annotated[AuditService, Depends(get_audit_service)]
@@ -27,6 +27,8 @@ class TaskFilter(BaseModel):
     created_before: Optional[datetime.datetime]  = None
     sort_by: Optional[SortField] = None
     sort_dir: SortDirection = SortDirection.DESC
+    cursor: Optional[str] = None
+    limit: int = Field(default=20, ge=1, le=100)
 
 
     @model_validator(mode="after")
@@ -52,7 +54,18 @@ class ActionType(enum.Enum):
 
 
 
-class HistoryFilter(BaseModel):
+class HistoryPagination(BaseModel):
+    cursor: Optional[str] = None
+    limit: int = Field(default=50, ge=1, le=200)
+    sort_dir: SortDirection = SortDirection.DESC
+    fields: Optional[List[str]] = Field(default=Query(None, style='form', explode=True), max_length=20)
+    summary: bool = False
+
+
+HistoryPaginationDep = Annotated[HistoryPagination, Depends()]
+
+
+class HistoryFilter(HistoryPagination):
     from_user: Optional[int] = Field(default=None)
     action_type: List[Optional[ActionType]] = Field(default=Query(None, style='form', explode=True), max_length=9)
     time_interval_start: Optional[datetime.date] = Field(default=None)
@@ -64,6 +77,22 @@ class HistoryFilter(BaseModel):
         if self.time_interval_start and self.time_interval_end:
             if self.time_interval_start > self.time_interval_end:
                 raise ValueError("start of interval must be less then end of interval")
+        return self
 
 
 FiltersDep = Annotated[HistoryFilter, Depends()]
+
+
+class HistoryStatsFilter(BaseModel):
+    start: Optional[datetime.date] = None
+    end: Optional[datetime.date] = None
+    bucket: Literal['hour', 'day'] = 'day'
+
+    @model_validator(mode="after")
+    def check_date_ranges(self):
+        if self.start and self.end and self.start > self.end:
+            raise ValueError("start of interval must be less then end of interval")
+        return self
+
+
+HistoryStatsDep = Annotated[HistoryStatsFilter, Depends()]
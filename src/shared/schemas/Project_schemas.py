@@ -23,6 +23,16 @@ class ProjectMemberSchema(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+class MemberAccess(BaseModel):
+    id: int
+    user_id: int
+    project_id: int
+    role_id: int
+    priority: int
+    permissions: int
+
+    model_config = ConfigDict(from_attributes=True)
+
 class ProjectMemberSchemaExtend(ProjectMemberSchema):
     user_rel: UserSchema
 
@@ -61,6 +71,6 @@ class ProjectWithRoles(ProjectRel):
 
 
 class ProjectContext(BaseModel):
-    member: ProjectMemberSchema
+    member: MemberAccess
     user: UserSchema
 
@@ -1,4 +1,16 @@
-from pydantic import BaseModel, ConfigDict, Field
+from typing import Any, Mapping
+
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from src.shared.db.models import Permission
+
+
+def permissions_to_mask(flags: Mapping[str, Any]) -> int:
+    mask = 0
+    for permission in Permission:
+        if flags.get(permission.name):
+            mask |= permission
+    return int(mask)
 
 
 class Permissions(BaseModel):
@@ -11,6 +23,10 @@ class Permissions(BaseModel):
     change_roles: bool = Field(default=False)
     manage_links: bool = Field(default=False)
 
+    @property
+    def permissions(self) -> int:
+        return permissions_to_mask(self.__dict__)
+
 
 class ProjectSchemaForRoles(BaseModel):
     name: str = Field(max_length=50, min_length=1, description="Название проекта")
@@ -33,3 +49,18 @@ class RoleSchemaExtend(RoleSchema):
     project_rel: ProjectSchemaForRoles
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class RoleMaskSchema(BaseModel):
+    name: str
+    priority: int
+    permissions: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+    @model_validator(mode='before')
+    @classmethod
+    def pack_permissions(cls, data: Any) -> Any:
+        if isinstance(data, dict) and 'permissions' not in data:
+            return {**data, 'permissions': permissions_to_mask(data)}
+        return data
@@ -6,6 +6,12 @@ from pydantic import field_validator, BaseModel, ConfigDict, model_validator, Fi
 from src.shared.db.models import TaskPriority
 from src.shared.schemas.Assigneed_schemas import AssigneesModel
 
+
+def format_ru_date(value: Any) -> Any:
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return format_date(value, format='d MMMM, Y', locale='ru')
+    return value
+
 class EditableTaskData(BaseModel):
     name: str
     description: str
@@ -77,23 +83,26 @@ class TaskGetSchema(EditableTaskData):
     @model_validator(mode='before')
     @classmethod
     def format_dates(cls, data: Union[Dict[str, Any], Any]) -> Union[Dict[str, Any], Any]:
-        def format_if_date(value: Any) -> Any:
-            if isinstance(value, (datetime.datetime, datetime.date)):
-                return format_date(value, format='d MMMM, Y', locale='ru')
-            return value
-
         fields_to_format = ['deadline', 'started_at', 'completed_at']
 
         if isinstance(data, dict):
             for field in fields_to_format:
                 if field in data and data[field] is not None:
-                    data[field] = format_if_date(data[field])
+                    data[field] = format_ru_date(data[field])
         else:
 
             for field in fields_to_format:
                 if hasattr(data, field) and getattr(data, field) is not None:
-                    setattr(data, field, format_if_date(getattr(data, field)))
+                    setattr(data, field, format_ru_date(getattr(data, field)))
 
         return data
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TaskPage(BaseModel):
+    tasks: List[TaskGetSchema]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    tasks_count: Optional[int] = None
+    completed_tasks_count: Optional[int] = None
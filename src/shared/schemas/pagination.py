@@ -1,4 +1,7 @@
-from typing import Annotated
+import base64
+import binascii
+import json
+from typing import Annotated, Optional, Dict, Any
 
 from fastapi import Depends
 from pydantic import Field, BaseModel
@@ -10,4 +13,29 @@ class Pagination(BaseModel):
     limit: int = Field(default=20, ge=1)
 
 
-PaginationDep = Annotated[Pagination, Depends()]
\ No newline at end of file
+PaginationDep = Annotated[Pagination, Depends()]
+
+
+class CursorPagination(BaseModel):
+    cursor: Optional[str] = Field(default=None)
+    limit: int = Field(default=20, ge=1, le=100)
+    with_totals: bool = Field(default=False)
+
+
+CursorPaginationDep = Annotated[CursorPagination, Depends()]
+
+
+def encode_cursor(payload: Dict[str, Any]) -> str:
+    raw = json.dumps(payload, separators=(',', ':'), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        payload = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(payload, dict):
+        raise ValueError("Invalid cursor")
+    return payload
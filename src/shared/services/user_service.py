@@ -4,6 +4,7 @@ import secrets
 from pymongo.asynchronous.database import AsyncDatabase
 from redis.asyncio import Redis
 
+from src.shared.cache.user_cache import user_cache
 from src.shared.db.repositories.user_repository import UserRepository
 
 
@@ -25,7 +26,7 @@ class UserService:
             data = json.loads(email)
             res = await self.repository.update_by_id(id=data["id"], data=data)
             await self.redis.delete(code)
-            await self.redis.delete(f"current_user{data['id']}")
+            await user_cache.invalidate(data['id'])
             return res
         else:
             return False
@@ -0,0 +1,95 @@
+import asyncio
+from typing import Dict, Any, Optional
+
+from src.shared.config import get_task_events_settings
+from src.shared.ws.dispatcher import emit_dispatcher
+
+# Порядок важности изменений: при склейке остается более сильное
+CHANGE_RANK = {"updated": 0, "created": 1, "deleted": 2}
+
+
+class PendingChange:
+    def __init__(self, change: str):
+        self.change = change
+        self.fields: Dict[str, Any] = {}
+
+
+# Изменения задач копятся по комнатам в течение короткого окна и уходят
+# одним сообщением tasks_changed. Для созданных и измененных задач оно
+# несет только поля, которые поменялись за окно, а номер версии комнаты
+# позволяет клиенту заметить пропуск и запросить resync_tasks
+class EmitCoalescer:
+    event = "tasks_changed"
+
+    def __init__(self, settings: Dict[str, Any]):
+        self.window = settings["window"]
+        self.max_ids = settings["max_ids"]
+        self._pending: Dict[int, Dict[int, PendingChange]] = {}
+        self._timers: Dict[int, asyncio.TimerHandle] = {}
+        self._counts: Dict[int, int] = {}
+        self.received = 0
+        self.flushed = 0
+        self.sent = 0
+
+    @staticmethod
+    def room(project_id: int) -> str:
+        return f"project_{project_id}"
+
+    @staticmethod
+    def version_key(project_id: int) -> str:
+        return f"task_events_version:{project_id}"
+
+    def add(self,
+            project_id: int,
+            task_id: int,
+            change: str = "updated",
+            fields: Optional[Dict[str, Any]] = None):
+        pending = self._pending.setdefault(project_id, {})
+        entry = pending.get(task_id)
+        if entry is None:
+            entry = pending[task_id] = PendingChange(change)
+        elif CHANGE_RANK[change] > CHANGE_RANK[entry.change]:
+            entry.change = change
+        if fields:
+            entry.fields.update(fields)
+        self.received += 1
+        self._counts[project_id] = self._counts.get(project_id, 0) + 1
+        if len(pending) >= self.max_ids:
+            self._flush(project_id)
+        elif project_id not in self._timers:
+            self._timers[project_id] = asyncio.get_running_loop().call_later(self.window, self._flush, project_id)
+
+    def _flush(self, project_id: int):
+        timer = self._timers.pop(project_id, None)
+        if timer is not None:
+            timer.cancel()
+        pending = self._pending.pop(project_id, None)
+        if not pending:
+            return
+        self.flushed += self._counts.pop(project_id, 0)
+        payload = {"created": [], "updated": [], "deleted": []}
+        for task_id, entry in sorted(pending.items()):
+            if entry.change == "deleted":
+                payload["deleted"].append(task_id)
+            else:
+                payload[entry.change].append({"id": task_id, **entry.fields})
+        emit_dispatcher.submit(self.event, payload, self.room(project_id), self.version_key(project_id))
+        self.sent += 1
+
+    async def stop(self):
+        for project_id in list(self._pending):
+            self._flush(project_id)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "window_ms": round(self.window * 1000),
+            "max_ids": self.max_ids,
+            "pending_rooms": len(self._pending),
+            "received": self.received,
+            "sent": self.sent,
+            # Сколько отдельных emit не понадобилось благодаря склейке
+            "saved": self.flushed - self.sent,
+        }
+
+
+task_events = EmitCoalescer(get_task_events_settings())
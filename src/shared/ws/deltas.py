@@ -0,0 +1,11 @@
+from typing import Any, Dict
+
+
+def task_fields(document: Dict[str, Any]) -> Dict[str, Any]:
+    # В событиях вместо вложенных профилей исполнителей передаются
+    # только их id; полные данные клиент берет из REST
+    fields = dict(document)
+    assignees = fields.pop('assignees_rel', None)
+    if assignees is not None:
+        fields['assignees'] = [assignee['project_member_rel']['user_rel']['id'] for assignee in assignees]
+    return fields
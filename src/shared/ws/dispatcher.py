@@ -0,0 +1,156 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Optional, Dict, Any, NamedTuple
+
+from redis import exceptions
+
+from src.shared.config import get_emit_dispatcher_settings
+from src.shared.db.redis_client import redis_client
+from src.shared.ws.socket import sio
+
+
+class PendingEmit(NamedTuple):
+    event: str
+    data: Any
+    room: str
+    version_key: Optional[str]
+    queued_at: float
+
+
+# Рассылка Socket.IO идет из фонового воркера: HTTP-ответ не ждет
+# публикации в Redis. Очередь ограничена, при переполнении вытесняются
+# самые старые сообщения
+class EmitDispatcher:
+    def __init__(self, settings: Dict[str, Any]):
+        self.retries = settings["retries"]
+        self.retry_delay = settings["retry_delay"]
+        self.drain_timeout = settings["drain_timeout"]
+        self._queue: deque[PendingEmit] = deque(maxlen=settings["max_size"])
+        self._ready = asyncio.Event()
+        self._worker: Optional[asyncio.Task] = None
+        # Номера версий, которые должны были уйти с вытесненными или
+        # неотправленными сообщениями: следующее сообщение комнаты
+        # перепрыгивает через них, и клиент видит пропуск
+        self._skipped: Dict[str, int] = {}
+        self.submitted = 0
+        self.sent = 0
+        self.retried = 0
+        self.dropped = 0
+        self.failed = 0
+        self.skipped_versions = 0
+        self.lag = 0.0
+        self.lag_max = 0.0
+        self.logger = logging.getLogger(__name__)
+
+    def submit(self, event: str, data: Any, room: str, version_key: Optional[str] = None):
+        # С version_key сообщение получает следующий номер версии комнаты
+        # в момент отправки, так что номера идут в порядке доставки
+        if len(self._queue) == self._queue.maxlen:
+            self.dropped += 1
+            self._skip(self._queue[0])
+        self._queue.append(PendingEmit(event, data, room, version_key, time.monotonic()))
+        self.submitted += 1
+        self._ready.set()
+
+    def _skip(self, emit: PendingEmit):
+        # Сообщение без номера версии пропадает: его номер отдается
+        # следующему сообщению той же комнаты в виде пропуска
+        if emit.version_key is not None and 'version' not in emit.data:
+            self._skipped[emit.version_key] = self._skipped.get(emit.version_key, 0) + 1
+            self.skipped_versions += 1
+
+    async def _next_version(self, version_key: str) -> int:
+        skipped = self._skipped.pop(version_key, 0)
+        try:
+            return await redis_client.client.incrby(version_key, skipped + 1)
+        except BaseException:
+            if skipped:
+                self._skipped[version_key] = self._skipped.get(version_key, 0) + skipped
+            raise
+
+    async def _send(self, emit: PendingEmit):
+        data = emit.data
+        for attempt in range(self.retries + 1):
+            try:
+                if emit.version_key is not None and 'version' not in data:
+                    data = data | {'version': await self._next_version(emit.version_key)}
+                await sio.emit(emit.event, data=data, to=emit.room)
+                self.sent += 1
+                return
+            except (exceptions.ConnectionError, exceptions.TimeoutError) as e:
+                if attempt == self.retries:
+                    self.failed += 1
+                    self.logger.warning(f"Сообщение {emit.event} для {emit.room} не отправлено: {e}")
+                    # Если номер уже выдан, пропуск и так виден клиенту
+                    self._skip(emit._replace(data=data))
+                    return
+                self.retried += 1
+                await asyncio.sleep(self.retry_delay * 2 ** attempt)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Ошибка, не связанная с Redis (например, несериализуемые
+                # данные), не повторяется и не должна останавливать воркер
+                self.failed += 1
+                self.logger.exception(f"Сообщение {emit.event} для {emit.room} отброшено: {e}")
+                self._skip(emit._replace(data=data))
+                return
+
+    async def _drain(self):
+        while self._queue:
+            emit = self._queue.popleft()
+            self.lag = time.monotonic() - emit.queued_at
+            self.lag_max = max(self.lag_max, self.lag)
+            try:
+                await self._send(emit)
+            except asyncio.CancelledError:
+                # Остановка воркера: сообщение дошлет stop()
+                self._queue.appendleft(emit)
+                raise
+
+    async def _run(self):
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+            await self._drain()
+
+    async def start(self):
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+        try:
+            async with asyncio.timeout(self.drain_timeout):
+                await self._drain()
+        except TimeoutError:
+            self.logger.warning(f"Не отправлено сообщений Socket.IO при остановке: {len(self._queue)}")
+
+    def stats(self) -> Dict[str, Any]:
+        oldest = time.monotonic() - self._queue[0].queued_at if self._queue else 0.0
+        return {
+            "running": self._worker is not None,
+            "queued": len(self._queue),
+            "max_size": self._queue.maxlen,
+            "submitted": self.submitted,
+            "sent": self.sent,
+            "retried": self.retried,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "skipped_versions": self.skipped_versions,
+            "lag_seconds": round(self.lag, 3),
+            "lag_max_seconds": round(self.lag_max, 3),
+            "oldest_queued_seconds": round(oldest, 3),
+        }
+
+
+emit_dispatcher = EmitDispatcher(get_emit_dispatcher_settings())
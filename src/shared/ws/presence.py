@@ -0,0 +1,165 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Any, Iterable
+
+from redis import exceptions
+
+from src.shared.config import get_presence_settings
+from src.shared.db.redis_client import redis_client
+from src.shared.ws.dispatcher import emit_dispatcher
+
+
+# Присутствие хранится в Redis: presence:project_{id} - sorted set
+# user_id -> время последнего сигнала. Записи старше ttl отбрасываются
+# лениво при чтении, так что упавший воркер не оставляет "вечно онлайн"
+# пользователей. Все состояние общее, поэтому работает с несколькими
+# воркерами за одним AsyncRedisManager
+class PresenceTracker:
+    event = "presence_changed"
+
+    def __init__(self, settings: Dict[str, Any]):
+        self.ttl = settings["ttl"]
+        self.throttle_ms = settings["throttle_ms"]
+        self._trailing: Dict[int, asyncio.TimerHandle] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self.touches = 0
+        self.emitted = 0
+        self.throttled = 0
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def _key(project_id: int) -> str:
+        return f"presence:project_{project_id}"
+
+    @staticmethod
+    def _sockets_key(user_id: int) -> str:
+        return f"presence_sockets:{user_id}"
+
+    @staticmethod
+    def _throttle_key(project_id: int) -> str:
+        return f"presence_throttle:{project_id}"
+
+    async def _touch(self, user_id: int, project_ids: list[int]) -> list[int]:
+        # Возвращает проекты, где пользователь только что появился
+        now = time.time()
+        async with redis_client.client.pipeline(transaction=False) as pipe:
+            for project_id in project_ids:
+                pipe.zscore(self._key(project_id), user_id)
+                pipe.zadd(self._key(project_id), {str(user_id): now})
+            results = await pipe.execute()
+        self.touches += 1
+        previous = results[::2]
+        return [project_id for project_id, score in zip(project_ids, previous)
+                if score is None or score < now - self.ttl]
+
+    async def connect(self, user_id: int, project_ids: list[int]):
+        try:
+            async with redis_client.client.pipeline(transaction=False) as pipe:
+                pipe.incr(self._sockets_key(user_id))
+                pipe.expire(self._sockets_key(user_id), int(self.ttl))
+                await pipe.execute()
+            changed = await self._touch(user_id, project_ids)
+        except (exceptions.ConnectionError, exceptions.TimeoutError) as e:
+            self.logger.warning(f"Redis недоступен: {e}")
+            return
+        await self._notify(changed)
+
+    async def heartbeat(self, user_id: int, project_ids: list[int]):
+        try:
+            await redis_client.client.expire(self._sockets_key(user_id), int(self.ttl))
+            changed = await self._touch(user_id, project_ids)
+        except (exceptions.ConnectionError, exceptions.TimeoutError) as e:
+            self.logger.warning(f"Redis недоступен: {e}")
+            return
+        await self._notify(changed)
+
+    async def disconnect(self, user_id: int, project_ids: list[int]):
+        # Пользователь уходит из проектов, только когда закрыт его
+        # последний сокет на всех воркерах
+        try:
+            sockets = await redis_client.client.decr(self._sockets_key(user_id))
+            if sockets > 0:
+                return
+            async with redis_client.client.pipeline(transaction=False) as pipe:
+                pipe.delete(self._sockets_key(user_id))
+                for project_id in project_ids:
+                    pipe.zrem(self._key(project_id), user_id)
+                await pipe.execute()
+        except (exceptions.ConnectionError, exceptions.TimeoutError) as e:
+            self.logger.warning(f"Redis недоступен: {e}")
+            return
+        await self._notify(project_ids)
+
+    async def leave(self, user_id: int, project_id: int):
+        # Пользователя удалили из проекта: его сокеты остаются подключены,
+        # но в проекте он больше не присутствует
+        try:
+            await redis_client.client.zrem(self._key(project_id), user_id)
+        except (exceptions.ConnectionError, exceptions.TimeoutError) as e:
+            self.logger.warning(f"Redis недоступен: {e}")
+            return
+        await self._notify([project_id])
+
+    async def _count(self, project_id: int) -> int:
+        key = self._key(project_id)
+        async with redis_client.client.pipeline(transaction=False) as pipe:
+            pipe.zremrangebyscore(key, '-inf', time.time() - self.ttl)
+            pipe.zcard(key)
+            _, count = await pipe.execute()
+        return count
+
+    async def online(self, project_id: int, limit: int = 100) -> Dict[str, Any]:
+        # Сначала отсекаются протухшие записи, затем берутся последние
+        # активные: O(log n + limit)
+        key = self._key(project_id)
+        async with redis_client.client.pipeline(transaction=False) as pipe:
+            pipe.zremrangebyscore(key, '-inf', time.time() - self.ttl)
+            pipe.zcard(key)
+            pipe.zrange(key, 0, limit - 1, desc=True, withscores=True)
+            _, count, users = await pipe.execute()
+        return {
+            'online': count,
+            'users': [{'user_id': int(user_id), 'last_seen': last_seen} for user_id, last_seen in users]
+        }
+
+    async def _notify(self, project_ids: Iterable[int]):
+        for project_id in project_ids:
+            await self._emit(project_id)
+
+    async def _emit(self, project_id: int):
+        # Не чаще раза в throttle_ms на проект для всех воркеров. Изменение,
+        # попавшее в окно, отправляется после него, чтобы клиенты получили
+        # итоговое состояние
+        try:
+            if not await redis_client.client.set(self._throttle_key(project_id), '1', nx=True, px=self.throttle_ms):
+                self.throttled += 1
+                if project_id not in self._trailing:
+                    self._trailing[project_id] = asyncio.get_running_loop().call_later(
+                        self.throttle_ms / 1000, self._emit_trailing, project_id
+                    )
+                return
+            count = await self._count(project_id)
+        except (exceptions.ConnectionError, exceptions.TimeoutError) as e:
+            self.logger.warning(f"Redis недоступен: {e}")
+            return
+        emit_dispatcher.submit(self.event, {'project_id': project_id, 'online': count}, f"project_{project_id}")
+        self.emitted += 1
+
+    def _emit_trailing(self, project_id: int):
+        self._trailing.pop(project_id, None)
+        task = asyncio.create_task(self._emit(project_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ttl": self.ttl,
+            "throttle_ms": self.throttle_ms,
+            "touches": self.touches,
+            "emitted": self.emitted,
+            "throttled": self.throttled,
+        }
+
+
+presence = PresenceTracker(get_presence_settings())
@@ -0,0 +1,112 @@
+import asyncio
+import json
+import logging
+from typing import Optional, Dict, Any
+
+from redis import exceptions
+
+from src.shared.config import get_room_evictions_channel
+from src.shared.db.redis_client import redis_client
+from src.shared.ws.presence import presence
+from src.shared.ws.socket import sio
+
+
+# Удаление из проекта должно сразу выводить сокеты пользователя из комнаты
+# project_{id}, а они могут быть подключены к любому воркеру. Поэтому
+# событие рассылается через Redis pub/sub, и каждый воркер выводит свои
+# сокеты: при подключении каждый сокет входит в комнату user_{id}
+class RoomEvictions:
+    event = "project_left"
+
+    def __init__(self, channel: str):
+        self.channel = channel
+        self.published = 0
+        self.received = 0
+        self.evicted = 0
+        self._listener: Optional[asyncio.Task] = None
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def user_room(user_id: int) -> str:
+        return f"user_{user_id}"
+
+    @staticmethod
+    def project_room(project_id: int) -> str:
+        return f"project_{project_id}"
+
+    async def _publish(self, project_id: int, user_id: Optional[int]):
+        try:
+            await redis_client.client.publish(self.channel, json.dumps({'project_id': project_id,
+                                                                        'user_id': user_id}))
+            self.published += 1
+        except (exceptions.ConnectionError, exceptions.TimeoutError) as e:
+            self.logger.warning(f"Не удалось разослать выход из проекта {project_id}: {e}")
+
+    async def remove_member(self, project_id: int, user_id: int):
+        await self._publish(project_id, user_id)
+        await presence.leave(user_id, project_id)
+
+    async def close_project(self, project_id: int):
+        await self._publish(project_id, None)
+
+    async def evict(self, project_id: int, user_id: Optional[int]):
+        # Выводит из комнаты проекта сокеты этого воркера: все сокеты
+        # пользователя или, без user_id, всех участников проекта
+        project_room = self.project_room(project_id)
+        room = self.user_room(user_id) if user_id is not None else project_room
+        sids = [sid for sid, _ in sio.manager.get_participants('/', room)]
+        for sid in sids:
+            await sio.leave_room(sid, project_room)
+            session_data = await sio.get_session(sid)
+            if project_id in session_data.get('projects', []):
+                session_data['projects'].remove(project_id)
+                await sio.save_session(sid, session_data)
+            await sio.emit(self.event, data={'project_id': project_id}, to=sid)
+            self.evicted += 1
+
+    async def _listen(self):
+        while True:
+            pubsub = redis_client.client.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                    if message is None:
+                        continue
+                    self.received += 1
+                    try:
+                        payload = json.loads(message["data"])
+                        await self.evict(int(payload['project_id']), payload['user_id'])
+                    except (ValueError, KeyError, TypeError):
+                        self.logger.warning(f"Некорректное сообщение о выходе из проекта: {message['data']}")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.exception(f"Подписка на выход из проектов прервана: {e}")
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+    async def start(self):
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._listener is not None,
+            "published": self.published,
+            "received": self.received,
+            "evicted": self.evicted,
+        }
+
+
+room_evictions = RoomEvictions(get_room_evictions_channel())
@@ -1,7 +1,6 @@
 import socketio
 from socketio import AsyncRedisManager
 
-from src.shared.ws.ws import SocketIOHandlers
+from src.shared.config import get_redis_url
 
-sio = socketio.AsyncServer(async_mode='asgi', cors_allowed_origins='*', logger=True, client_manager=AsyncRedisManager("redis://localhost:6379/0"))
-SocketIOHandlers(sio)
\ No newline at end of file
+sio = socketio.AsyncServer(async_mode='asgi', cors_allowed_origins='*', logger=True, client_manager=AsyncRedisManager(get_redis_url()))
@@ -1,4 +1,17 @@
 import asyncio
+import json
+from http.cookies import SimpleCookie
+
+from socketio.exceptions import ConnectionRefusedError
+
+from src.project.auth_service.jwt.jwt import decode_token
+from src.project.management_service.repositories.project_member_repository import ProjectMemberRepository
+from src.project.management_service.repositories.task_repository import TaskRepository
+from src.project.management_service.services.members_service import MemberLookup
+from src.project.management_service.services.task_service import TaskService
+from src.shared.config import async_session
+from src.shared.db.redis_client import redis_client
+from src.shared.ws.presence import presence
 
 
 class SocketIOHandlers:
@@ -7,8 +20,72 @@ class SocketIOHandlers:
         asyncio.run(self.register_handlers())
 
     async def register_handlers(self):
+        @self.sio.on('connect')
+        async def connect(sid, environ, auth=None):
+            # Подключение авторизуется cookie access_token, и сокет сразу
+            # входит во все комнаты проектов пользователя. Токен и список
+            # проектов берутся из кэшей, поэтому волна переподключений
+            # после деплоя почти не доходит до Postgres
+            cookie = SimpleCookie(environ.get('HTTP_COOKIE', ''))
+            token = cookie.get('access_token')
+            payload = await decode_token(token.value) if token else None
+            if payload is None:
+                raise ConnectionRefusedError('No authenticated')
+            user_id = int(payload['user_id'])
+            async with async_session() as session:
+                projects = await MemberLookup(ProjectMemberRepository(session)).get_project_ids(user_id)
+            await self.sio.save_session(sid, {'user_id': user_id, 'projects': list(projects)})
+            # Через комнату user_{id} сокеты пользователя находятся при
+            # удалении его из проекта (см. RoomEvictions)
+            await self.sio.enter_room(sid, room=f'user_{user_id}')
+            for project_id in projects:
+                await self.sio.enter_room(sid, room=f'project_{project_id}')
+            await presence.connect(user_id, projects)
+
+        @self.sio.on('disconnect')
+        async def disconnect(sid, *args):
+            session_data = await self.sio.get_session(sid)
+            if 'user_id' in session_data:
+                await presence.disconnect(session_data['user_id'], session_data['projects'])
+
+        @self.sio.on('heartbeat')
+        async def heartbeat(sid, data=None):
+            # Клиент шлет сигнал чаще, чем PRESENCE_TTL, иначе считается ушедшим
+            session_data = await self.sio.get_session(sid)
+            await presence.heartbeat(session_data['user_id'], session_data['projects'])
+
         @self.sio.on('enter_room')
         async def request_hello(sid, data):
+            # Комнаты проектов, в которые пользователь вступил после
+            # подключения; членство проверяется через membership_cache
+            session_data = await self.sio.get_session(sid)
+            try:
+                project_id = int(data)
+            except (TypeError, ValueError):
+                return False
+            async with async_session() as session:
+                member = await MemberLookup(ProjectMemberRepository(session)).get_member(project_id,
+                                                                                     session_data['user_id'])
+            if member is None:
+                return False
+            await self.sio.enter_room(sid, room=f'project_{project_id}')
+            if project_id not in session_data['projects']:
+                session_data['projects'].append(project_id)
+                await self.sio.save_session(sid, session_data)
+            await presence.heartbeat(session_data['user_id'], [project_id])
+            return True
+
+        @self.sio.on('resync_tasks')
+        async def resync_tasks(sid, data):
+            # Клиент заметил пропуск версии в tasks_changed: ему отдается
+            # текущая версия комнаты и первая страница задач, дальше
+            # он продолжает по next_cursor через REST
             roomname = f'project_{data}'
-            print(f'user {sid} joined to {roomname}')
-            await self.sio.enter_room(sid, room=roomname)
\ No newline at end of file
+            if roomname not in self.sio.rooms(sid):
+                return
+            version = int(await redis_client.client.get(f"task_events_version:{data}") or 0)
+            async with async_session() as session:
+                page = await TaskRepository(session).get_tasks(int(data), raw=True)
+            await self.sio.emit('tasks_resync',
+                                data={'version': version, **json.loads(TaskService.render_page(page))},
+                                to=sid)
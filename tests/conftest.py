@@ -0,0 +1,89 @@
+import os
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+# Тесты с базой идут против отдельного Postgres из TEST_DATABASE_URL,
+# без него они пропускаются. Переменные DB_* выставляются до импорта
+# приложения: config создает движок при импорте
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+# Тесты истории аналогично идут против MongoDB из TEST_MONGO_URL
+TEST_MONGO_URL = os.getenv("TEST_MONGO_URL")
+if TEST_DATABASE_URL:
+    _url = make_url(TEST_DATABASE_URL)
+    os.environ.update({
+        "DB_USER": _url.username or "",
+        "DB_PASSWORD": _url.password or "",
+        "DB_HOST": _url.host or "localhost",
+        "DB_PORT": str(_url.port or 5432),
+        "DB_NAME": _url.database or "",
+    })
+else:
+    os.environ.setdefault("DB_PORT", "5432")
+# Настройки JWT читаются при импорте модуля токенов
+for _name, _value in (("SECRET_KEY", "test-secret"),
+                      ("ALGORITHM", "HS256"),
+                      ("ACCESS_TOKEN_EXPIRE_MINUTES", "15"),
+                      ("REFRESH_TOKEN_EXPIRE_MINUTES", "1440")):
+    os.environ.setdefault(_name, _value)
+
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker  # noqa: E402
+
+from src.shared.config import Base  # noqa: E402
+from src.shared.db import models  # noqa: E402,F401
+from src.shared.db.models import User, Project, ProjectStatus  # noqa: E402
+
+
+@pytest_asyncio.fixture
+async def engine():
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL не задан")
+    engine = create_async_engine(TEST_DATABASE_URL)
+    async with engine.begin() as connection:
+        await connection.execute(text("DROP SCHEMA IF EXISTS public CASCADE"))
+        await connection.execute(text("CREATE SCHEMA public"))
+        await connection.run_sync(Base.metadata.create_all)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def session_factory(engine):
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+@pytest_asyncio.fixture
+async def session(session_factory):
+    async with session_factory() as session:
+        yield session
+
+
+@pytest_asyncio.fixture
+async def project_id(session) -> int:
+    user = User(username="owner", email="owner@example.com")
+    session.add(user)
+    await session.flush()
+    project = Project(name="project", creator_user_id=user.id, status=ProjectStatus.open)
+    session.add(project)
+    await session.commit()
+    return project.id
+
+
+@pytest_asyncio.fixture
+async def history():
+    if not TEST_MONGO_URL:
+        pytest.skip("TEST_MONGO_URL не задан")
+    from beanie import init_beanie
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    from src.project.management_service.mongo.db.models import History
+
+    client = AsyncIOMotorClient(TEST_MONGO_URL)
+    db = client["test_history"]
+    await db.drop_collection(History.Settings.name)
+    await init_beanie(database=db, document_models=[History], allow_index_dropping=True)
+    yield History.get_motor_collection()
+    await db.drop_collection(History.Settings.name)
+    client.close()
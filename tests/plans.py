@@ -0,0 +1,51 @@
+import datetime
+
+from sqlalchemy import select, text
+
+from src.shared.db.models import Project, ProjectLink, ProjectMember, Role, Task, TaskAssignee, TaskPriority, \
+    TaskStatus, User
+
+MEMBERS = 20
+TASKS = 500
+START = datetime.date(2030, 1, 1)
+
+
+async def explain(session, stmt) -> str:
+    connection = await session.connection()
+    compiled = stmt.compile(dialect=connection.dialect)
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    result = await connection.exec_driver_sql("EXPLAIN " + compiled.string, params)
+    return '\n'.join(row[0] for row in result.all())
+
+
+async def populate(session, project_id: int):
+    # Проект с участниками, задачами, исполнителями и ссылками. На
+    # таблицах такого размера seq scan дешевле любого индекса, поэтому
+    # после заполнения он выключается до конца транзакции: план
+    # показывает, может ли запрос вообще взять индекс
+    creator_id = (await session.execute(select(Project.creator_user_id).where(Project.id == project_id))).scalar_one()
+    role = Role(project_id=project_id, name="member")
+    users = [User(username=f"member{i}", email=f"member{i}@example.com") for i in range(MEMBERS)]
+    session.add(role)
+    session.add_all(users)
+    await session.flush()
+    members = [ProjectMember(user_id=user.id, project_id=project_id, role_id=role.id) for user in users]
+    tasks = [
+        Task(project_id=project_id,
+             name=f"task {i}",
+             priority=list(TaskPriority)[i % len(TaskPriority)],
+             status=TaskStatus.completed if i % 2 else TaskStatus.processing,
+             deadline=START + datetime.timedelta(days=i % 90) if i % 3 else None,
+             completed_at=START + datetime.timedelta(days=i % 28) if i % 2 else None)
+        for i in range(TASKS)
+    ]
+    session.add_all(members + tasks)
+    await session.flush()
+    session.add_all([TaskAssignee(task_id=task.id, project_member_id=members[i % MEMBERS].id)
+                     for i, task in enumerate(tasks)])
+    session.add_all([ProjectLink(link=f"code-{i}", project_id=project_id, creator_id=creator_id)
+                     for i in range(50)])
+    await session.commit()
+    for table in ("users", "roles", "project_members", "tasks", "task_assignees", "links"):
+        await session.execute(text(f"ANALYZE {table}"))
+    await session.execute(text("SET LOCAL enable_seqscan = off"))
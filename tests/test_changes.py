@@ -0,0 +1,124 @@
+import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from src.project.management_service.mongo.db.changes import FieldChange, apply_changes, diff_snapshots
+from src.project.management_service.mongo.db.models import ChangeTaskActionData, EditRoleActionData
+from src.project.management_service.services.audit_service import AuditService
+
+OLD_TASK = {
+    'name': 'задача',
+    'description': 'старое описание',
+    'priority': 'low',
+    'id': 7,
+    'status': 'processing',
+    'deadline': '1 марта, 2030',
+    'started_at': '1 января, 2030',
+    'completed_at': None,
+    'assignees_rel': [{'project_member_rel': {'user_rel': {'id': 1, 'username': 'a',
+                                                           'email': None, 'avatar_url': None}}}],
+}
+NEW_TASK = OLD_TASK | {
+    'description': 'новое описание',
+    'priority': 'high',
+    'assignees_rel': [],
+}
+
+
+def test_diff_lists_only_changed_fields():
+    changes = diff_snapshots(OLD_TASK, NEW_TASK)
+
+    assert [change.path for change in changes] == ['assignees_rel', 'description', 'priority']
+    # Списки сравниваются целиком
+    assert changes[0].old == OLD_TASK['assignees_rel'] and changes[0].new == []
+
+
+def test_identical_snapshots_have_no_changes():
+    assert diff_snapshots(OLD_TASK, dict(OLD_TASK)) == []
+
+
+@pytest.mark.parametrize('old, new', [
+    (OLD_TASK, NEW_TASK),
+    ({'a': {'b': {'c': 1, 'd': 2}}, 'e': 3}, {'a': {'b': {'c': 5, 'd': 2}}, 'e': 3}),
+    ({'a': None}, {'a': {'b': 1}}),
+    ({'a': [1, 2]}, {'a': [2, 1]}),
+])
+def test_round_trip(old, new):
+    # Снимки - дампы схем, набор ключей у них постоянный
+    changes = diff_snapshots(old, new)
+
+    assert apply_changes(old, changes) == new
+    assert apply_changes(new, changes, reverse=True) == old
+
+
+def test_nested_paths():
+    old = {'project': {'settings': {'color': 'red', 'size': 1}}, 'name': 'x'}
+    new = {'project': {'settings': {'color': 'blue', 'size': 1}}, 'name': 'x'}
+
+    changes = diff_snapshots(old, new)
+
+    assert changes == [FieldChange(path='project.settings.color', old='red', new='blue')]
+    assert apply_changes(old, changes) == new
+
+
+def test_apply_does_not_mutate_snapshot():
+    old = {'a': {'b': [1]}}
+    changes = [FieldChange(path='a.b', old=[1], new=[2])]
+
+    apply_changes(old, changes)
+
+    assert old == {'a': {'b': [1]}}
+
+
+def test_legacy_task_document_gets_changes():
+    action = ChangeTaskActionData.model_validate({
+        'action_type': 'change_task',
+        'old_data': OLD_TASK,
+        'new_data': NEW_TASK,
+    })
+
+    assert action.task_id is None
+    assert action.reconstruct(OLD_TASK) == NEW_TASK
+    assert action.reconstruct(NEW_TASK, reverse=True) == OLD_TASK
+
+
+def test_legacy_role_document_gets_changes():
+    action = EditRoleActionData.model_validate({
+        'action_type': 'edit_role',
+        'role_id': 3,
+        'old_data': {'name': 'role', 'priority': 1, 'permissions': 0},
+        'new_data': {'name': 'role', 'priority': 2, 'permissions': 5},
+    })
+
+    assert {change.path for change in action.changes} == {'priority', 'permissions'}
+
+
+def test_legacy_identical_document_is_rejected():
+    with pytest.raises(ValueError):
+        EditRoleActionData.model_validate({
+            'action_type': 'edit_role',
+            'role_id': 3,
+            'old_data': {'name': 'role', 'priority': 1, 'permissions': 0},
+            'new_data': {'name': 'role', 'priority': 1, 'permissions': 0},
+        })
+
+
+def test_walk_back_reconstructs_every_version():
+    versions = [
+        {'name': 'role', 'priority': 1, 'permissions': 0},
+        {'name': 'role', 'priority': 2, 'permissions': 0},
+        {'name': 'admin', 'priority': 2, 'permissions': 255},
+    ]
+    # Одно событие старого формата, остальные - только changes
+    actions = [
+        EditRoleActionData.model_validate({'role_id': 3, 'old_data': versions[0], 'new_data': versions[1]}),
+        EditRoleActionData.from_snapshots(versions[1], versions[2], role_id=3),
+    ]
+    records = [SimpleNamespace(id=n, created_at=datetime.datetime(2030, 1, n + 1), user=None, action=action)
+               for n, action in enumerate(actions)]
+
+    walked = AuditService.walk_back(versions[-1], list(reversed(records)))
+
+    assert [version['after'] for version in walked] == [versions[2], versions[1]]
+    assert [version['before'] for version in walked] == [versions[1], versions[0]]
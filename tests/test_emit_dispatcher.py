@@ -0,0 +1,83 @@
+import pytest
+from redis import exceptions
+
+from src.shared.ws import dispatcher as dispatcher_module
+from src.shared.ws.dispatcher import EmitDispatcher
+
+VERSION_KEY = "task_events_version:1"
+
+
+class FakeRedis:
+    def __init__(self, failures: int = 0):
+        self.values = {}
+        self.failures = failures
+
+    async def incrby(self, key, amount=1):
+        if self.failures:
+            self.failures -= 1
+            raise exceptions.ConnectionError("redis недоступен")
+        self.values[key] = self.values.get(key, 0) + amount
+        return self.values[key]
+
+
+class FakeSio:
+    def __init__(self):
+        self.sent = []
+
+    async def emit(self, event, data=None, to=None):
+        if data.get("broken"):
+            raise TypeError("несериализуемые данные")
+        self.sent.append(data)
+
+
+@pytest.fixture
+def sio(monkeypatch):
+    fake = FakeSio()
+    monkeypatch.setattr(dispatcher_module, "sio", fake)
+    return fake
+
+
+def make_dispatcher(max_size: int = 10) -> EmitDispatcher:
+    return EmitDispatcher({"retries": 0, "retry_delay": 0, "drain_timeout": 1, "max_size": max_size})
+
+
+def versions(sio: FakeSio):
+    return [data["version"] for data in sio.sent]
+
+
+@pytest.mark.asyncio
+async def test_dropped_message_leaves_version_gap(monkeypatch, sio):
+    monkeypatch.setattr(dispatcher_module.redis_client, "client", FakeRedis())
+    dispatcher = make_dispatcher(max_size=2)
+    for i in range(3):
+        dispatcher.submit("tasks_changed", {"n": i}, "project_1", VERSION_KEY)
+    await dispatcher._drain()
+
+    assert [data["n"] for data in sio.sent] == [1, 2]
+    assert versions(sio) == [2, 3]
+    assert dispatcher.stats()["skipped_versions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_message_failed_before_version_leaves_gap(monkeypatch, sio):
+    monkeypatch.setattr(dispatcher_module.redis_client, "client", FakeRedis(failures=1))
+    dispatcher = make_dispatcher()
+    dispatcher.submit("tasks_changed", {"n": 0}, "project_1", VERSION_KEY)
+    dispatcher.submit("tasks_changed", {"n": 1}, "project_1", VERSION_KEY)
+    await dispatcher._drain()
+
+    assert versions(sio) == [2]
+    assert dispatcher.stats()["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_message_failed_after_version_leaves_gap(monkeypatch, sio):
+    monkeypatch.setattr(dispatcher_module.redis_client, "client", FakeRedis())
+    dispatcher = make_dispatcher()
+    dispatcher.submit("tasks_changed", {"broken": True}, "project_1", VERSION_KEY)
+    dispatcher.submit("tasks_changed", {"n": 1}, "project_1", VERSION_KEY)
+    await dispatcher._drain()
+
+    # Номер 1 уже выдан упавшему сообщению, второй перепрыгивать не нужно
+    assert versions(sio) == [2]
+    assert dispatcher.stats()["skipped_versions"] == 0
@@ -0,0 +1,46 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.project.auth_service.oauth.github import SharedTransport
+
+
+async def serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    # Минимальный HTTP/1.1 сервер с keep-alive: отвечает на каждый запрос
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            if not head:
+                break
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\nContent-Type: text/plain\r\n\r\nok")
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        pass
+    finally:
+        writer.close()
+
+
+@pytest.mark.asyncio
+async def test_shared_transport_survives_client_context():
+    connections = []
+
+    async def handler(reader, writer):
+        connections.append(writer)
+        await serve(reader, writer)
+
+    server = await asyncio.start_server(handler, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    transport = SharedTransport()
+    try:
+        # Как authlib: отдельный клиент и async with на каждый OAuth-запрос
+        for _ in range(2):
+            async with httpx.AsyncClient(transport=transport) as client:
+                response = await client.get(f"http://127.0.0.1:{port}/login/oauth/access_token")
+            assert response.text == "ok"
+        # Второй запрос ушел по тому же keep-alive соединению из пула
+        assert len(connections) == 1
+    finally:
+        await transport.shutdown()
+        server.close()
+        await server.wait_closed()
@@ -0,0 +1,141 @@
+import datetime
+import json
+import tracemalloc
+
+import pytest
+from bson import ObjectId
+
+from src.project.management_service.mongo.db.models import History
+from src.project.management_service.mongo.repositories import mongo_repositroy
+from src.project.management_service.mongo.repositories.mongo_repositroy import MongoRepository
+from src.project.management_service.services.audit_service import AuditService
+
+EVENTS = 100_000
+BATCH_SIZE = 500
+
+
+def make_event(project_id: int, created_at: datetime.datetime, n: int) -> dict:
+    return {
+        '_id': ObjectId(),
+        'project_id': project_id,
+        'created_at': created_at,
+        'user': {'id': n % 50, 'username': f'user{n % 50}', 'email': None, 'avatar_url': None},
+        'action': {'action_type': 'link_generate', 'timestamp': created_at, 'link': f'code{n:08d}'},
+    }
+
+
+@pytest.mark.asyncio
+async def test_export_memory_is_flat(history, monkeypatch):
+    # Пиковая память на пачку не должна расти вместе с размером истории
+    started = datetime.datetime.now() - datetime.timedelta(hours=1)
+    for offset in range(0, EVENTS, 5000):
+        await history.insert_many([make_event(1, started + datetime.timedelta(milliseconds=n), n)
+                                   for n in range(offset, offset + 5000)])
+    monkeypatch.setattr(AuditService, 'export_settings', {'batch_size': BATCH_SIZE,
+                                                          'poll_interval': 1,
+                                                          'tail_window': 30})
+    service = AuditService(MongoRepository(), outbox=None, redis=None)
+
+    lines = 0
+    peaks = []
+    currents = []
+    tracemalloc.start()
+    try:
+        async for chunk in service.export_history(1):
+            lines += chunk.count(b'\n')
+            current, peak = tracemalloc.get_traced_memory()
+            currents.append(current)
+            peaks.append(peak)
+            tracemalloc.reset_peak()
+    finally:
+        tracemalloc.stop()
+
+    assert lines == EVENTS
+    assert len(peaks) == EVENTS // BATCH_SIZE
+    # Первые пачки включают прогрев курсора, поэтому сравнение идет с ними
+    assert max(peaks[10:]) <= 2 * max(peaks[:10])
+    assert currents[-1] - currents[9] < 1024 * 1024
+
+
+@pytest.mark.asyncio
+async def test_export_is_ordered_ndjson(history, monkeypatch):
+    started = datetime.datetime.now() - datetime.timedelta(hours=1)
+    await history.insert_many([make_event(1, started + datetime.timedelta(seconds=n), n) for n in range(7)]
+                              + [make_event(2, started, 0)])
+    monkeypatch.setattr(AuditService, 'export_settings', {'batch_size': 3,
+                                                          'poll_interval': 1,
+                                                          'tail_window': 30})
+    service = AuditService(MongoRepository(), outbox=None, redis=None)
+
+    chunks = [chunk async for chunk in service.export_history(1)]
+
+    assert [chunk.count(b'\n') for chunk in chunks] == [3, 3, 1]
+    documents = [json.loads(line) for line in b''.join(chunks).splitlines()]
+    assert [document['action']['link'] for document in documents] == [f'code{n:08d}' for n in range(7)]
+
+
+class PollStopped(Exception):
+    pass
+
+
+class FakeCursor:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def sort(self, *args):
+        return self
+
+    def batch_size(self, *args):
+        return self
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for document in sorted(self.documents, key=lambda document: (document['created_at'], document['_id'])):
+            yield document
+
+
+class FakeCollection:
+    def __init__(self):
+        self.documents = []
+
+    def find(self, query):
+        since = query['created_at']['$gte']
+        return FakeCursor([document for document in self.documents
+                           if document['project_id'] == query['project_id'] and document['created_at'] >= since])
+
+
+@pytest.mark.asyncio
+async def test_poll_dedupes_within_window(monkeypatch):
+    collection = FakeCollection()
+    monkeypatch.setattr(History, 'get_motor_collection', classmethod(lambda cls: collection))
+    now = datetime.datetime.now()
+    old = make_event(1, now - datetime.timedelta(seconds=5), 0)
+    collection.documents.append(old)
+
+    # Между опросами в коллекцию доезжают события: одно свежее, одно
+    # записанное в outbox раньше, но попавшее в MongoDB с опозданием,
+    # одно старше окна и одно чужого проекта
+    arrivals = [
+        [make_event(1, now, 1), make_event(1, now - datetime.timedelta(seconds=10), 2)],
+        [make_event(1, now - datetime.timedelta(seconds=60), 3), make_event(2, now, 4)],
+        [],
+    ]
+
+    async def fake_sleep(delay):
+        if not arrivals:
+            raise PollStopped
+        collection.documents.extend(arrivals.pop(0))
+
+    monkeypatch.setattr(mongo_repositroy.asyncio, 'sleep', fake_sleep)
+
+    received = []
+    try:
+        async for document in MongoRepository.poll(1, batch_size=10, poll_interval=1, window=30):
+            received.append(document['action']['link'])
+    except PollStopped:
+        pass
+
+    # Первый проход молчит, повторные опросы не отдают событие дважды
+    assert received == ['code00000002', 'code00000001']
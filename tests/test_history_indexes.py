@@ -0,0 +1,79 @@
+import datetime
+
+import pytest
+import pytest_asyncio
+from bson import ObjectId
+
+from src.project.management_service.mongo.repositories.mongo_repositroy import MongoRepository
+from src.shared.schemas.FilterSchemas import ActionType, HistoryFilter
+
+PROJECTS = 20
+EVENTS_PER_PROJECT = 1000
+ACTION_TYPES = [action.value for action in ActionType]
+HISTORY_INDEXES = {'project_created_at', 'project_user_timestamp', 'project_action_type_timestamp'}
+
+
+def stages(plan: dict):
+    yield plan
+    for key in ('inputStage', 'queryPlan'):
+        if key in plan:
+            yield from stages(plan[key])
+    for child in plan.get('inputStages', []):
+        yield from stages(child)
+
+
+async def winning_plan(collection, filters: HistoryFilter) -> list[dict]:
+    query = MongoRepository.filters_query(1, filters)
+    cursor = (collection.find(query)
+              .sort(MongoRepository.page_sort(filters.sort_dir))
+              .limit(filters.limit + 1))
+    explain = await cursor.explain()
+    return list(stages(explain['queryPlanner']['winningPlan']))
+
+
+def history_filter(**fields) -> HistoryFilter:
+    return HistoryFilter(**({'fields': None, 'action_type': []} | fields))
+
+
+@pytest_asyncio.fixture
+async def filled(history):
+    # Пользователь 999 и тип user_joined редкие: по ним выборочный
+    # индекс выгоднее, чем обход project_created_at с фильтрацией
+    started = datetime.datetime.now() - datetime.timedelta(days=1)
+    documents = []
+    for project_id in range(1, PROJECTS + 1):
+        for n in range(EVENTS_PER_PROJECT):
+            created_at = started + datetime.timedelta(seconds=n * 60)
+            rare = n % 100 == 0
+            documents.append({
+                '_id': ObjectId(),
+                'project_id': project_id,
+                'created_at': created_at,
+                'user': {'id': 999 if rare else n % 10, 'username': 'user', 'email': None, 'avatar_url': None},
+                'action': {'action_type': 'user_joined' if rare else ACTION_TYPES[n % 8],
+                           'timestamp': created_at},
+            })
+    await history.insert_many(documents)
+    return history
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('fields, index', [
+    ({}, 'project_created_at'),
+    ({'from_user': 999}, 'project_user_timestamp'),
+    ({'action_type': [ActionType.user_joined]}, 'project_action_type_timestamp'),
+])
+async def test_filters_use_index(filled, fields, index):
+    plan = await winning_plan(filled, history_filter(**fields))
+
+    assert all(stage['stage'] != 'COLLSCAN' for stage in plan)
+    assert index in {stage.get('indexName') for stage in plan if stage['stage'] == 'IXSCAN'}
+
+
+@pytest.mark.asyncio
+async def test_time_range_uses_index(filled):
+    today = datetime.date.today()
+    plan = await winning_plan(filled, history_filter(time_interval_start=today, time_interval_end=today))
+
+    assert all(stage['stage'] != 'COLLSCAN' for stage in plan)
+    assert {stage.get('indexName') for stage in plan if stage['stage'] == 'IXSCAN'} & HISTORY_INDEXES
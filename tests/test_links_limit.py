@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select, text, update
+from sqlalchemy.exc import IntegrityError
+
+from src.shared.db.errors import sqlstate, CHECK_VIOLATION
+from src.shared.db.models import ProjectLink, ProjectCounter, Project
+from src.shared.db.triggers import TriggersManager
+
+MAX_LINKS = 100
+
+
+@pytest.mark.asyncio
+async def test_parallel_link_inserts_never_exceed_limit(session, session_factory, project_id):
+    for sql in (TriggersManager.get_links_limit_on_counter_function(),
+                TriggersManager.get_links_limit_trigger(),
+                TriggersManager.get_link_counters_on_update_function(),
+                TriggersManager.get_link_counters_on_update_trigger()):
+        await session.execute(text(sql))
+    creator_id = (await session.execute(select(Project.creator_user_id).where(Project.id == project_id))).scalar_one()
+    # До лимита остается несколько мест, вставок заметно больше
+    session.add(ProjectCounter(project_id=project_id, active_links=MAX_LINKS - 5))
+    await session.commit()
+
+    async def create_link(number: int) -> bool:
+        async with session_factory() as worker:
+            worker.add(ProjectLink(link=f"link-{number}", project_id=project_id, creator_id=creator_id))
+            try:
+                await worker.commit()
+                return True
+            except IntegrityError as e:
+                # Роутер отвечает 409 только на этот код
+                assert sqlstate(e) == CHECK_VIOLATION
+                await worker.rollback()
+                return False
+
+    results = await asyncio.gather(*(create_link(number) for number in range(30)))
+
+    assert sum(results) == 5
+    active_links = (await session.execute(
+        select(ProjectCounter.active_links).where(ProjectCounter.project_id == project_id)
+    )).scalar_one()
+    assert active_links == MAX_LINKS
+
+    # Деактивация освобождает место под новую ссылку
+    created = [number for number, ok in enumerate(results) if ok]
+    await session.execute(update(ProjectLink)
+                          .where(ProjectLink.link == f"link-{created[0]}")
+                          .values(is_active=False))
+    await session.commit()
+    assert await create_link(100)
@@ -0,0 +1,25 @@
+import pytest
+from sqlalchemy import select
+
+from src.project.management_service.repositories.project_repository import ProjectRepository
+from src.shared.db.models import Project, ProjectCounter, ProjectMember, Role
+
+
+@pytest.mark.asyncio
+async def test_projects_without_counters_are_listed(session, project_id):
+    creator_id = (await session.execute(select(Project.creator_user_id).where(Project.id == project_id))).scalar_one()
+    role = Role(project_id=project_id, name="owner", priority=10)
+    session.add(role)
+    await session.flush()
+    session.add(ProjectMember(user_id=creator_id, project_id=project_id, role_id=role.id))
+    await session.commit()
+    repository = ProjectRepository(session)
+
+    # Без триггеров строки project_counters нет
+    rows = await repository.get_projects_by_user_id(creator_id)
+    assert [(row[0].project_id, row.member_count) for row in rows] == [(project_id, 0)]
+
+    session.add(ProjectCounter(project_id=project_id, members_count=1))
+    await session.commit()
+    rows = await repository.get_projects_by_user_id(creator_id)
+    assert [row.member_count for row in rows] == [1]
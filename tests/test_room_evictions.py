@@ -0,0 +1,69 @@
+import pytest
+
+from src.shared.ws import rooms
+from src.shared.ws.rooms import RoomEvictions
+
+
+class FakeManager:
+    def __init__(self, sio):
+        self.sio = sio
+
+    def get_participants(self, namespace, room):
+        for sid, sid_rooms in self.sio.rooms_by_sid.items():
+            if room in sid_rooms:
+                yield sid, f"eio_{sid}"
+
+
+class FakeSio:
+    def __init__(self):
+        self.rooms_by_sid = {}
+        self.sessions = {}
+        self.emitted = []
+        self.manager = FakeManager(self)
+
+    def connect(self, sid, user_id, projects):
+        self.rooms_by_sid[sid] = {f"user_{user_id}"} | {f"project_{project_id}" for project_id in projects}
+        self.sessions[sid] = {'user_id': user_id, 'projects': list(projects)}
+
+    async def leave_room(self, sid, room):
+        self.rooms_by_sid[sid].discard(room)
+
+    async def get_session(self, sid):
+        return self.sessions[sid]
+
+    async def save_session(self, sid, session):
+        self.sessions[sid] = session
+
+    async def emit(self, event, data=None, to=None):
+        self.emitted.append((event, data, to))
+
+
+@pytest.fixture
+def sio(monkeypatch):
+    fake = FakeSio()
+    monkeypatch.setattr(rooms, "sio", fake)
+    return fake
+
+
+@pytest.mark.asyncio
+async def test_evict_member_leaves_only_their_sockets(sio):
+    sio.connect("a1", user_id=1, projects=[10, 20])
+    sio.connect("a2", user_id=1, projects=[10])
+    sio.connect("b1", user_id=2, projects=[10])
+
+    await RoomEvictions("channel").evict(10, 1)
+
+    assert sio.rooms_by_sid == {"a1": {"user_1", "project_20"}, "a2": {"user_1"}, "b1": {"user_2", "project_10"}}
+    assert sio.sessions["a1"]["projects"] == [20]
+    assert {to for _, _, to in sio.emitted} == {"a1", "a2"}
+
+
+@pytest.mark.asyncio
+async def test_evict_project_leaves_all_sockets(sio):
+    sio.connect("a1", user_id=1, projects=[10, 20])
+    sio.connect("b1", user_id=2, projects=[10])
+
+    await RoomEvictions("channel").evict(10, None)
+
+    assert sio.rooms_by_sid == {"a1": {"user_1", "project_20"}, "b1": {"user_2"}}
+    assert sio.sessions["b1"]["projects"] == []
@@ -0,0 +1,31 @@
+import datetime
+
+import pytest
+
+from src.project.statistics_service.repositories.statistic_repository import StatisticRepository
+from tests.plans import START, explain, populate
+
+
+@pytest.mark.asyncio
+async def test_current_month_stat_uses_completed_at_index(session, project_id):
+    await populate(session, project_id)
+
+    plan = await explain(session, StatisticRepository.current_month_stmt(
+        project_id, START, START + datetime.timedelta(days=30)
+    ))
+    assert "Seq Scan on tasks" not in plan
+    assert "ix_tasks_project_completed_at" in plan
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("stmt", [
+    lambda project_id: StatisticRepository.all_stmt(project_id),
+    lambda project_id: StatisticRepository.day_limit_stmt(project_id, START, START + datetime.timedelta(days=30)),
+    lambda project_id: StatisticRepository.avg_completed_stmt(project_id),
+], ids=["all", "day_limit", "avg_completed"])
+async def test_member_stats_use_indexes(session, project_id, stmt):
+    await populate(session, project_id)
+
+    plan = await explain(session, stmt(project_id))
+    assert "Seq Scan" not in plan
+    assert "ix_project_members_project_id" in plan
@@ -0,0 +1,115 @@
+import datetime
+import json
+
+import pytest
+from babel.dates import format_date
+from pydantic import TypeAdapter
+
+from src.project.management_service.repositories.project_repository import ProjectRepository
+from src.project.management_service.repositories.role_repository import RoleRepository
+from src.project.management_service.repositories.task_repository import TaskRepository
+from src.project.management_service.services.task_service import TaskService
+from src.shared.db.models import Permission, ProjectMember, Role, Task, TaskPriority, TaskStatus, User
+from src.shared.schemas.Project_schemas import ProjectMemberSchemaExtend
+from src.shared.schemas.Role_schemas import RoleSchemaWithId
+from src.shared.schemas.Task_schemas import TaskPage
+
+
+def canonical(content) -> bytes:
+    # Postgres ставит пробелы вокруг ':' в json_build_object, поэтому
+    # оба ответа приводятся к одной записи с сохранением порядка ключей
+    return json.dumps(json.loads(content), ensure_ascii=False, separators=(',', ':')).encode()
+
+
+@pytest.mark.asyncio
+async def test_raw_documents_match_schema_serialization(session, project_id):
+    tasks = []
+    for month in range(1, 13):
+        completed = month % 2 == 0
+        tasks.append(Task(project_id=project_id,
+                          name=f"task {month}",
+                          description="описание",
+                          priority=list(TaskPriority)[month % 3],
+                          status=TaskStatus.completed if completed else TaskStatus.processing,
+                          deadline=datetime.date(2030, month, 28),
+                          completed_at=datetime.date(2029, month, 1) if completed else None))
+    # 'Y' у babel - год по ISO-неделям: на границах года он отличается
+    # от календарного, и SQL-путь должен повторять это поведение
+    tasks.append(Task(project_id=project_id, name="iso start", description="", priority=TaskPriority.low,
+                      deadline=datetime.date(2027, 1, 1), completed_at=datetime.date(2029, 12, 31),
+                      status=TaskStatus.completed))
+    session.add_all(tasks)
+    await session.commit()
+    repository = TaskRepository(session)
+
+    page = await repository.get_tasks(project_id, limit=50)
+    schema_json = TaskPage.model_validate({
+        'tasks': page['tasks'],
+        'next_cursor': page['next_cursor'],
+        'prev_cursor': page['prev_cursor'],
+    }).model_dump_json()
+    raw_json = TaskService.render_page(await repository.get_tasks(project_id, limit=50, raw=True))
+
+    assert canonical(raw_json) == canonical(schema_json)
+
+
+def test_babel_format_is_iso_week_year():
+    # Контроль допущения, на котором построен ru_date
+    assert format_date(datetime.date(2027, 1, 1), format='d MMMM, Y', locale='ru') == '1 января, 2026'
+
+
+def assert_same_documents(raw_json, schema_json):
+    # Поле за полем и в том же порядке ключей, что у pydantic
+    raw = json.loads(raw_json)
+    expected = json.loads(schema_json)
+    assert len(raw) == len(expected)
+    for raw_item, expected_item in zip(raw, expected):
+        assert list(raw_item) == list(expected_item)
+        for field, value in expected_item.items():
+            if isinstance(value, dict):
+                assert list(raw_item[field]) == list(value)
+            assert raw_item[field] == value, field
+
+
+@pytest.fixture
+def roles_data():
+    # Все сочетания прав встречаются хотя бы раз, приоритеты различны:
+    # иначе порядок ролей с равным приоритетом не определен
+    return [
+        {'name': f"роль {i}", 'priority': i + 1,
+         **{permission.name: bool((i * 37) & permission) for permission in Permission}}
+        for i in range(10)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_raw_roles_match_schema_serialization(session, project_id, roles_data):
+    session.add_all([Role(project_id=project_id, **role) for role in roles_data])
+    await session.commit()
+    repository = RoleRepository(session)
+
+    schema_json = TypeAdapter(list[RoleSchemaWithId]).dump_json(
+        [RoleSchemaWithId.model_validate(role) for role in await repository.get_roles(project_id)]
+    )
+    assert_same_documents(await repository.get_roles_json(project_id), schema_json)
+
+
+@pytest.mark.asyncio
+async def test_raw_members_match_schema_serialization(session, project_id, roles_data):
+    roles = [Role(project_id=project_id, **role) for role in roles_data[:3]]
+    # Пустые email и avatar_url и не-ASCII имена должны совпасть буквально
+    users = [User(username="участник", email=None, avatar_url=None),
+             User(username="member", email="member@example.com", avatar_url="https://example.com/a.png"),
+             User(username='quote"name', email="q@example.com", avatar_url=None)]
+    session.add_all(roles + users)
+    await session.flush()
+    session.add_all([ProjectMember(user_id=user.id, project_id=project_id, role_id=roles[i].id)
+                     for i, user in enumerate(users)])
+    await session.commit()
+    repository = ProjectRepository(session)
+
+    members = sorted(await repository.get_members(project_id), key=lambda member: member.id)
+    schema_json = TypeAdapter(list[ProjectMemberSchemaExtend]).dump_json(
+        [ProjectMemberSchemaExtend.model_validate(member) for member in members]
+    )
+    assert_same_documents(await repository.get_members_json(project_id), schema_json)
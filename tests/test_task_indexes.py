@@ -0,0 +1,65 @@
+import datetime
+
+import pytest
+
+from src.project.management_service.repositories.link_repository import LinkRepository
+from src.project.management_service.repositories.task_repository import TaskRepository
+from src.shared.schemas.FilterSchemas import SortDirection, SortField, TaskFilter
+from tests.plans import explain, populate
+
+SORT_INDEXES = {
+    SortField.CREATED: "ix_tasks_project_started_at_id",
+    SortField.DEADLINE: "ix_tasks_project_deadline_id",
+    SortField.PRIORITY: "ix_tasks_project_priority_id",
+    SortField.STATUS: "ix_tasks_project_status_id",
+}
+
+
+async def page_plan(session, repository: TaskRepository, stmt, sort_by, sort_dir, with_cursor: bool) -> str:
+    cursor = None
+    if with_cursor:
+        # Курсор берется с настоящей первой страницы, чтобы план строился
+        # и для keyset-условия
+        cursor = (await repository._get_page(stmt, sort_by, sort_dir, None, 20))['next_cursor']
+        assert cursor is not None
+    page_stmt, _ = repository.page_stmt(stmt, sort_by, sort_dir, cursor, 20)
+    return await explain(session, page_stmt)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("raw", [False, True])
+@pytest.mark.parametrize("with_cursor", [False, True])
+async def test_get_tasks_uses_keyset_index(session, project_id, raw, with_cursor):
+    await populate(session, project_id)
+    repository = TaskRepository(session)
+
+    plan = await page_plan(session, repository, repository.tasks_stmt(project_id, raw=raw),
+                           SortField.CREATED, SortDirection.DESC, with_cursor)
+    assert "Seq Scan" not in plan
+    assert SORT_INDEXES[SortField.CREATED] in plan
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort_by", list(SORT_INDEXES))
+@pytest.mark.parametrize("sort_dir", list(SortDirection))
+@pytest.mark.parametrize("with_cursor", [False, True])
+async def test_filtered_tasks_use_sort_index(session, project_id, sort_by, sort_dir, with_cursor):
+    await populate(session, project_id)
+    repository = TaskRepository(session)
+    filters = TaskFilter(sort_by=sort_by, sort_dir=sort_dir)
+
+    plan = await page_plan(session, repository, repository.tasks_stmt(project_id, filters),
+                           sort_by, sort_dir, with_cursor)
+    assert "Seq Scan" not in plan
+    assert SORT_INDEXES[sort_by] in plan
+    # Страница читается из индекса в нужном порядке, без отдельной сортировки
+    assert "Sort Key" not in plan
+
+
+@pytest.mark.asyncio
+async def test_get_by_code_uses_link_index(session, project_id):
+    await populate(session, project_id)
+
+    plan = await explain(session, LinkRepository.by_code_stmt("code-7", datetime.datetime.now()))
+    assert "Seq Scan" not in plan
+    assert "ix_links_link" in plan
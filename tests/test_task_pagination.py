@@ -0,0 +1,63 @@
+import datetime
+
+import pytest
+
+from src.project.management_service.repositories.task_repository import TaskRepository
+from src.shared.db.models import Task, TaskPriority
+from src.shared.schemas.FilterSchemas import SortField, SortDirection
+
+DEADLINES = [
+    datetime.date(2030, 1, 1),
+    None,
+    datetime.date(2030, 3, 1),
+    None,
+    datetime.date(2030, 2, 1),
+    None,
+    None,
+]
+
+
+async def collect(repository: TaskRepository, project_id: int, sort_dir: SortDirection, limit: int) -> list[int]:
+    stmt = repository._select_tasks().where(Task.project_id == project_id)
+    ids = []
+    cursor = None
+    for _ in range(len(DEADLINES) + 1):
+        page = await repository._get_page(stmt, SortField.DEADLINE, sort_dir, cursor, limit)
+        ids += [task['id'] for task in page['tasks']]
+        cursor = page['next_cursor']
+        if cursor is None:
+            return ids
+    pytest.fail("next_cursor не заканчивается")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort_dir", [SortDirection.ASC, SortDirection.DESC])
+@pytest.mark.parametrize("limit", [1, 2, 3])
+async def test_deadline_pages_cross_null_deadlines(session, project_id, sort_dir, limit):
+    tasks = [Task(project_id=project_id, name=f"task {i}", priority=TaskPriority.low, deadline=deadline)
+             for i, deadline in enumerate(DEADLINES)]
+    session.add_all(tasks)
+    await session.commit()
+
+    # Пустой дедлайн сортируется как infinity, то есть после любых дат
+    expected = sorted(tasks, key=lambda task: (task.deadline or datetime.date.max, task.id))
+    if sort_dir == SortDirection.DESC:
+        expected.reverse()
+
+    ids = await collect(TaskRepository(session), project_id, sort_dir, limit)
+    assert ids == [task.id for task in expected]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("sort_dir", [SortDirection.ASC, SortDirection.DESC])
+async def test_deadline_prev_cursor_returns_previous_page(session, project_id, sort_dir):
+    session.add_all([Task(project_id=project_id, name=f"task {i}", priority=TaskPriority.low, deadline=deadline)
+                     for i, deadline in enumerate(DEADLINES)])
+    await session.commit()
+    repository = TaskRepository(session)
+    stmt = repository._select_tasks().where(Task.project_id == project_id)
+
+    first = await repository._get_page(stmt, SortField.DEADLINE, sort_dir, None, 3)
+    second = await repository._get_page(stmt, SortField.DEADLINE, sort_dir, first['next_cursor'], 3)
+    back = await repository._get_page(stmt, SortField.DEADLINE, sort_dir, second['prev_cursor'], 3)
+    assert [task['id'] for task in back['tasks']] == [task['id'] for task in first['tasks']]
@@ -0,0 +1,91 @@
+import datetime
+import time
+
+import pytest
+from sqlalchemy import desc, select
+from sqlalchemy.orm import selectinload
+
+from src.project.management_service.repositories.task_repository import TaskRepository
+from src.shared.db.models import ProjectMember, Role, Task, TaskAssignee, TaskPriority, TaskStatus, User
+from src.shared.schemas.Task_schemas import TaskGetSchema
+
+ROUNDS = 5
+MEMBERS = 10
+
+
+async def populate(session, project_id: int, count: int):
+    role = Role(project_id=project_id, name="member")
+    users = [User(username=f"member{i}", email=None if i % 3 else f"m{i}@example.com") for i in range(MEMBERS)]
+    session.add_all([role, *users])
+    await session.flush()
+    members = [ProjectMember(user_id=user.id, project_id=project_id, role_id=role.id) for user in users]
+    tasks = [Task(project_id=project_id,
+                  name=f"task {i}",
+                  description="описание",
+                  priority=list(TaskPriority)[i % len(TaskPriority)],
+                  status=TaskStatus.completed if i % 2 else TaskStatus.processing,
+                  deadline=datetime.date(2030, 1, 1) + datetime.timedelta(days=i % 365),
+                  completed_at=datetime.date(2029, 6, 1) if i % 2 else None)
+             for i in range(count)]
+    session.add_all(members + tasks)
+    await session.flush()
+    # От нуля до трех исполнителей на задачу
+    session.add_all([TaskAssignee(task_id=task.id, project_member_id=members[(i + k) % MEMBERS].id)
+                     for i, task in enumerate(tasks) for k in range(i % 4)])
+    await session.commit()
+
+
+async def select_single(session, project_id: int, count: int) -> list[dict]:
+    repository = TaskRepository(session)
+    stmt = (repository._select_tasks()
+            .where(Task.project_id == project_id)
+            .order_by(desc(Task.started_at), desc(Task.id))
+            .limit(count))
+    res = await session.execute(stmt)
+    return [TaskGetSchema.model_validate(dict(row)).model_dump() for row in res.mappings().all()]
+
+
+async def select_two_queries(session, project_id: int, count: int) -> list[dict]:
+    # Прежний путь: задачи и исполнители отдельным selectinload
+    stmt = (select(Task)
+            .where(Task.project_id == project_id)
+            .order_by(desc(Task.started_at), desc(Task.id))
+            .limit(count)
+            .options(selectinload(Task.assignees_rel)
+                     .selectinload(TaskAssignee.project_member_rel)
+                     .selectinload(ProjectMember.user_rel)))
+    res = await session.execute(stmt)
+    tasks = [TaskGetSchema.model_validate(task).model_dump() for task in res.scalars().all()]
+    session.expunge_all()
+    return tasks
+
+
+def normalized(tasks: list[dict]) -> list[dict]:
+    # selectinload не упорядочивает исполнителей
+    return [task | {'assignees_rel': sorted(task['assignees_rel'],
+                                            key=lambda assignee: assignee['project_member_rel']['user_rel']['id'])}
+            for task in tasks]
+
+
+async def timed(session_factory, select_tasks, project_id: int, count: int) -> tuple[float, list[dict]]:
+    best = float('inf')
+    result = []
+    for _ in range(ROUNDS):
+        async with session_factory() as session:
+            started = time.perf_counter()
+            result = await select_tasks(session, project_id, count)
+            best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("count", [20, 100, 1000])
+async def test_single_statement_matches_selectinload(session, session_factory, project_id, count):
+    await populate(session, project_id, count)
+
+    single_time, single = await timed(session_factory, select_single, project_id, count)
+    two_time, two = await timed(session_factory, select_two_queries, project_id, count)
+    print(f"{count} задач: один запрос {single_time * 1000:.2f} мс, selectinload {two_time * 1000:.2f} мс")
+
+    assert len(single) == count
+    assert normalized(single) == normalized(two)
@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+import pytest
+from jose import jwt
+
+from src.project.auth_service.jwt.jwt import auth_settings, create_token, decode_token, verified_tokens
+
+ROUNDS = 2000
+
+
+def encode(payload: dict) -> str:
+    return jwt.encode(payload, auth_settings.secret_key, algorithm=auth_settings.algorithm)
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    verified_tokens.clear()
+    yield
+    verified_tokens.clear()
+
+
+async def measure(token: str, cached: bool) -> float:
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        if not cached:
+            verified_tokens.clear()
+        assert await decode_token(token) is not None
+    return (time.perf_counter() - started) / ROUNDS
+
+
+@pytest.mark.asyncio
+async def test_cached_verification_is_faster():
+    token = (await create_token({'user_id': 1}))['token']
+    uncached = await measure(token, cached=False)
+    cached = await measure(token, cached=True)
+    print(f"decode_token: без кэша {uncached * 1e6:.1f} мкс, из кэша {cached * 1e6:.1f} мкс")
+    # Из кэша остаются sha256 и поиск в словаре против проверки подписи
+    # и разбора JSON
+    assert cached * 3 < uncached
+
+
+@pytest.mark.asyncio
+async def test_cached_payload_is_a_copy():
+    token = (await create_token({'user_id': 1}))['token']
+    payload = await decode_token(token)
+    payload['user_id'] = 2
+    assert (await decode_token(token))['user_id'] == 1
+
+
+@pytest.mark.asyncio
+async def test_expired_token_is_not_served_from_cache():
+    token = encode({'user_id': 1, 'exp': int(time.time()) + 1})
+    assert await decode_token(token) is not None
+    assert len(verified_tokens) == 1
+
+    await asyncio.sleep(max(0.0, jwt.get_unverified_claims(token)['exp'] - time.time()) + 0.1)
+
+    assert await decode_token(token) is None
+    assert len(verified_tokens) == 0
+
+
+@pytest.mark.asyncio
+async def test_rejected_tokens_are_not_cached():
+    expired = encode({'user_id': 1, 'exp': int(time.time()) - 10})
+    forged = jwt.encode({'user_id': 1, 'exp': int(time.time()) + 60}, 'other-secret',
+                        algorithm=auth_settings.algorithm)
+
+    assert await decode_token(expired) is None
+    assert await decode_token(forged) is None
+    assert len(verified_tokens) == 0